@@ -21,4 +21,5 @@ REM Activate venv
 call .venv\Scripts\activate.bat
 
 REM Launch Streamlit (let Streamlit open the browser itself)
-python -m streamlit run "app.py"
+REM No file watcher (nothing to hot-reload for analysts) and no usage-stats call at start-up
+python -m streamlit run "app.py" --server.fileWatcherType none --browser.gatherUsageStats false
@@ -42,6 +42,9 @@ if exist requirements.txt (
     exit /b 1
 )
 
+REM Pre-build the input template download
+python templates.py
+
 echo ========================================
 echo Installation complete!
 echo TQA will launch Automatically in browser wait few seconds if not then double-click Run_TQA.bat to start the app.
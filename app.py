@@ -1,16 +1,98 @@
 import streamlit as st
-import pandas as pd
-from io import BytesIO
+import hashlib
+import json
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, Font, PatternFill, Border, Side
-from logic import process_uploaded_file, suggest_similar_columns
-import re
+from templates import load_template_bytes
+
+# pandas, logic, readers, incremental and exporters are imported on first use (upload, processing,
+# download), so the page renders before any of them is loaded; plotly / echarts load with the dashboard
+
+# Per-ticket rule results, kept for the life of the server so a re-uploaded extract only
+# re-audits the tickets (and rules) whose fields changed
+@st.cache_resource(show_spinner=False)
+def get_ticket_result_cache():
+    from incremental import TicketResultCache
+    return TicketResultCache()
+
+def get_upload_fingerprint(uploaded_file):
+    """
+    SHA-256 of the uploaded file's bytes, computed once per upload and kept in session_state.
+    The cached functions below take it as their key instead of hashing the DataFrame (and every
+    work-notes string in it) on each rerun; the DataFrames themselves are passed as _-prefixed,
+    unhashed arguments.
+    """
+    file_id = getattr(uploaded_file, "file_id", None) or (uploaded_file.name, uploaded_file.size)
+    if st.session_state.get("upload_file_id") != file_id:
+        st.session_state["upload_file_id"] = file_id
+        st.session_state["upload_fingerprint"] = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    return st.session_state["upload_fingerprint"]
+
+def load_uploaded_dataframe(uploaded_file, input_fingerprint, columns):
+    """
+    Parsed upload (with the Age column) kept in session_state, so widget reruns reuse it instead
+    of re-reading the file. Only the given columns are parsed; the frame is re-read when a
+    different file is uploaded or a newly selected rule needs a column that was skipped.
+    """
+    from logic import add_age_column, compact_input_frame
+    from readers import read_input
+
+    upload_key = (st.session_state.get("upload_file_id"), input_fingerprint)
+    same_upload = st.session_state.get("input_df_key") == upload_key
+    loaded_columns = st.session_state.get("input_df_columns", [])
+    if not same_upload or not set(columns) <= set(loaded_columns):
+        if same_upload:
+            # Keep what is already loaded so toggling rules back and forth does not re-read the file
+            columns = list(dict.fromkeys(loaded_columns + list(columns)))
+        input_df = read_input(uploaded_file, columns)
+        # --- Calculate Age column from Opened and Closed dates
+        add_age_column(input_df)
+        compact_input_frame(input_df)
+        st.session_state["input_df"] = input_df
+        st.session_state["input_df_key"] = upload_key
+        st.session_state["input_df_columns"] = columns
+    return st.session_state["input_df"]
 
 # Cache the main processing function for faster repeated runs
 @st.cache_data(show_spinner=False)
-def cached_process_uploaded_file(input_df, selected_rules, thresholds, weights):
-    return process_uploaded_file(input_df, selected_rules, thresholds, weights)
+def cached_process_uploaded_file(_input_df, input_fingerprint, selected_rules, thresholds, weights,
+                                 track_memory=False, profiler=None):
+    from incremental import TicketResultCache, process_uploaded_file_incremental
+    from logic import memory_tracking
+    from profiling import profile_run
+    # Profiled and memory-traced runs start from an empty ticket cache, so they measure the rules
+    # themselves rather than cache lookups
+    cache = TicketResultCache() if (profiler or track_memory) else get_ticket_result_cache()
+    with profile_run(profiler, input_fingerprint, selected_rules) as run, memory_tracking(track_memory):
+        output_df = process_uploaded_file_incremental(_input_df, selected_rules, thresholds, weights, cache=cache)
+    if profiler:
+        output_df.attrs['profile'] = run['paths']
+    return output_df
+
+# Observations1/Observations2 are derived views: built only when the export or the dashboard asks for them
+@st.cache_data(show_spinner=False)
+def cached_add_observations(_processed_df, _input_df, input_fingerprint, selected_rules, thresholds, weights):
+    # processed_df is fully determined by (input_fingerprint, selected_rules, thresholds, weights)
+    from logic import add_observations
+    return add_observations(_processed_df, _input_df, selected_rules)
+
+def get_result_key(input_fingerprint, selected_rules, thresholds, weights, include_observations):
+    """Hash of everything that determines the audit result (upload bytes + rule configuration)."""
+    config = json.dumps([selected_rules, thresholds, weights, include_observations], sort_keys=True, default=str)
+    return hashlib.sha256(f"{input_fingerprint}:{config}".encode("utf-8")).hexdigest()
+
+# Download formats: label and MIME type
+EXPORT_FORMATS = {
+    "xlsx": ("Excel (formatted)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "parquet": ("Parquet", "application/vnd.apache.parquet"),
+    "csv.gz": ("CSV (gzip)", "application/gzip"),
+    "zip": ("Zip (CSV per Tower)", "application/zip"),
+}
+
+# Export bytes per result and format: repeated downloads (and reruns after one) reuse them
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_results_export(_export_df, result_key, export_format):
+    from exporters import results_to_bytes
+    return results_to_bytes(_export_df, export_format)
 
 st.set_page_config(
     page_title="TQA",
@@ -74,402 +156,10 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- Step 1: Enhanced Template Download  (27 columns headers)
-TEMPLATE_COLUMNS = [
-    "Number", "Priority", "State", "Pending reason",
-    "Application Name / CI", "Assignment Group", "Assigned to", "Knowledge Article Used",
-    "Short description", "Comments and Work notes", "Additional comments",
-    "Description", "Closed", "Opened", "Closed by", "Subcategory",
-    "Category", "Response Time", "Response SLA", "Resolution SLA", "Reopened",
-    "Related Record", "Reassignment count", "Impact", "Urgency", "Age",
-    "Has Attachments"
-]
-
-@st.cache_data
-def generate_enhanced_template():
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Input Template"
- 
-    # Simple, robust header styling
-    for col_num, col_name in enumerate(TEMPLATE_COLUMNS, 1):
-        cell = ws.cell(row=1, column=col_num, value=col_name)
-        cell.font = Font(bold=True, size=11)
-        cell.alignment = Alignment(horizontal='left', vertical='center')
-        
-        # Set appropriate column width - not too wide to avoid scrolling
-        ws.column_dimensions[cell.column_letter].width = 14
-    
-    # Add sample data row
-    sample_data = [
-        "INC647839/RITM3551234", "3-Medium", "Closed Complete", "",
-        "SAP_Production_Environment", "AMS.DIT.Enterprise.Apps.Cognizant.L2", "John.Doe", "KB0048434",
-        "User unable to access SAP application after password reset", 
-        "15/01/2025 09:30:00 - John Doe (Work notes)\nHello User,\n\nWe acknowledge your request. We have started looking into the ticket and we will get back to you if we need any additional information.\n\nRegards,\nSAP Support Team\n\n16/01/2025 14:20:00 - John Doe (Work notes)\nHello User,\n\nIssue has been resolved. Password reset completed and user access verified.\n\nRegards,\nSAP Support Team", 
-        "16/01/2025 15:45:00 - John Doe (Additional comments)\nKnowledge article KB0048434:\nSAP User Access Management\n\nPassword reset performed successfully and user access restored.",
-        "User reported login failure after recent password policy update. Investigation revealed account lock due to multiple failed attempts. Performed password reset and verified successful login.", 
-        "16/01/2025 15:45:00", "15/01/2025 09:15:00", "Jane.Smith",
-        "User Access Management", "Software", "2.5", "Met", "Met", "0/1/2 or True,False/Yes,No,y,n",
-        "CHG0123456", "0", "3-Medium", "3-Medium", "1.7", "TRUE/FALSE"
-    ]
-
-    
-    for col_num, value in enumerate(sample_data, 1):
-        if col_num <= len(TEMPLATE_COLUMNS):
-            cell = ws.cell(row=2, column=col_num, value=value)
-            cell.alignment = Alignment(horizontal='left', vertical='top')
- 
-    # Freeze header row
-    ws.freeze_panes = "A2"
-    
-    # Add instructions sheet
-    instructions_ws = wb.create_sheet("Instructions")
-    instructions_ws.cell(row=1, column=1, value="🎯 Ticket Audit Tool - Instructions").font = Font(bold=True, size=16)
-    
-    instructions = [
-    "🎯 Ticket Audit Tool – Validation Rules & Instructions",
-    "",
-    "──────────────────────────────────────────────────────────────",
-    "📌 General Notes:",
-    "• If a required column is missing, the corresponding validation will fail for all tickets.",
-    "• Use the provided mapping files (Tower_Maping.xlsx, Category_Subcategory_Mapping.xlsx) in the same folder.",
-    "• Do NOT rename mapping files or their headers.",
-    "• Do NOT rename the column headers in the input template",
-    "",
-    "──────────────────────────────────────────────────────────────",
-    "✅ Validation Rules: and required columns in input file",
-    "Ticket Number",
-    "   • Required column: Number",
-    "   • Logic: Unique identifier for each ticket.",
-    "",
-    "Assigned to",
-    "   • Required column in input file: Assigned to",
-    "   • Logic: Name of the person assigned to the ticket.",
-    "",
-    "Application",
-    "   • Required column: Application Name / CI",
-    "   • Logic: Application or CI related to the ticket.",
-    "",
-    "Tower",
-    "   • Required column: Application Name / CI",
-    "   • Logic: Derived from Tower_Maping.xlsx. If missing, shows 'Missing Column', 'File Missing', or 'File Error'.",
-    "",
-    "1. Short Description Length Check",
-    "   • Required column: Short description",
-    "   • Logic: Must not be empty/null and must meet minimum character length.",
-    "",
-    "2. Long Description Length Check",
-    "   • Required column: Description",
-    "   • Logic: Must not be empty/null and must meet minimum character length.",
-    "",
-    "3. Actual Response Time took",
-    "   • Required column: Response Time",
-    "   • Logic: Must be a number and in minutes.", 
-    "     - Calculates time difference between 'Opened' date and first comment timestamp. Fails if response time exceeds threshold.",
-    "",
-    "4. Response SLA Met ?",
-    "   • Required column: Response SLA",
-    "   • Logic: Fail if null/None/'Breached'/True in any case; pass otherwise.",
-    "",
-    "5. Resolution SLA Met ?",
-    "   • Required column: Resolution SLA",
-    "   • Logic: Fail if null/None/'Breached'/True in any case; pass otherwise.",
-    "",
-    "6. KBA Tagged?",
-    "    • Required column: Knowledge Article Used",
-    "    • Logic: Pass if contains 'KB', 'True', or 'TRUE'; fail otherwise.",
-    "",
-    "7. Reopened ?",
-    "    • Required column: Reopened",
-    "    • Logic: Fail if null/None or value > 0; pass if value is 0.",
-    "",
-    "8. Work notes Length Check",
-    "    • Required column: Comments and Work notes",
-    "    • Logic: Must meet minimum char/word count, have punctuation, and start with a capital letter.",
-            "We remove system-like headers (date/time/name/tags) from each line, then the incident’s cleaned text must be well‑formed (word_count >= 10, char_count > 50, has . , ? !, and starts with a capital) to Pass. Default character threshold is 100.",
-    "    • Supported Date Formats",
-    "        - YYYY-MM-DD (ISO)",
-    "        - YYYY/MM/DD",
-    "        - YYYY.MM.DD",
-    "        - DD-MM-YYYY",
-    "        - DD/MM/YYYY",
-    "        - DD.MM.YYYY",
-    "        - MM-DD-YYYY",
-    "        - MM/DD/YYYY",
-    "        - MM.DD.YYYY",
-    "        - (Single-digit day/month also supported, e.g., 6/4/2022)",
-    "        - Separators supported: '-', '/', '.'",
-    "    • Supported Time Formats",
-    "        - 24-hour: HH:MM (e.g., 09:27), HH:MM:SS (e.g., 09:27:00)",
-    "        - 12-hour with AM/PM: HH:MM AM/PM, HH:MM:SS AM/PM",
-    "        - Variants with dots: A.M. / P.M.",
-    "        - Case-insensitive and optional spaces before AM/PM are supported",
-    "    • Header Handling",
-    "        - Removes optional '- Name'",
-    "        - Removes optional '- Name (Work notes)' or '- Name (Additional comments)'",
-    "        - If header is missing, only date/time is stripped and comment text remains",
-    "",
-    "9. Resolution Notes Length/ Additional comments",
-    "    • Required column: Additional comments",
-    "    • Logic: Must meet minimum char/word count, have punctuation, and start with a capital letter.",
-    "      We remove system-like headers (date/time/name/tags) from each line, then the incident’s cleaned text must be well‑formed (10+ words (word_count &gt;= 10), char_count &gt; Additional_com_length, has . , ? !, and starts with a capital) to Pass. Default character threshold is 50.",
-    "    • Supported Date Formats",
-    "        - YYYY-MM-DD (ISO)",
-    "        - YYYY/MM/DD",
-    "        - YYYY.MM.DD",
-    "        - DD-MM-YYYY",
-    "        - DD/MM/YYYY",
-    "        - DD.MM.YYYY",
-    "        - MM-DD-YYYY",
-    "        - MM/DD/YYYY",
-    "        - MM.DD.YYYY",
-    "        - (Single-digit day/month also supported, e.g., 6/4/2022)",
-    "        - Separators supported: '-', '/'",
-    "    • Supported Time Formats",
-    "        - 24-hour: HH:MM (e.g., 09:27), HH:MM:SS (e.g., 09:27:00)",
-    "        - 12-hour with AM/PM: HH:MM AM/PM, HH:MM:SS AM/PM",
-    "        - Variants with dots: A.M. / P.M.",
-    "        - Case-insensitive and optional spaces before AM/PM are supported",
-    "    • Header Handling",
-    "        - Removes optional '- Name'",
-    "        - Removes optional '- Name (Work notes)' or '- Name (Additional comments)'",
-    "        - If header is missing, only date/time is stripped and comment text remains",
-    "10. Right Assignment group Usage",
-    "    • Required columns: Application Name / CI, Assignment Group",
-    "    • Logic: Checks if Assignment Group matches mapping in Tower_Maping.xlsx.",
-    "",
-    "11. Right Pending Justification Usage",
-    "    • Required columns: Pending reason, Comments and Work notes, Additional comments",
-    "    • Logic: Pass if Pending reason is null/None; otherwise, checks for valid justification phrases in comments.",
-    "",
-    "12. Related records tagged?",
-    "    • Required columns: Pending reason, Related Record",
-    "    • Logic: For specific pending reasons, checks if Related Record matches expected format (e.g., CHG, PRB, RITM, INC).",
-    "    • For each ticket, check if the Related Record field is correctly tagged based on the Pending reason:",
-
-    "   •   pendingchange → Related Record must contain 'CHG'",
-    "   •   pendingvendor → Related Record must be present (any value except null/'None')",
-    "   •   pendingproblem → must contain 'PRB'",
-    "   •   pendingfulfillment → must contain 'RITM'",
-    "   •   pendingincident → must contain 'INC'",
-    "   •   pendingcustomer → uses external justification logic (Pending_Justification())",
-    "   •   Remarks (possible results):",
-    "           Pass → Related record is correctly tagged for the given pending reason.",
-    "           Fail → Related record is missing or incorrectly tagged.",
-    "           Fail - Missing Column → Required columns are missing from the input.",
-    "           Pass → If Pending reason is null or 'None'."
-    "",
-    "13. Ticket Ageing Check",
-    "    • Required column: Age",
-    "    • Logic: Fail if Age is missing/None/above threshold; pass if below threshold.",
-    "",
-    "14. 3 Strike rule remainders check",
-    "    • Required columns: Age, Comments and Work notes, Additional comments",
-    "    • Logic: Checks for reminder phrases in comments based on ticket age.",
-    "",
-    "15. Reassignment check?",
-    "    • Required column: Reassignment count",
-    "    • Logic: Fail if count is missing/None/above threshold; pass if below threshold.",
-    "",
-    "16. Priority Validation",
-    "    • Required columns: Priority, Impact, Urgency",
-    "    • Logic: Checks if Priority matches valid combinations of Impact and Urgency.",
-    "",
-    "17. Category Validation",
-    "    • Required column: Description and mapping file Category_Subcategory_Mapping.xlsx",
-    "    • Logic: Finds the best matching keyword from the mapping based on words in the Description",
-            " then checks if the ticket's Category (and Subcategory, if given) matches the mapping.",
-            " Returns 'Pass' if both match, otherwise 'Fail'",
-    "",
-    "18. password_detected?",
-    "    • Required columns: Comments and Work notes, Additional comments",
-    "    • Logic: Checks for presence of password-related terms in either column.",
-    "     Loop through each ticket: Combine both comment fields Split into words Check each word against the password pattern",
-    "",
-    "19. Closed with User Confirmation?",
-    "    • Required columns: Comments and Work notes, Additional comments",
-    "    • Logic: Pass if user confirmation phrases are found in either column; fail otherwise.",
-    "",
-    "20. Work Note Format & Content Check",
-    "    • Required column: Comments and Work notes",
-    "    • Logic: For each ticket’s Comments and Work notes:",
-    "         - Find a date (e.g., dd/mm/yyyy, dd-mm-yyyy, or dd-MMM-yyyy).",
-    "         - Take the text after that date and verify it is:",
-    "         - > 30 characters and ≥ 10 words,",
-    "         - Contains at least one sentence-ending punctuation (. ! ? ;), and",
-    "         - The first alphabetic character after the date is uppercase.",
-    "    • Remarks (possible results):",
-    "         - Comprehensive → All conditions satisfied.",
-    "         - Needs improvement → Date found, but content fails one or more checks.",
-    "         - No match or invalid format → No recognizable date or parsing issue.",
-    "         - Fail → Work note is NaN or the literal string 'None'.",
-    "",
-    "21. Ticket Updated Within Business Days",
-    "    • Required columns: Comments and Work notes, Additional comments",
-    "    • Logic: Pass if ticket was updated within the defined business days; fail otherwise.",
-    "",
-    "22. Process Adherence Violation Check",
-    "    • Required columns: Opened, Closed, Comments and Work notes, Additional comments",
-    "    • Logic: Checks if ticket updates in Comments and Work notes or Additional comments occur at least every alternate business day (excluding weekends and holidays) from Opened to Closed.",
-    "    • If there is a gap of more than one business day between any two updates (including from Opened to first update and last update to Closed), the ticket fails the PA violation check; otherwise, it passes.",
-    "",
-    "- Strike Pattern Logics Overview:",
-
-    "1-1-1 Pattern:",
-
-    "Requires three consecutive business days with comments",
-    "Fails if any gap is more than 1 business day",
-    "Works correctly for handling duplicate timestamps",
-    "2-2-1 Pattern:",
-
-    "First two gaps can be up to 2 business days",
-    "Last gap must be 1 business day",
-    "Works correctly but could be optimized for clarity",
-    "3-2-1 Pattern:",
-
-    "First gap can be up to 3 business days",
-    "Second gap can be up to 2 business days",
-    "Last gap must be 1 business day",
-    "Works correctly but could be optimized for clarity",
-    "",
-    "",
-    "23. 3 Strike Check(1-1-1)",
-    "    • Required columns: Comments and Work notes, Additional comments",
-    "    • Logic: For each ticket, if its age is less than or equal to the threshold (e.g., 3 days), it is marked as 'Age <= 3 Days' and not checked further.",
-    "    • If there are fewer than 4 comment timestamps, it marks 'Not Enough Comments'.",
-    "    • The first three updates must be every other day, and the 4th update must be on the immediate next business day after the 3rd.",
-    "    • If this pattern is followed, the ticket passes; otherwise, it fails.",
-    "",
-    "24. 3 Strike Check(2-2-1)",
-    "    • Required columns: Comments and Work notes, Additional comments",
-    "    • Logic: For tickets older than a set threshold, collect all comment timestamps from 'Comments and Work notes' and 'Additional comments'",
-    "    • Check if the first four distinct comment dates follow this pattern:",
-    "        - The gap between the 1st and 2nd comment is ≤ 2 business days",
-    "        - The gap between the 2nd and 3rd comment is ≤ 2 business days",
-    "        - The gap between the 3rd and 4th comment is ≤ 1 business day",
-    "    • Remarks (possible results):",
-                " - Pass → All three gaps meet the 2–2–1 rule.",
-                " - Fail → At least one gap exceeds the allowed limit, or fewer than 4 distinct dates.",
-                " - Age ≤ Threshold → Ticket is too new (e.g., ≤ 3 days), so the check is skipped.",
-                " - Not Enough Comments → Fewer than 4 timestamps found in comments.",
-    "",
-    "25. 3 Strike Check(3-2-1)",
-    "    • Required columns: Comments and Work notes, Additional comments",
-    "    • Logic: For tickets older than a set threshold, collect all comment timestamps from 'Comments and Work notes' and 'Additional comments'.",
-    "    • Check if the first four distinct comment dates follow this pattern:",
-    "        - The gap between the 1st and 2nd comment is ≤ 3 business days",
-    "        - The gap between the 2nd and 3rd comment is ≤ 2 business days",
-    "        - The gap between the 3rd and 4th comment is ≤ 1 business day",
-    "    • Remarks (possible results):",
-    "        - Pass → All three gaps meet the 3–2–1 rule.",
-    "        - Fail → At least one gap exceeds the allowed limit, or there are fewer than 4 distinct dates.",
-    "        - Age ≤ Threshold → Ticket is too new (e.g., ≤ N days), so the check is skipped.",
-    "        - Not Enough Comments → Fewer than 4 timestamps found in comments.",
-    "",
-    "26. Score",
-    "    • Logic: Total number of validations passed for each ticket.",
-    "",
-    "27. Score Category",
-    "    • Logic: Categorizes score: Below 75%, 75%-90%, Above 90%.",
-    "",
-    "28. Observations1",
-    "    • Evaluates the 'Comments and Work notes' field for each ticket.",
-    "    • Checks for:",
-    "        - Word count (should be at least 20 words)",
-    "        - Presence of punctuation",
-    "        - Minimum length (at least 100 characters)",
-    "        - Starts with a capital letter",
-    "    • Returns feedback like 'Too few words', 'Missing punctuation', 'Too short', 'Does not start with capital' (comma-separated if multiple issues).",
-    "    • If the entry is missing or 'None', marks as 'Fail'.",
-    """   IMPORTANT: If any single remark in the ticket triggers a flag (e.g., "Too short", "Too few words", etc.)", then that flag is shown for the entire ticket in the Observations1 output.""",
-    "       Even if most remarks are good, just one short or problematic remark will cause the flag to appear for the whole ticket.",
-    "       The output does not show which specific remark triggered the flag—just that at least one did.",
-    "",
-    "29. Observations2",
-    "    • Generates feedback based on multiple validation checks (using a feedback map).",
-    "    • Maps codes to specific feedback messages:",
-    "        - D: Short Description too short",
-    "        - E: Long Description too short",
-    "        - F: Response time too high",
-    "        - G: Response SLA breached",
-    "        - H: Resolution SLA breached",
-    "        - I: KBA not tagged",
-    "        - J: Ticket reopened",
-    "        - K: worknotes is not comprehensive",
-    "        - L: Resolution notes is not comprehensive",
-    "        - M: Ticket is assigned to incorrect group",
-    "        - N: Related record is not tagged",
-    "        - O: Ticket is ageing>20 days",
-    "        - P: 3 Strike rule(Confirmation) is not followed",
-    "        - Q: Reassignment count is >3",
-    "        - R: 1-1-1 Check is not followed",
-    "        - S: 2-2-1 Check is not followed",
-    "        - T: 3-2-1 Check is not followed",
-    "",
-    "30. Work Notes Updated Regularly",
-    "    • Required column: Age, Comments and Work notes",
-"        • If the work note is recent (< 7 days) → it's automatically marked as Pass.",
-"        • If it's older (≥ 7 days) → it goes through a Three Strike Rule check function to decide Pass/Fail.",
-"        • If the age is missing or invalid → it's marked as Fail.",
-"        • The result is stored in the output and used for reporting.",
-" • Three Strike Rule check fuction Explained below:",
-"      • The function checks the ticket's age and comments to see if reminders were sent as per the escalation policy.",
-        """"If Age is missing or 'None' → mark as "Fail"."
-        If Age < 3 → mark as "Pass" (no reminder needed yet).
- 
-        Merge 'Comments and Work notes' and 'Additional comments' into one string.
- 
-        If combined comment text is empty → mark as "Fail".
-        Select reminder patterns based on age:
- 
-        Age 3–5 → check for first reminder.
-        Age 6–7 → check for first + second reminders.
-        Age > 7 → check for final reminder.
-        Pattern matching:
- 
-#         Use regex to search for reminder phrases in the combined comment text.
-#         If any match is found → "Pass", else → "Fail"."""
-    "",
-    "30. Has Attachments",
-    "    • Required column: Has Attachments",
-    "    • Logic: Check if the ticket has an attachment based on values in the specified column.",
-    "    • Remarks:",
-    "        - This ticket has attachment → If the value contains 'TRUE', 'true', 'True', 'YES', 'yes', or 'Yes'",
-    "        - No attachment → If the value is present but doesn't match the above",
-    "        - No data found → If the value is None, NaN, or the string 'None'",
-    "       - Missing Column → If the 'Has Attachments' column is missing in the input file",
- ]
-
-    
-    for i, instruction in enumerate(instructions, 1):
-        cell = instructions_ws.cell(row=i+1, column=1, value=instruction)
-        # Bold all validation rule names (lines starting with a number and dot)
-        if instruction.strip() and instruction[0].isdigit() and '.' in instruction:
-            cell.font = Font(bold=True, size=12)
-        # Make required column names italic and colored to look like column headers
-        elif instruction.strip().startswith('• Required column') or instruction.strip().startswith('• Required column in input file'):
-            import re
-            match = re.search(r':\s*(.+)', instruction)
-            if match:
-                col_name = match.group(1)
-                # Replace column name with formatted version
-                cell.value = instruction.split(':')[0] + ': ' + col_name
-                cell.font = Font(italic=True, color="0070C0", size=11)
-            else:
-                cell.font = Font(size=11)
-        else:
-            cell.font = Font(size=11)
-        cell.alignment = Alignment(wrap_text=True)
-    
-    instructions_ws.column_dimensions['A'].width = 80
- 
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    return output
 
 st.download_button(
     "📥 Download Template",
-    data=generate_enhanced_template(),
+    data=load_template_bytes(),
     file_name=f"Ticket_Audit_Template_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     help="Simple template with sample data and instructions"
@@ -563,6 +253,13 @@ selected_rules.extend(selected_strike_rules)
 
 # --- Show selected rules (optional)
 st.markdown(f"**Selected Rules ({len(selected_rules)}):**")
+
+# Observations are not Pass/Fail checks; they are only generated when needed
+include_observations = st.checkbox(
+    "📝 Include Observations1 / Observations2 in the downloaded results",
+    value=False,
+    help="Observations are free-text feedback columns. Leave unticked for a faster audit when only the score is needed."
+)
 #st.write(selected_rules)
 
 
@@ -926,47 +623,70 @@ else:
     st.info("Select at least one rule with pass/fail criteria to assign weights.")
 
 
+# Input columns each validation rule requires (checked after upload; also decides which
+# columns of the upload are loaded at all)
+column_requirements = {
+    "Short Description Length Check": ["Short description"],
+    "Assigned to": ["Assigned to"],
+    "Long Description Length Check": ["Description"],
+    "Actual Response Time took": ["Response Time"],
+    "Response SLA Met ?": ["Response SLA"],
+    "Resolution SLA Met ?": ["Resolution SLA"],
+    "KBA Tagged?": ["Knowledge Article Used"],
+    "Reopened ?": ["Reopened"],
+    "Work notes Length Check": ["Comments and Work notes"],
+    "Resolution Notes / Additional comment Length Check": ["Additional comments"],
+    "Right Assignment group Usage": ["Assignment Group", "Application Name / CI"],
+    "Right Pending Justification Usage": ["Pending reason", "Comments and Work notes", "Additional comments"],
+    "Related records tagged?": ["Pending reason", "Related Record"],
+    "Ticket Ageing Check": ["Age"],
+    "3 Strike rule check(escalation policy check for Remainder)": ["Age", "Comments and Work notes", "Additional comments"],
+    "Reassignment check?": ["Reassignment count"],
+    "Has Attachments": ["Has Attachments"],
+    "Priority Validation": ["Priority", "Impact", "Urgency"],
+    "Category Validation": ["Description", "Category", "Subcategory"],
+    "Password_detected?": ["Comments and Work notes", "Additional comments"],
+    "Closed with User Confirmation?": ["Comments and Work notes", "Additional comments"],
+    "Work Notes Updated Regularly": ["Age", "Comments and Work notes", "Additional comments"],
+    "Ticket Updated Within Business Days": ["Opened", "Comments and Work notes", "Additional comments"],
+    "Process Adherence Violation Check": ["Opened", "Closed", "Comments and Work notes", "Additional comments"],
+    "3 Strike Check(1-1-1)": ["Age", "Comments and Work notes", "Additional comments"],
+    "3 Strike Check(2-2-1)": ["Age", "Comments and Work notes", "Additional comments"],
+    "3 Strike Check(3-2-1)": ["Age", "Comments and Work notes", "Additional comments"],
+    "Observations1": ["Comments and Work notes"],
+    "Observation2": [], # This depends on other columns, handled in logic
+    "Acknowledgment notes recorded in Worklog?": ["Comments and Work notes", "Additional comments"],
+    "Is the resolution summary and closure notes updated as per appropriate template?": ["Comments and Work notes", "Additional comments"]
+
+}
+
 # --- Upload Excel
 
-st.markdown("### 2️⃣ Upload Filled Excel File")
+st.markdown("### 2️⃣ Upload Filled Ticket File")
 
-uploaded_file = st.file_uploader("📤 Upload Excel", type="xlsx")
+uploaded_file = st.file_uploader(
+    "📤 Upload Excel / CSV / Parquet / Feather",
+    type=["xlsx", "csv", "parquet", "feather"],
+    help="CSV, Parquet and Feather exports from the ITSM tool can be uploaded directly; Parquet and Feather load fastest."
+)
  
 if uploaded_file:
+    import pandas as pd
+    from logic import (TOWER_MAPPING_FILE, normalize_priority, read_mapping_file, required_input_columns,
+                       rule_stats_report)
 
-    input_df = pd.read_excel(uploaded_file)
-    # --- Calculate Age column from Opened and Closed dates
-    def parse_date(date_str):
-        if pd.isnull(date_str):
-            return None
-        # Try multiple date formats
-        date_formats = [
-            '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M',
-            '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d %H:%M',
-            '%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M',
-            '%m-%d-%Y %H:%M:%S', '%m-%d-%Y %H:%M', '%m.%d.%Y %H:%M:%S', '%m.%d.%Y %H:%M',
-            '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%Y/%m/%d', '%d.%m.%Y', '%m/%d/%Y', '%m-%d-%Y', '%m.%d.%Y'
-        ]
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(str(date_str).strip(), fmt)
-            except Exception:
-                continue
-        return None
-    
-    ages = []
-    for idx, row in input_df.iterrows():
-        opened = parse_date(row.get('Opened'))
-        closed = parse_date(row.get('Closed'))
-        if opened and closed:
-            age_days = (closed - opened).total_seconds() / (24*3600)
-            ages.append(round(age_days))
-        else:
-            ages.append(None)
-    input_df['Age'] = ages
+    input_fingerprint = get_upload_fingerprint(uploaded_file)
+    # Only the columns the selected rules (and the identifiers / Age) need are parsed
+    input_columns = required_input_columns(selected_rules, include_observations, column_requirements)
+    input_df = load_uploaded_dataframe(uploaded_file, input_fingerprint, input_columns)
 
     st.success("✅ File u ploaded successfully!")
 
+    ignored_columns = input_df.attrs.get('ignored_columns', [])
+    if ignored_columns:
+        with st.expander(f"ℹ️ {len(ignored_columns)} extra column(s) ignored (not used by the selected rules)"):
+            st.write(", ".join(f"`{col}`" for col in ignored_columns))
+
     row_count = st.selectbox("Show rows (Uploaded Sheet):", [5, 10, 20, 30], index=0, key="input_row_count")
     
     st.dataframe(input_df.head(row_count), use_container_width=True)
@@ -978,56 +698,6 @@ if uploaded_file:
     if "Actual Response Time took" in selected_rules:
         st.markdown("### 📊 Configure Priority-Based Response Time Thresholds")
         
-        # Define priority canonicalization (same as in logic.py)
-        def normalize_priority(priority_str):
-            """Normalize priority to standard format: 1-Critical, 2-High, 3-Medium, 4-Low"""
-            if pd.isnull(priority_str) or str(priority_str).strip() == 'None':
-                return None
-            
-            key = str(priority_str).strip().lower()
-            key = key.replace(' – ', '-').replace(' - ', '-').replace('–', '-')
-            key = ' '.join(key.split())
-            
-            # Direct mapping
-            PRIORITY_CANON_MAP = {
-                '1-critical': '1-Critical', 'critical': '1-Critical', 'p1': '1-Critical',
-                'severity 1': '1-Critical', 'sev1': '1-Critical', 's1': '1-Critical', 'priority 1': '1-Critical',
-                '2-high': '2-High', 'high': '2-High', 'p2': '2-High',
-                'severity 2': '2-High', 'sev2': '2-High', 's2': '2-High', 'priority 2': '2-High',
-                '3-medium': '3-Medium', '3-moderate': '3-Medium', 'moderate': '3-Medium', 'med': '3-Medium', 'mod': '3-Medium',
-                'p3': '3-Medium', 'severity 3': '3-Medium', 'sev3': '3-Medium', 's3': '3-Medium', 'priority 3': '3-Medium',
-                '4-low': '4-Low', 'low': '4-Low', 'p4': '4-Low',
-                'severity 4': '4-Low', 'sev4': '4-Low', 's4': '4-Low', 'priority 4': '4-Low',
-            }
-            
-            if key in PRIORITY_CANON_MAP:
-                return PRIORITY_CANON_MAP[key]
-            
-            # Pattern matching for variations
-            import re
-            for pat in (r'\bp\s*-?\s*([1-4])\b', r'\bsev(?:erity)?\s*-?\s*([1-4])\b', 
-                       r'\bs\s*-?\s*([1-4])\b', r'\bpriority\s*-?\s*([1-4])\b'):
-                m = re.search(pat, key)
-                if m:
-                    n = int(m.group(1))
-                    return ['1-Critical','2-High','3-Medium','4-Low'][n-1]
-            
-            m = re.search(r'\b([1-4])\s*-\s*(critical|high|medium|moderate|low)\b', key)
-            if m:
-                word = m.group(2)
-                if 'critical' in word: return '1-Critical'
-                if 'high' in word:     return '2-High'
-                if 'medium' in word or 'moderate' in word: return '3-Medium'
-                if 'low' in word:      return '4-Low'
-            
-            # Keyword matching
-            if 'critical' in key: return '1-Critical'
-            if 'high' in key:     return '2-High'
-            if 'medium' in key or 'moderate' in key: return '3-Medium'
-            if 'low' in key:      return '4-Low'
-            
-            return None
-        
         # Get unique priorities from uploaded data and normalize them
         if "Priority" in input_df.columns:
             raw_priorities = [p for p in input_df['Priority'].dropna().unique() if str(p).strip() != 'None']
@@ -1140,40 +810,6 @@ if uploaded_file:
     validation_warnings = []
         
     # Check for required columns for each selected validation rule
-    column_requirements = {
-        "Short Description Length Check": ["Short description"],
-        "Assigned to": ["Assigned to"],
-        "Long Description Length Check": ["Description"],
-        "Actual Response Time took": ["Response Time"],
-        "Response SLA Met ?": ["Response SLA"],
-        "Resolution SLA Met ?": ["Resolution SLA"],
-        "KBA Tagged?": ["Knowledge Article Used"],
-        "Reopened ?": ["Reopened"],
-        "Work notes Length Check": ["Comments and Work notes"],
-        "Resolution Notes / Additional comment Length Check": ["Additional comments"],
-        "Right Assignment group Usage": ["Assignment Group", "Application Name / CI"],
-        "Right Pending Justification Usage": ["Pending reason", "Comments and Work notes", "Additional comments"],
-        "Related records tagged?": ["Pending reason", "Related Record"],
-        "Ticket Ageing Check": ["Age"],
-        "3 Strike rule check(escalation policy check for Remainder)": ["Age", "Comments and Work notes", "Additional comments"],
-        "Reassignment check?": ["Reassignment count"],
-        "Has Attachments": ["Has Attachments"],
-        "Priority Validation": ["Priority", "Impact", "Urgency"],
-        "Category Validation": ["Description", "Category", "Subcategory"],
-        "Password_detected?": ["Comments and Work notes", "Additional comments"],
-        "Closed with User Confirmation?": ["Comments and Work notes", "Additional comments"],
-        "Work Notes Updated Regularly": ["Age", "Comments and Work notes", "Additional comments"],
-        "Ticket Updated Within Business Days": ["Opened", "Comments and Work notes", "Additional comments"],
-        "Process Adherence Violation Check": ["Opened", "Closed", "Comments and Work notes", "Additional comments"],
-        "3 Strike Check(1-1-1)": ["Age", "Comments and Work notes", "Additional comments"],
-        "3 Strike Check(2-2-1)": ["Age", "Comments and Work notes", "Additional comments"],
-        "3 Strike Check(3-2-1)": ["Age", "Comments and Work notes", "Additional comments"],
-        "Observations1": ["Comments and Work notes"],
-        "Observation2": [], # This depends on other columns, handled in logic
-        "Acknowledgment notes recorded in Worklog?": ["Comments and Work notes", "Additional comments"],
-        "Is the resolution summary and closure notes updated as per appropriate template?": ["Comments and Work notes", "Additional comments"]
-
-    }
     
     missing_columns = []
     for rule in selected_rules:
@@ -1221,12 +857,14 @@ if uploaded_file:
             # Collect all required columns for selected rules
             required_cols = [col for rule in selected_rules if rule in column_requirements for col in column_requirements[rule]]
             missing_cols = [col for col in required_cols if col not in input_df.columns]
+            # Only the columns the rules need were loaded; the ones skipped are still in the file
+            file_columns = list(input_df.columns) + input_df.attrs.get('ignored_columns', [])
             st.error("❌ **Tower Logic Error: Missing Required Column(s)**")
             st.markdown(f"""
             **To run the selected validation rules, you need to add the following column(s):** `{', '.join(missing_cols)}` **in your input Excel file**
             
             **📋 Current available columns in your file:**
-            {list(input_df.columns)}
+            {file_columns}
             
             **✅ Please:**
             1. Add the missing column(s) to your Excel file: `{', '.join(missing_cols)}`
@@ -1236,16 +874,17 @@ if uploaded_file:
         
         # Check 2: Tower mapping file validation
         import os
-        tower_mapping_file = "Tower_Maping.xlsx"
+        # The same file the engine reads: next to the tool, whatever folder Streamlit was started from
+        tower_mapping_file = TOWER_MAPPING_FILE
         if not os.path.exists(tower_mapping_file):
             st.error("❌ **Tower Logic Error: Missing Tower Mapping File**")
             st.markdown(f"""
-            **To run Tower logic, you need to add the file:** `{tower_mapping_file}` **in the current folder**
+            **To run Tower logic, you need to add the file:** `{os.path.basename(tower_mapping_file)}` **in the tool folder**
             
-            **📁 Current folder location:** `{os.getcwd()}`
+            **📁 Tool folder location:** `{os.path.dirname(tower_mapping_file)}`
             
             **✅ Please:**
-            1. Add the `{tower_mapping_file}` file to this folder
+            1. Add the `{os.path.basename(tower_mapping_file)}` file to this folder
             2. Ensure the file contains columns: `Application Name` and `Tower`
             3. Re-run the analysis
             """)
@@ -1253,7 +892,7 @@ if uploaded_file:
     
         # Check 3: Tower mapping file structure validation
         try:
-            tower_df = pd.read_excel(tower_mapping_file)
+            tower_df = read_mapping_file(tower_mapping_file)
             required_tower_columns = ["Application Name", "Tower"]
             missing_tower_columns = [col for col in required_tower_columns if col not in tower_df.columns]
             
@@ -1287,9 +926,33 @@ if uploaded_file:
             st.stop()
     
     try:
-        processed_df = cached_process_uploaded_file(input_df, selected_rules, thresholds,weights)
+        # Set from the Performance expander below; tracing allocations slows the audit down
+        track_memory = st.session_state.get("perf_track_memory", False)
+        # Hidden switch for support: open the app with ?profile=1 (or ?profile=pyinstrument), or set TQA_PROFILE
+        from profiling import parse_profiler, profiler_from_env
+        profiler = parse_profiler(st.query_params.get("profile")) or profiler_from_env()
+        processed_df = cached_process_uploaded_file(input_df, input_fingerprint, selected_rules, thresholds, weights,
+                                                    track_memory, profiler)
+        reuse = processed_df.attrs.get('cache', {})
+        if reuse.get('hits'):
+            st.caption(f"♻️ Reused {reuse['hits']} cached rule results, re-evaluated {reuse['misses']} for new or edited tickets")
         row_count_out = st.selectbox("Show rows (Processed Output):", [5, 10, 20, 30], index=0, key="output_row_count")
         st.dataframe(processed_df.head(row_count_out), use_container_width=True)
+
+        with st.expander("⏱️ Performance"):
+            st.checkbox("Measure peak memory per rule (slower, re-runs the audit)", key="perf_track_memory")
+            rule_stats = processed_df.attrs.get('rule_stats', {})
+            if rule_stats:
+                total_seconds = sum(entry['seconds'] for entry in rule_stats.values())
+                st.caption(f"{len(processed_df)} tickets audited in {total_seconds:.2f}s. "
+                           "Cache counts include reused ticket results and date / mapping lookups.")
+                st.dataframe(pd.DataFrame(rule_stats_report(rule_stats)), use_container_width=True, hide_index=True)
+            import os
+            for path in processed_df.attrs.get('profile', []):
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        st.download_button(f"🔬 Download {os.path.basename(path)}", f.read(),
+                                           file_name=os.path.basename(path), key=f"profile_{os.path.basename(path)}")
         #st.dataframe(processed_df.reset_index(drop=True), use_container_width=True)
     except ValueError as ve:
         if "Length of values" in str(ve):
@@ -1297,7 +960,7 @@ if uploaded_file:
                 st.error("🔴 Tower Mapping Error: Mismatch between data and tower mapping file")
                 st.error("❌ This usually happens when Application names in your data don't match the Tower_Mapping.xlsx file")
                 st.info("💡 Suggestions:")
-                st.info("• Check if 'Tower_Maping.xlsx' file exists in the same folder")
+                st.info(f"• Check if '{TOWER_MAPPING_FILE}' exists")
                 st.info("• Verify Application names match between your data and tower mapping file")  
                 st.info("• Or remove 'Tower' from validation rules to continue without tower mapping")
             else:
@@ -1314,87 +977,30 @@ if uploaded_file:
         st.stop()
  
     # --- Enhanced Download Results
-    def to_enhanced_excel(df):
-        output = BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            # Main results sheet
-            df.to_excel(writer, index=False, sheet_name='Audit Results')
-            workbook = writer.book
-            worksheet = writer.sheets['Audit Results']
-            
-            # Style the headers
-            from openpyxl.styles import Font, PatternFill, Alignment
-            
-            header_font = Font(name='Calibri', bold=True, color='FFFFFF', size=11)
-            header_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')  # Professional blue
-            header_alignment = Alignment(horizontal='left', vertical='bottom')  # Left and bottom alignment
-            
-            # Apply header styling
-            for col in range(1, len(df.columns) + 1):
-                cell = worksheet.cell(row=1, column=col)
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = header_alignment
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Color only the Score data cells (not the header)
-            if 'Score' in df.columns:
-                score_col = df.columns.get_loc('Score') + 1
-                for row in range(2, len(df) + 2):  # Start from row 2 to skip header
-                    cell = worksheet.cell(row=row, column=score_col)
-                    if cell.value is not None:
-                        # Make only Score data cells green (not the header)
-                        cell.fill = PatternFill(start_color='C8E6C9', end_color='C8E6C9', fill_type='solid')  # Green
-            
-            # Create summary sheet
-            if 'Score' in df.columns:
-                summary_data = {
-                    'Metric': ['Total Records', 'Average Score', 'Excellent (≥75%)', 'Good (50-74%)', 'Needs Improvement (<50%)'],
-                    'Value': [
-                        len(df),
-                        f"{df['Score'].mean():.1f}%",
-                        len(df[df['Score'] >= 75]),
-                        len(df[(df['Score'] >= 50) & (df['Score'] < 75)]),
-                        len(df[df['Score'] < 50])
-                    ]
-                }
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, index=False, sheet_name='Summary')
-                
-                # Style summary sheet
-                summary_ws = writer.sheets['Summary']
-                for col in range(1, 3):
-                    cell = summary_ws.cell(row=1, column=col)
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal='left', vertical='bottom')  # Match template alignment
-                
-                summary_ws.column_dimensions['A'].width = 25
-                summary_ws.column_dimensions['B'].width = 15
-
-        output.seek(0)
-        return output
-    
-    st.download_button(
-        label="📥 Download Enhanced Results",
-        data=to_enhanced_excel(processed_df),
-        file_name=f"Audit_Results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        help="Download professionally formatted results with color-coded scores and summary sheet"
+    # Built only after "Prepare" is clicked, then served from the cache for this result
+    export_format = st.selectbox(
+        "Download format:",
+        list(EXPORT_FORMATS),
+        format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+        key="export_format",
+        help="Parquet / CSV (gzip) / Zip are for BI tools and load much faster than the formatted Excel workbook"
     )
+    export_key = get_result_key(input_fingerprint, selected_rules, thresholds, weights, include_observations)
+    prepared_key = (export_key, export_format)
+    if st.session_state.get("prepared_export_key") != prepared_key:
+        if st.button("📦 Prepare Enhanced Results", help="Build the results file for download"):
+            st.session_state["prepared_export_key"] = prepared_key
+    if st.session_state.get("prepared_export_key") == prepared_key:
+        with st.spinner("Building results file..."):
+            export_df = cached_add_observations(processed_df, input_df, input_fingerprint, selected_rules, thresholds, weights) if include_observations else processed_df
+            export_bytes = cached_results_export(export_df, export_key, export_format)
+        st.download_button(
+            label="📥 Download Enhanced Results",
+            data=export_bytes,
+            file_name=f"Audit_Results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}",
+            mime=EXPORT_FORMATS[export_format][1],
+            help="Download professionally formatted results with color-coded scores and summary sheet" if export_format == "xlsx" else None
+        )
 
     ################################
     ## --- Dashboard Visualization##
@@ -1495,7 +1101,7 @@ if uploaded_file:
 # The code calculates the mean audit score for each tower.
         if 'Tower' in processed_df.columns and 'Score' in processed_df.columns:
             import plotly.express as px
-            tower_avg = processed_df.groupby('Tower')['Score'].mean().reset_index()
+            tower_avg = processed_df.groupby('Tower', observed=True)['Score'].mean().reset_index()
             tower_avg['Score'] = tower_avg['Score'].round().astype(int)  # Round to remove decimals
 
             fig_tower_avg = px.bar(
@@ -1533,7 +1139,7 @@ if uploaded_file:
             ]
 
         if 'Application' in processed_df.columns:
-            app_avg = processed_df.groupby('Application')['Score'].mean().reset_index()
+            app_avg = processed_df.groupby('Application', observed=True)['Score'].mean().reset_index()
             app_avg['Score'] = app_avg['Score'].round().astype(int)  # Round to remove decimals
             fig_app_avg = px.bar(app_avg, x='Application', y='Score', title='Audit Score Application Wise',text='Score',color = 'Application')
     
@@ -1607,7 +1213,7 @@ if uploaded_file:
             assigned_counts.columns = ['Assigned to', 'Ticket Count']
             
             # Calculate average scores per associate
-            assigned_scores = processed_df.groupby('Assigned to')['Score'].mean().reset_index()
+            assigned_scores = processed_df.groupby('Assigned to', observed=True)['Score'].mean().reset_index()
             assigned_scores['Avg Score'] = assigned_scores['Score'].round(1)
             
             # Merge the data
@@ -1674,18 +1280,21 @@ if uploaded_file:
             st.plotly_chart(fig_assigned, use_container_width=True)
 
         ########
-        # Observations Summary
-        if 'Observations1' in processed_df.columns:
+        # Observations Summary (computed on demand)
+        if st.checkbox("📝 Show Observations Summary"):
+            # Observations read the comment columns even when no selected rule does
+            input_df = load_uploaded_dataframe(uploaded_file, input_fingerprint,
+                                               required_input_columns(selected_rules, True, column_requirements))
+            obs_df = cached_add_observations(processed_df, input_df, input_fingerprint, selected_rules, thresholds, weights)
             st.subheader("📝 Observations Summary")
             # Split all comma-separated feedbacks, flatten, and count each unique parameter
             from collections import Counter
             all_params = []
-            for obs in processed_df['Observations1'].dropna():
+            for obs in obs_df['Observations1'].dropna():
                 all_params.extend([param.strip() for param in obs.split(',') if param.strip()])
             param_counts = Counter(all_params)
             obs_summary_df = pd.DataFrame(param_counts.items(), columns=["Parameter", "Count"]).sort_values("Count", ascending=False)
             st.table(obs_summary_df)
-        # Observations2 Summary
-        if 'Observations2' in processed_df.columns:
+            # Observations2 Summary
             st.subheader("📝 Observations Summary")
-            st.write(processed_df['Observations2'].value_counts())
+            st.write(obs_df['Observations2'].value_counts())
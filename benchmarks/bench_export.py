@@ -0,0 +1,45 @@
+"""
+Time the results workbook export for each installed writer.
+
+    python benchmarks/bench_export.py [--rows 50000]
+
+The result frame is a synthetic audit of a few hundred tickets repeated to --rows.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from exporters import to_enhanced_excel, xlsx_writer_engine
+from logic import RULE_ORDER, add_age_column, process_uploaded_file
+from runner import DEFAULT_THRESHOLDS
+from benchmarks.synthetic import make_tickets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    input_df = make_tickets(300)
+    add_age_column(input_df)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = process_uploaded_file(input_df, RULE_ORDER, DEFAULT_THRESHOLDS, {}, include_observations=True)
+    result = pd.concat([result] * (args.rows // len(result) + 1), ignore_index=True).head(args.rows)
+
+    engines = ['openpyxl'] + (['xlsxwriter'] if xlsx_writer_engine() == 'xlsxwriter' else [])
+    print(f"{len(result)} rows x {len(result.columns)} columns")
+    for engine in engines:
+        start = time.perf_counter()
+        size = len(to_enhanced_excel(result, engine=engine).getvalue())
+        print(f"  {engine:<10} {time.perf_counter() - start:7.2f}s  {size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Memory used by the input and result frames, with and without the category dtypes.
+
+    python benchmarks/bench_memory.py [--rows 2000] [--project 500000]
+
+The audit runs once on a synthetic extract; the sizes are deep memory_usage() figures and are
+also projected linearly to --project tickets.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import RULE_ORDER, add_age_column, compact_input_frame, compact_result_frame, evaluate_rules, apply_scores
+from runner import DEFAULT_THRESHOLDS
+from benchmarks.synthetic import make_tickets
+
+
+def _mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def _report(name, before, after, rows, project):
+    saved = (1 - after / before) * 100 if before else 0
+    print(f"  {name:<8} {before:9.1f} MB -> {after:8.1f} MB  (-{saved:4.1f}%)   "
+          f"{project} tickets: {before / rows * project / 1000:6.2f} GB -> {after / rows * project / 1000:6.2f} GB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--project", type=int, default=500000, help="Ticket count to project the sizes to")
+    args = parser.parse_args(argv)
+
+    input_df = make_tickets(args.rows)
+    add_age_column(input_df)
+    with contextlib.redirect_stdout(io.StringIO()):
+        output_df, pass_matrix, _ = evaluate_rules(input_df, RULE_ORDER, DEFAULT_THRESHOLDS)
+        apply_scores(output_df, pass_matrix, {}, len(RULE_ORDER))
+
+    print(f"{args.rows} tickets x {len(RULE_ORDER)} rules")
+    input_before = _mb(input_df)
+    _report("input", input_before, _mb(compact_input_frame(input_df.copy())), args.rows, args.project)
+    output_before = _mb(output_df)
+    _report("results", output_before, _mb(compact_result_frame(output_df.copy())), args.rows, args.project)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare the ways of loading a ticket extract.
+
+    python benchmarks/bench_readers.py [--rows 20000] [--repeat 3] [--input existing.xlsx]
+
+Prints seconds per reader; every reader's frame is checked against pd.read_excel (openpyxl).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from readers import excel_engine_available, iter_excel_chunks, read_excel_fast
+from benchmarks.synthetic import write_workbook
+
+
+def _time(fn, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--input", help="Benchmark an existing workbook instead of a synthetic one")
+    args = parser.parse_args(argv)
+
+    path = args.input
+    if not path:
+        path = os.path.join(tempfile.gettempdir(), f"tqa_bench_{args.rows}.xlsx")
+        if not os.path.exists(path):
+            print(f"Writing synthetic workbook with {args.rows} rows -> {path}")
+            write_workbook(path, args.rows)
+    print(f"Input: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+    readers = {
+        "pd.read_excel (openpyxl)": lambda: pd.read_excel(path, engine="openpyxl"),
+        "openpyxl read-only chunks": lambda: pd.concat(iter_excel_chunks(path), ignore_index=True),
+        "read_excel_fast (auto)": lambda: read_excel_fast(path),
+    }
+    if excel_engine_available("calamine"):
+        readers["pd.read_excel (calamine)"] = lambda: pd.read_excel(path, engine="calamine")
+    else:
+        print("python-calamine not installed: skipping the calamine engine")
+
+    baseline = None
+    for name, reader in readers.items():
+        seconds, df = _time(reader, args.repeat)
+        if baseline is None:
+            baseline = (seconds, df)
+            same = "baseline"
+        else:
+            same = "same frame" if df.equals(baseline[1]) else "DIFFERENT frame"
+        print(f"  {name:<28} {seconds:7.2f}s  x{baseline[0] / seconds:4.1f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Throughput and memory of every audit rule, one at a time and end to end, on synthetic extracts.
+
+    python benchmarks/bench_rules.py [--sizes 1k,10k] [--rules "Tower,Priority Validation"]
+                                     [--no-per-rule] [--no-memory] [--output FILE] [--compare OLD.json]
+
+Sizes are ticket counts (1k, 10k, 100k, 1m or a number). Each rule is timed on its own with
+evaluate_rules, then the whole selection runs through process_uploaded_file. Peak memory comes
+from a second, tracemalloc-traced run (skip it with --no-memory on the large sizes).
+
+The results are written as JSON (default benchmarks/results/rules-<commit>-<time>.json) so two
+commits can be compared: --compare prints the rows/sec change per rule against an earlier file.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pandas as pd
+
+import logic
+from logic import RULE_ORDER, add_age_column, compact_input_frame, evaluate_rules, process_uploaded_file
+from runner import DEFAULT_THRESHOLDS
+from benchmarks.synthetic import make_tickets, parse_size
+
+RESULTS_DIR = os.path.join(REPO_DIR, 'benchmarks', 'results')
+
+# Per-value parse caches, cleared before every run so no rule profits from an earlier one
+# (the mapping-file caches stay warm, as they are in the app after start-up)
+ROW_CACHES = (logic._parse_timestamp_cached, logic._parse_rule_date_cached, logic._parse_ticket_date_cached)
+
+
+def clear_row_caches():
+    for cached in ROW_CACHES:
+        cached.cache_clear()
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _measure(func, rows, memory):
+    """Run func quietly; seconds and rows/sec from a plain run, peak MB from a traced one."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        clear_row_caches()
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        peak_mb = None
+        if memory:
+            clear_row_caches()
+            tracemalloc.start()
+            try:
+                func()
+                peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            finally:
+                tracemalloc.stop()
+    return {
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(rows / seconds) if seconds > 0 else None,
+        'peak_memory_mb': None if peak_mb is None else round(peak_mb, 2),
+    }
+
+
+def bench_size(rows, rules, per_rule=True, memory=True):
+    start = time.perf_counter()
+    input_df = make_tickets(rows)
+    add_age_column(input_df)
+    compact_input_frame(input_df)
+    result = {'rows': rows, 'generate_seconds': round(time.perf_counter() - start, 2), 'rules': {}}
+    print(f"\n{rows} tickets (generated in {result['generate_seconds']}s)")
+
+    if per_rule:
+        for rule in rules:
+            try:
+                stats = _measure(lambda: evaluate_rules(input_df, [rule], DEFAULT_THRESHOLDS), rows, memory)
+            except Exception as e:
+                stats = {'error': f"{type(e).__name__}: {e}"}
+                print(f"  {rule[:60]:<60}  failed: {stats['error']}")
+            else:
+                print(f"  {rule[:60]:<60}  {stats['seconds']:8.3f}s  {stats['rows_per_sec'] or 0:>10,} rows/s"
+                      + (f"  peak {stats['peak_memory_mb']:.1f} MB" if stats['peak_memory_mb'] is not None else ""))
+            result['rules'][rule] = stats
+
+    stats = _measure(lambda: process_uploaded_file(input_df, rules, DEFAULT_THRESHOLDS, {}), rows, memory)
+    print(f"  {'End to end (process_uploaded_file)':<60}  {stats['seconds']:8.3f}s  "
+          f"{stats['rows_per_sec'] or 0:>10,} rows/s"
+          + (f"  peak {stats['peak_memory_mb']:.1f} MB" if stats['peak_memory_mb'] is not None else ""))
+    result['end_to_end'] = stats
+    return result
+
+
+def compare(current, previous_path):
+    """Print rows/sec now vs an earlier results file, per size and rule."""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    old_sizes = {run['rows']: run for run in previous['runs']}
+    print(f"\nCompared with {previous.get('commit') or previous_path} ({previous.get('timestamp')}):")
+    for run in current['runs']:
+        old = old_sizes.get(run['rows'])
+        if old is None:
+            continue
+        print(f"  {run['rows']} tickets")
+        pairs = [(rule, stats, old['rules'].get(rule, {})) for rule, stats in run['rules'].items()]
+        pairs.append(('End to end', run['end_to_end'], old.get('end_to_end', {})))
+        for name, new_stats, old_stats in pairs:
+            new_rate, old_rate = new_stats.get('rows_per_sec'), old_stats.get('rows_per_sec')
+            if not new_rate or not old_rate:
+                continue
+            change = (new_rate / old_rate - 1) * 100
+            flag = "  ⚠️" if change < -10 else ""
+            print(f"    {name[:60]:<60}  {old_rate:>10,} -> {new_rate:>10,} rows/s  ({change:+6.1f}%){flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,10k", help="Comma-separated ticket counts (1k, 10k, 100k, 1m)")
+    parser.add_argument("--rules", default=None, help="Comma-separated rule names (default: all rules)")
+    parser.add_argument("--no-per-rule", action="store_true", help="Only run the end-to-end audit")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced run for peak memory")
+    parser.add_argument("--output", default=None, help="JSON results file")
+    parser.add_argument("--compare", default=None, help="Earlier JSON results file to compare against")
+    args = parser.parse_args(argv)
+
+    rules = [rule.strip() for rule in args.rules.split(',')] if args.rules else list(RULE_ORDER)
+    unknown = [rule for rule in rules if rule not in RULE_ORDER]
+    if unknown:
+        parser.error(f"unknown rule(s): {unknown}")
+
+    commit = _git_commit()
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'runs': [bench_size(parse_size(size), rules, per_rule=not args.no_per_rule, memory=not args.no_memory)
+                 for size in args.sizes.split(',')],
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"rules-{commit or 'nocommit'}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Start-up import profile of the app (python -X importtime), stage by stage.
+
+    python benchmarks/bench_startup.py [--top 15]
+
+Each stage is imported in a fresh interpreter on top of the previous stages, so the numbers are
+what a cold `streamlit run app.py` pays at that point: first page render, first upload,
+first download, first dashboard. Modules that are not installed are skipped.
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+STAGES = [
+    ("page render", ["streamlit", "templates"]),
+    ("first upload", ["pandas", "logic", "readers", "incremental"]),
+    ("first download", ["exporters", "openpyxl", "xlsxwriter", "pyarrow.parquet"]),
+    ("dashboard", ["plotly.express", "plotly.graph_objects", "streamlit_echarts"]),
+]
+
+
+def _installed(module):
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def import_profile(modules):
+    """Run `import modules` with -X importtime in a fresh interpreter; returns [(cumulative_us, name)]."""
+    code = "; ".join(f"import {module}" for module in modules) or "pass"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_DIR,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return rows
+
+
+def _top_level_total(rows):
+    # Top-level imports have no indentation after the '|' separator
+    return sum(cumulative for cumulative, name in rows if not name.startswith("  ")) / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list for the full app")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage (the fastest is reported)")
+    args = parser.parse_args(argv)
+
+    loaded = []
+    previous = 0.0
+    for stage, modules in STAGES:
+        modules = [module for module in modules if _installed(module)]
+        loaded += modules
+        total = min(_top_level_total(import_profile(loaded)) for _ in range(args.repeat))
+        print(f"  {stage:<15} +{max(total - previous, 0):6.2f}s  (cumulative {total:5.2f}s)  {', '.join(modules) or '-'}")
+        previous = total
+
+    print("\nSlowest imports (cumulative) for the whole app:")
+    rows = sorted(import_profile(loaded), reverse=True)
+    for cumulative, name in rows[:args.top]:
+        print(f"  {cumulative / 1e6:6.3f}s  {name.strip()}")
+
+
+if __name__ == "__main__":
+    main()
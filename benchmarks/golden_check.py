@@ -0,0 +1,279 @@
+"""
+Check that an optimized audit engine gives exactly the same results as the reference one.
+
+    python benchmarks/golden_check.py [--baseline serial] [--engines parallel,incremental]
+                                      [--sizes 1k] [--input anonymized.xlsx ...] [--config cfg.json]
+                                      [--examples 5] [--report FILE.json] [--observations auto|on|off]
+
+Engines:
+    serial        logic.process_uploaded_file (the reference)
+    parallel      logic.process_uploaded_file_parallel
+    incremental   incremental.process_uploaded_file_incremental (empty cache, so every rule runs)
+    git:REF       process_uploaded_file as of git revision REF, run from an exported copy of that tree
+    module:func   any callable taking (input_df, selected_rules, thresholds, weights[, include_observations])
+
+Every engine audits the same synthetic extracts (--sizes) and extract files (--input, use anonymized
+copies). Age is derived and the input compacted once, as in the app. The results are compared cell
+by cell as text, so failure reasons such as "Fail (Last gap > 1 day)" must match exactly. Exits
+with status 1 when any engine differs from the baseline.
+
+Revisions before Observations1/2 became optional always add them, so with a git: engine every
+engine runs with include_observations=True (--observations auto, the default); --observations on
+forces that and off runs without them.
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import warnings
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import pandas as pd
+
+from logic import RULE_ORDER, add_age_column, compact_input_frame
+from readers import read_input_file
+from runner import DEFAULT_THRESHOLDS, load_audit_config
+from benchmarks.bench_rules import clear_row_caches
+from benchmarks.synthetic import make_tickets, parse_size
+
+# Runs process_uploaded_file from an exported revision: argv = tree, input pickle, output pickle
+GIT_ENGINE_SCRIPT = """
+import contextlib, inspect, io, os, pickle, sys, time, warnings
+tree, input_path, output_path = sys.argv[1:4]
+sys.path.insert(0, tree)
+os.chdir(tree)
+from logic import process_uploaded_file
+with open(input_path, 'rb') as f:
+    input_df, selected_rules, thresholds, weights, options = pickle.load(f)
+# Older revisions take no include_observations (and always add the Observations columns)
+if 'include_observations' not in inspect.signature(process_uploaded_file).parameters:
+    options.pop('include_observations', None)
+with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+    warnings.simplefilter('ignore')
+    start = time.perf_counter()
+    output_df = process_uploaded_file(input_df, selected_rules, thresholds, weights, **options)
+    seconds = time.perf_counter() - start
+with open(output_path, 'wb') as f:
+    pickle.dump((output_df, seconds), f)
+"""
+
+
+def _export_revision(ref, target_dir):
+    """Unpack the tree of git revision ref into target_dir."""
+    archive = subprocess.run(['git', 'archive', '--format=tar', ref], cwd=REPO_DIR,
+                             capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target_dir)
+
+
+def _git_engine(ref, workdir):
+    tree = os.path.join(workdir, f"tree-{ref.replace('/', '_')}")
+    if not os.path.isdir(tree):
+        _export_revision(ref, tree)
+
+    def run(input_df, selected_rules, thresholds, weights, **options):
+        input_path = os.path.join(workdir, 'input.pkl')
+        output_path = os.path.join(workdir, 'output.pkl')
+        with open(input_path, 'wb') as f:
+            pickle.dump((input_df, selected_rules, thresholds, weights, options), f)
+        subprocess.run([sys.executable, '-c', GIT_ENGINE_SCRIPT, tree, input_path, output_path], check=True)
+        with open(output_path, 'rb') as f:
+            output_df, seconds = pickle.load(f)
+        return output_df, seconds
+    run.reports_own_time = True
+    return run
+
+
+def resolve_engine(name, workdir):
+    """Engine name -> callable(input_df, selected_rules, thresholds, weights)."""
+    if name == 'serial':
+        from logic import process_uploaded_file
+        return process_uploaded_file
+    if name == 'parallel':
+        from logic import process_uploaded_file_parallel
+        return process_uploaded_file_parallel
+    if name == 'incremental':
+        from incremental import TicketResultCache, process_uploaded_file_incremental
+
+        def run(input_df, selected_rules, thresholds, weights, **options):
+            return process_uploaded_file_incremental(input_df, selected_rules, thresholds, weights,
+                                                     cache=TicketResultCache(), **options)
+        return run
+    if name.startswith('git:'):
+        return _git_engine(name[4:], workdir)
+    if ':' in name:
+        module_name, func_name = name.split(':', 1)
+        return getattr(importlib.import_module(module_name), func_name)
+    raise ValueError(f"Unknown engine '{name}'")
+
+
+def run_engine(engine, input_df, selected_rules, thresholds, weights, include_observations=False):
+    """
+    (output_df, seconds) for one audit, with the rule logging and the per-row date warnings
+    suppressed and cold date caches. include_observations is only passed on when set.
+    """
+    options = {'include_observations': True} if include_observations else {}
+    clear_row_caches()
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        start = time.perf_counter()
+        result = engine(input_df.copy(), selected_rules, thresholds, weights, **options)
+        seconds = time.perf_counter() - start
+    if getattr(engine, 'reports_own_time', False):
+        result, seconds = result
+    return result, seconds
+
+
+def _as_text(series):
+    """Cell values as comparable text; missing values become None."""
+    values = series.astype(object).reset_index(drop=True)
+    return values.where(values.notna(), None).map(lambda v: v if v is None else str(v))
+
+
+def diff_results(baseline_df, candidate_df, key_column='Ticket Number', examples=5):
+    """
+    Compare two result frames column by column. Returns a dict with the column differences
+    and, per differing column, the mismatch count and the first few (ticket, baseline, candidate).
+    """
+    report = {
+        'rows': [len(baseline_df), len(candidate_df)],
+        'missing_columns': [col for col in baseline_df.columns if col not in candidate_df.columns],
+        'extra_columns': [col for col in candidate_df.columns if col not in baseline_df.columns],
+        'column_order_matches': list(baseline_df.columns) == list(candidate_df.columns),
+        'mismatches': {},
+    }
+    if len(baseline_df) != len(candidate_df):
+        return report
+
+    keys = (_as_text(baseline_df[key_column]) if key_column in baseline_df.columns
+            else pd.Series(range(len(baseline_df))))
+    for col in baseline_df.columns:
+        if col not in candidate_df.columns:
+            continue
+        expected, actual = _as_text(baseline_df[col]), _as_text(candidate_df[col])
+        differs = expected.ne(actual) & ~(expected.isna() & actual.isna())
+        count = int(differs.sum())
+        if count:
+            report['mismatches'][col] = {
+                'count': count,
+                'examples': [
+                    {'ticket': keys[i], 'baseline': expected[i], 'candidate': actual[i]}
+                    for i in differs[differs].index[:examples]
+                ],
+            }
+    return report
+
+
+def is_equivalent(report):
+    return (report['rows'][0] == report['rows'][1] and not report['missing_columns']
+            and not report['extra_columns'] and not report['mismatches'])
+
+
+def load_datasets(sizes, inputs):
+    datasets = []
+    for size in sizes:
+        rows = parse_size(size)
+        datasets.append((f"synthetic-{size}", make_tickets(rows)))
+    for path in inputs:
+        datasets.append((os.path.basename(path), read_input_file(path)))
+    for _, input_df in datasets:
+        add_age_column(input_df)
+        compact_input_frame(input_df)
+    return datasets
+
+
+def print_report(baseline_name, baseline_seconds, engine_name, seconds, report):
+    speedup = baseline_seconds / seconds if seconds > 0 else float('inf')
+    status = "✅ identical" if is_equivalent(report) else "❌ DIFFERENT"
+    print(f"  {engine_name:<20} {seconds:8.2f}s  x{speedup:5.2f} vs {baseline_name}   {status}")
+    if report['rows'][0] != report['rows'][1]:
+        print(f"      row count {report['rows'][0]} -> {report['rows'][1]}")
+    if report['missing_columns']:
+        print(f"      missing columns: {report['missing_columns']}")
+    if report['extra_columns']:
+        print(f"      extra columns: {report['extra_columns']}")
+    if not report['column_order_matches'] and not (report['missing_columns'] or report['extra_columns']):
+        print("      column order differs")
+    for col, info in report['mismatches'].items():
+        print(f"      {col}: {info['count']} cell(s) differ")
+        for example in info['examples']:
+            print(f"          {example['ticket']}: {example['baseline']!r} -> {example['candidate']!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default="serial", help="Reference engine (default serial)")
+    parser.add_argument("--engines", default="parallel,incremental", help="Comma-separated engines to check")
+    parser.add_argument("--sizes", default="1k", help="Synthetic extract sizes, comma-separated ('' for none)")
+    parser.add_argument("--input", nargs="*", default=[], help="Extract files to audit as well (anonymized)")
+    parser.add_argument("--config", default=None, help="Audit config JSON (default: all rules, default thresholds)")
+    parser.add_argument("--examples", type=int, default=5, help="Differing cells shown per column")
+    parser.add_argument("--report", default=None, help="Write the full comparison as JSON")
+    parser.add_argument("--observations", choices=("auto", "on", "off"), default="auto",
+                        help="Run every engine with include_observations=True: auto = when a git: engine "
+                             "is compared (older revisions always add Observations1/2)")
+    args = parser.parse_args(argv)
+
+    if args.config:
+        selected_rules, thresholds, weights = load_audit_config(args.config)
+    else:
+        selected_rules, thresholds, weights = list(RULE_ORDER), dict(DEFAULT_THRESHOLDS), {}
+
+    sizes = [size for size in args.sizes.split(',') if size.strip()]
+    datasets = load_datasets(sizes, args.input)
+    if not datasets:
+        parser.error("nothing to audit: give --sizes and/or --input")
+
+    engine_names = [args.baseline] + [name for name in args.engines.split(',') if name.strip()]
+    if args.observations == 'auto':
+        include_observations = any(name.startswith('git:') for name in engine_names)
+    else:
+        include_observations = args.observations == 'on'
+    if include_observations:
+        print("ℹ️ Comparing with Observations1/2 included")
+
+    full_report = {'baseline': args.baseline, 'include_observations': include_observations, 'datasets': {}}
+    all_equivalent = True
+    with tempfile.TemporaryDirectory() as workdir:
+        baseline = resolve_engine(args.baseline, workdir)
+        engines = [(name, resolve_engine(name, workdir)) for name in args.engines.split(',') if name.strip()]
+
+        for dataset, input_df in datasets:
+            print(f"\n{dataset}: {len(input_df)} tickets, {len(selected_rules)} rules")
+            baseline_df, baseline_seconds = run_engine(baseline, input_df, selected_rules, thresholds, weights,
+                                                       include_observations)
+            print(f"  {args.baseline:<20} {baseline_seconds:8.2f}s  (baseline)")
+            full_report['datasets'][dataset] = {'rows': len(input_df), 'baseline_seconds': round(baseline_seconds, 3),
+                                                'engines': {}}
+            for name, engine in engines:
+                result_df, seconds = run_engine(engine, input_df, selected_rules, thresholds, weights,
+                                                include_observations)
+                report = diff_results(baseline_df, result_df, examples=args.examples)
+                all_equivalent = all_equivalent and is_equivalent(report)
+                print_report(args.baseline, baseline_seconds, name, seconds, report)
+                full_report['datasets'][dataset]['engines'][name] = {
+                    'seconds': round(seconds, 3),
+                    'speedup': round(baseline_seconds / seconds, 2) if seconds > 0 else None,
+                    'equivalent': is_equivalent(report),
+                    **report,
+                }
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(full_report, f, indent=2, default=str)
+        print(f"\nReport written to {args.report}")
+    return 0 if all_equivalent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
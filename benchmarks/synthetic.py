@@ -0,0 +1,120 @@
+"""
+Synthetic ticket extracts for the benchmarks: same columns as the upload template, with a mix of
+date formats, priorities, pending reasons and multi-entry work notes similar to real exports.
+Age is left to add_age_column, as for an uploaded file.
+"""
+import os
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRIORITIES = ['1-Critical', '2 - High', '3-Medium', '4-Low', 'P2', 'sev3', 'Moderate', 'None', np.nan, 'high',
+              'P1', 'Sev 1', '2–High', 'priority 4', 'Critical', '3 - Moderate', 's2']
+IMPACT_URGENCY = ['1-High', '2-Medium', '3-Low', 'High', 'Low', 'medium', np.nan]
+PENDING_REASONS = [np.nan, 'None', 'Pending Change', 'Pending Vendor', 'Pending Problem',
+                   'Pending Fulfillment', 'Pending Incident', 'Pending Customer', 'Other']
+RELATED_RECORDS = [np.nan, 'None', 'CHG0012', 'PRB001', 'RITM123', 'INC555', 'XYZ']
+WORDS = ("the user reported issue with access we are working on it awaiting user confirmation "
+         "first reminder second reminder final reminder confirmed closing ticket resolved working "
+         "fine thank you for reaching out to us Password1! P@ssw0rd9 attachment").split()
+# Whole phrases the pending-justification, reminder and template rules look for
+PHRASES = ['Awaiting user confirmation.', 'Waiting for vendor update.', 'Gentle reminder 1 sent to the user.',
+           'Second reminder sent.', 'Final reminder before closure.', 'User confirmed over Teams, closing the ticket.',
+           'Thank you for reaching out to us.', 'Enter Resolution/Closure Summary here']
+DATE_FORMATS = ['%d/%m/%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S', '%m/%d/%Y %H:%M', '%d-%m-%Y %H:%M:%S']
+
+
+# Named sizes accepted by the benchmarks (--sizes 1k,10k)
+SIZES = {'1k': 1000, '10k': 10000, '100k': 100000, '1m': 1000000}
+
+
+def parse_size(text):
+    """'10k' / '1M' / '2500' -> number of tickets."""
+    text = str(text).strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    if text.endswith('k'):
+        return int(float(text[:-1]) * 1000)
+    if text.endswith('m'):
+        return int(float(text[:-1]) * 1000000)
+    return int(text)
+
+
+def _mapping_values():
+    tower = pd.read_excel(os.path.join(REPO_DIR, 'Tower_Maping.xlsx'))
+    apps = list(tower['Application Name'].dropna().unique()[:30]) + ['Unknown App', np.nan]
+    groups = list(tower['Assignment group'].dropna().unique()[:30]) + ['Wrong Group']
+    return apps, groups
+
+
+def make_tickets(n=1000, seed=7, notes_per_ticket=(1, 6), words_per_note=(3, 30)):
+    """Return a DataFrame of n synthetic tickets (deterministic for a given seed)."""
+    rnd = random.Random(seed)
+    apps, groups = _mapping_values()
+
+    def work_notes(opened, count):
+        entries = []
+        stamp = opened
+        for _ in range(count):
+            stamp = stamp + timedelta(days=rnd.randint(0, 3), hours=rnd.randint(0, 5))
+            body = ' '.join(rnd.choice(WORDS) for _ in range(rnd.randint(*words_per_note)))
+            if rnd.random() < 0.3:
+                body = f"{body} {rnd.choice(PHRASES)}"
+            if rnd.random() < 0.5:
+                body = body.capitalize() + '.'
+            header = stamp.strftime(rnd.choice(['%d/%m/%Y %H:%M:%S', '%Y-%m-%d %H:%M:%S']))
+            entries.append(f"{header} - John Doe (Work notes)\n{body}")
+        return '\n\n'.join(entries)
+
+    rows = []
+    for i in range(n):
+        opened = datetime(2025, 1, 1) + timedelta(days=rnd.randint(0, 200), hours=rnd.randint(0, 23),
+                                                  minutes=rnd.randint(0, 59))
+        closed = opened + timedelta(days=rnd.randint(0, 20), hours=rnd.randint(0, 10))
+        fmt = rnd.choice(DATE_FORMATS)
+        rows.append({
+            'Number': f'INC{i:07d}',
+            'Priority': rnd.choice(PRIORITIES),
+            'State': rnd.choice(['Closed', 'Resolved']),
+            'Pending reason': rnd.choice(PENDING_REASONS),
+            'Application Name / CI': rnd.choice(apps),
+            'Assignment Group': rnd.choice(groups),
+            'Assigned to': rnd.choice(['A', 'B', 'C']),
+            'Knowledge Article Used': rnd.choice(['KB001', '', np.nan, 'TRUE', 'no']),
+            'Short description': rnd.choice(['short', 'User unable to access SAP application after password reset ok', np.nan]),
+            'Comments and Work notes': rnd.choice([work_notes(opened, rnd.randint(*notes_per_ticket)), np.nan, 'None']),
+            'Additional comments': rnd.choice([work_notes(opened, rnd.randint(0, 3)), np.nan]),
+            'Description': rnd.choice(['User reported login failure after recent password policy update access account',
+                                       'network issue server down', np.nan, 'x' * 200]),
+            'Closed': closed.strftime(fmt) if rnd.random() > 0.05 else np.nan,
+            'Opened': opened.strftime(fmt) if rnd.random() > 0.05 else 'garbage',
+            'Closed by': 'J',
+            'Subcategory': rnd.choice(['Provide,  Modify Access', 'Delete Access', np.nan]),
+            'Category': rnd.choice(['Access', 'User Access Management', 'Software', np.nan]),
+            'Response Time': rnd.choice([2.5, 10, 45, 200, 2000, np.nan, 'abc']),
+            'Response SLA': rnd.choice(['Met', 'Breached', np.nan, 'true']),
+            'Resolution SLA': rnd.choice(['Met', 'missed', np.nan]),
+            'Reopened': rnd.choice([0, 1, 'yes', 'no', np.nan, 'None', True, False, '2']),
+            'Related Record': rnd.choice(RELATED_RECORDS),
+            'Reassignment count': rnd.choice([0, 1, 3, 5, np.nan]),
+            'Impact': rnd.choice(IMPACT_URGENCY),
+            'Urgency': rnd.choice(IMPACT_URGENCY),
+            'Has Attachments': rnd.choice(['TRUE', 'FALSE', np.nan, 'yes']),
+        })
+    return pd.DataFrame(rows)
+
+
+def write_workbook(path, n=1000, seed=7):
+    """Write a synthetic extract to path (.xlsx / .csv / .parquet) and return the DataFrame."""
+    df = make_tickets(n, seed)
+    if path.endswith('.csv'):
+        df.to_csv(path, index=False)
+    elif path.endswith('.parquet'):
+        df.astype({col: str for col in df.columns if df[col].dtype == object}).to_parquet(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+    return df
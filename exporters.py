@@ -0,0 +1,389 @@
+import csv
+import gzip
+import importlib.util
+import io
+import re
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+
+
+def _clean_cell(value):
+    """Convert a DataFrame value into something openpyxl/csv can write (NaN/NaT -> empty)."""
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, 'item'):
+        # numpy scalar -> python scalar
+        return value.item()
+    return value
+
+
+# Result file formats, matched against the end of the output file name
+RESULT_FORMATS = ('xlsx', 'csv', 'csv.gz', 'parquet', 'zip')
+
+# Tickets per block when a whole result frame is streamed to a writer
+WRITE_BLOCK_ROWS = 10000
+
+
+def result_format(path):
+    """Result format of an output file name ('csv.gz' for .csv.gz), or None if unsupported."""
+    name = str(path).lower()
+    for fmt in sorted(RESULT_FORMATS, key=len, reverse=True):
+        if name.endswith('.' + fmt):
+            return fmt
+    return None
+
+
+def _parquet_ready(chunk_df):
+    """Object columns mixing strings and numbers are written as text (Arrow needs one type per column)."""
+    mixed = {col: chunk_df[col].map(lambda v: None if pd.isna(v) else str(v))
+             for col in chunk_df.columns
+             if chunk_df[col].dtype == object and pd.api.types.infer_dtype(chunk_df[col], skipna=True) not in ('string', 'empty')}
+    return chunk_df.assign(**mixed) if mixed else chunk_df
+
+
+def _parquet_schema(table):
+    """
+    Schema of the first chunk. Columns that are categorical in the result frame (rule statuses,
+    Tower, Score Category) stay dictionary-encoded, so Pass / Fail is stored once; Ticket Number
+    and free text such as Observations are written as plain strings, as are all-blank columns.
+    """
+    import pyarrow as pa
+
+    fields = []
+    for field in table.schema:
+        field_type = field.type
+        if pa.types.is_dictionary(field_type):
+            field_type = pa.dictionary(pa.int32(), pa.string())
+        elif (pa.types.is_null(field_type) or pa.types.is_string(field_type)
+              or pa.types.is_large_string(field_type)):
+            field_type = pa.string()
+        fields.append(pa.field(field.name, field_type))
+    return pa.schema(fields)
+
+
+class StreamingResultWriter:
+    """
+    Append audit results to an output file chunk by chunk, so the full result never has to be
+    held in memory. Supports .xlsx (openpyxl write-only mode), .csv, .csv.gz and .parquet
+    (pyarrow, status columns dictionary-encoded). path can also be a binary file object when
+    fmt is given.
+    """
+
+    def __init__(self, path, sheet_name="Audit Results", fmt=None):
+        self.path = path if hasattr(path, 'write') else str(path)
+        self.sheet_name = sheet_name
+        self.format = fmt or result_format(self.path)
+        if self.format not in ('xlsx', 'csv', 'csv.gz', 'parquet'):
+            raise ValueError(f"Unsupported output file type '{path}' (expected .xlsx, .csv, .csv.gz or .parquet)")
+        self.columns = None
+        self.rows_written = 0
+        self._workbook = None
+        self._worksheet = None
+        self._csv_file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._parquet_schema = None
+        self._handles = []
+
+    def _open_binary(self):
+        if hasattr(self.path, 'write'):
+            return self.path
+        handle = open(self.path, 'wb')
+        self._handles.append(handle)
+        return handle
+
+    def _open(self, columns):
+        self.columns = list(columns)
+        if self.format == 'xlsx':
+            from openpyxl import Workbook
+
+            self._workbook = Workbook(write_only=True)
+            self._worksheet = self._workbook.create_sheet(self.sheet_name)
+            self._worksheet.append(self.columns)
+        elif self.format in ('csv', 'csv.gz'):
+            binary = self._open_binary()
+            if self.format == 'csv.gz':
+                binary = gzip.GzipFile(fileobj=binary, mode='wb')
+                self._handles.append(binary)
+            self._csv_file = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(self.columns)
+
+    def _write_parquet(self, chunk_df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(_parquet_ready(chunk_df), preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_schema = _parquet_schema(table)
+            self._parquet_writer = pq.ParquetWriter(self._open_binary(), self._parquet_schema)
+        self._parquet_writer.write_table(table.cast(self._parquet_schema))
+
+    def write(self, chunk_df):
+        """Append one chunk of results; columns are aligned to the first chunk written."""
+        if self.columns is None:
+            self._open(chunk_df.columns)
+        else:
+            chunk_df = chunk_df.reindex(columns=self.columns)
+
+        if self.format == 'parquet':
+            self._write_parquet(chunk_df)
+        else:
+            for values in chunk_df.itertuples(index=False, name=None):
+                row = [_clean_cell(v) for v in values]
+                if self._worksheet is not None:
+                    self._worksheet.append(row)
+                else:
+                    self._csv_writer.writerow(['' if v is None else v for v in row])
+        self.rows_written += len(chunk_df)
+
+    def write_frame(self, df, block_rows=WRITE_BLOCK_ROWS):
+        """Write a whole result frame a block of tickets at a time."""
+        if df.empty:
+            self.write(df)
+        for start in range(0, len(df), block_rows):
+            self.write(df.iloc[start:start + block_rows])
+
+    def close(self):
+        if self._workbook is not None:
+            self._workbook.save(self.path)
+            self._workbook = None
+            self._worksheet = None
+        if self._csv_file is not None:
+            self._csv_file.flush()
+            # Leave the underlying (gzip / caller's) stream open; it is closed below if we opened it
+            self._csv_file.detach()
+            self._csv_file = None
+            self._csv_writer = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        for handle in reversed(self._handles):
+            handle.close()
+        self._handles = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def _safe_file_name(value):
+    name = re.sub(r'[^\w\- ]+', '_', str(value)).strip() or 'blank'
+    return name[:80]
+
+
+def write_results_zip(df, target, split_column='Tower'):
+    """
+    Zip bundle of CSV files: All_Results.csv plus one file per split_column value (e.g. per
+    tower) under by_<column>/. Each member is streamed into the archive block by block.
+    """
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open('All_Results.csv', 'w') as member:
+            with StreamingResultWriter(member, fmt='csv') as writer:
+                writer.write_frame(df)
+        if split_column in df.columns:
+            folder = f"by_{_safe_file_name(split_column).replace(' ', '_')}"
+            keys = df[split_column].astype(object).where(df[split_column].notna(), 'Blank')
+            used_names = set()
+            for key, positions in keys.groupby(keys, sort=True).indices.items():
+                name = _safe_file_name(key)
+                while name in used_names:
+                    name += '_'
+                used_names.add(name)
+                with archive.open(f"{folder}/{name}.csv", 'w') as member:
+                    with StreamingResultWriter(member, fmt='csv') as writer:
+                        writer.write_frame(df.iloc[positions])
+
+
+def write_results_file(df, path):
+    """Write a result frame to path; the format follows the name (.xlsx, .csv, .csv.gz, .parquet, .zip)."""
+    fmt = result_format(path)
+    if fmt == 'xlsx':
+        with open(path, 'wb') as f:
+            f.write(to_enhanced_excel(df).getvalue())
+    elif fmt == 'zip':
+        write_results_zip(df, path)
+    else:
+        with StreamingResultWriter(path) as writer:
+            writer.write_frame(df)
+
+
+def results_to_bytes(df, fmt):
+    """Result frame as the bytes of a download in one of RESULT_FORMATS."""
+    if fmt == 'xlsx':
+        return to_enhanced_excel(df).getvalue()
+    output = BytesIO()
+    if fmt == 'zip':
+        write_results_zip(df, output)
+    else:
+        with StreamingResultWriter(output, fmt=fmt) as writer:
+            writer.write_frame(df)
+    return output.getvalue()
+
+
+# Rows used to estimate each column's width (head plus a random sample) and rows converted per block
+WIDTH_SAMPLE_ROWS = 5000
+EXPORT_BLOCK_ROWS = 10000
+
+HEADER_FILL_COLOR = '366092'  # Professional blue
+SCORE_FILL_COLOR = 'C8E6C9'  # Green
+
+
+def estimate_column_widths(df, sample_rows=WIDTH_SAMPLE_ROWS, max_width=50):
+    """Column widths from the longest header / value text (as Excel shows it) in a sample of rows."""
+    if len(df) > sample_rows:
+        sample = pd.concat([df.head(sample_rows // 2), df.sample(sample_rows // 2, random_state=0)])
+    else:
+        sample = df
+    widths = []
+    for position, column in enumerate(df.columns):
+        values = sample.iloc[:, position].astype(object)
+        # Blank cells counted as 'None', as the cell-by-cell width pass did
+        lengths = values.where(values.notna(), 'None').astype(str).str.len()
+        longest = max(len(str(column)), int(lengths.max()) if len(lengths) else 0)
+        widths.append(min(longest + 2, max_width))
+    return widths
+
+
+def iter_excel_rows(df, block_rows=EXPORT_BLOCK_ROWS):
+    """Rows of df as lists of plain Python values (NaN / NaT -> None), converted a block at a time."""
+    for start in range(0, len(df), block_rows):
+        block = df.iloc[start:start + block_rows].astype(object)
+        yield from block.where(block.notna(), None).values.tolist()
+
+
+def _write_styled_sheet(workbook, sheet_name, df, widths):
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    worksheet = workbook.create_sheet(sheet_name)
+    # Write-only sheets take widths and conditional formats before the first row
+    for position, width in enumerate(widths, start=1):
+        worksheet.column_dimensions[get_column_letter(position)].width = width
+
+    header_font = Font(name='Calibri', bold=True, color='FFFFFF', size=11)
+    header_fill = PatternFill(start_color=HEADER_FILL_COLOR, end_color=HEADER_FILL_COLOR, fill_type='solid')
+    header_alignment = Alignment(horizontal='left', vertical='bottom')
+    header = []
+    for column in df.columns:
+        cell = WriteOnlyCell(worksheet, value=str(column))
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = header_alignment
+        header.append(cell)
+    worksheet.append(header)
+    return worksheet
+
+
+def _summary_frame(df):
+    return pd.DataFrame({
+        'Metric': ['Total Records', 'Average Score', 'Excellent (≥75%)', 'Good (50-74%)', 'Needs Improvement (<50%)'],
+        'Value': [
+            len(df),
+            f"{df['Score'].mean():.1f}%",
+            int((df['Score'] >= 75).sum()),
+            int(((df['Score'] >= 50) & (df['Score'] < 75)).sum()),
+            int((df['Score'] < 50).sum()),
+        ]
+    })
+
+
+def _enhanced_excel_openpyxl(df, output):
+    from openpyxl import Workbook
+    from openpyxl.formatting.rule import FormulaRule
+    from openpyxl.styles import PatternFill
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+
+    # Main results sheet
+    worksheet = _write_styled_sheet(workbook, 'Audit Results', df, estimate_column_widths(df))
+    if 'Score' in df.columns and len(df):
+        # Color only the Score data cells (not the header)
+        score_letter = get_column_letter(df.columns.get_loc('Score') + 1)
+        score_fill = PatternFill(start_color=SCORE_FILL_COLOR, end_color=SCORE_FILL_COLOR, fill_type='solid')
+        worksheet.conditional_formatting.add(
+            f"{score_letter}2:{score_letter}{len(df) + 1}",
+            FormulaRule(formula=[f"NOT(ISBLANK({score_letter}2))"], fill=score_fill),
+        )
+    for row in iter_excel_rows(df):
+        worksheet.append(row)
+
+    # Create summary sheet
+    if 'Score' in df.columns:
+        summary_df = _summary_frame(df)
+        summary_ws = _write_styled_sheet(workbook, 'Summary', summary_df, [25, 15])
+        for row in iter_excel_rows(summary_df):
+            summary_ws.append(row)
+
+    workbook.save(output)
+
+
+def _enhanced_excel_xlsxwriter(df, output):
+    import xlsxwriter
+
+    # constant_memory flushes each row to a temp file once the next row starts
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'strings_to_formulas': False,
+        'strings_to_urls': False,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    header_format = workbook.add_format({
+        'bold': True, 'font_name': 'Calibri', 'font_size': 11, 'font_color': '#FFFFFF',
+        'bg_color': f'#{HEADER_FILL_COLOR}', 'align': 'left', 'valign': 'bottom',
+    })
+    score_format = workbook.add_format({'bg_color': f'#{SCORE_FILL_COLOR}'})
+
+    def write_sheet(name, frame, widths):
+        worksheet = workbook.add_worksheet(name)
+        for position, width in enumerate(widths):
+            worksheet.set_column(position, position, width)
+        worksheet.write_row(0, 0, [str(column) for column in frame.columns], header_format)
+        for row_number, row in enumerate(iter_excel_rows(frame), start=1):
+            worksheet.write_row(row_number, 0, row)
+        return worksheet
+
+    # Main results sheet
+    worksheet = write_sheet('Audit Results', df, estimate_column_widths(df))
+    if 'Score' in df.columns and len(df):
+        # Color only the Score data cells (not the header)
+        score_col = df.columns.get_loc('Score')
+        worksheet.conditional_format(1, score_col, len(df), score_col, {'type': 'no_blanks', 'format': score_format})
+
+    # Create summary sheet
+    if 'Score' in df.columns:
+        write_sheet('Summary', _summary_frame(df), [25, 15])
+
+    workbook.close()
+
+
+def xlsx_writer_engine():
+    """'xlsxwriter' when installed (several times faster), otherwise openpyxl's write-only mode."""
+    return 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') is not None else 'openpyxl'
+
+
+def to_enhanced_excel(df, engine=None):
+    """
+    Results workbook used by the app download and the CLI: styled Audit Results sheet plus a
+    Summary sheet. Rows are streamed (xlsxwriter constant_memory or openpyxl write-only), column
+    widths are estimated from a sample and the Score fill is one column-level conditional format.
+    """
+    output = BytesIO()
+    if (engine or xlsx_writer_engine()) == 'xlsxwriter':
+        _enhanced_excel_xlsxwriter(df, output)
+    else:
+        _enhanced_excel_openpyxl(df, output)
+    output.seek(0)
+    return output
@@ -0,0 +1,247 @@
+"""
+Incremental re-audit: per-ticket, per-rule result cache.
+
+A ticket's result for a rule only depends on the input columns that rule reads, the rule's
+thresholds and (for some rules) the mapping files. Results are cached under
+    rule config  ->  (Number, hash of the rule's input columns)  ->  (output values, scoring status)
+so re-uploading an extract with a few edited rows only re-evaluates the edited tickets, and only
+for the rules whose inputs changed. On top of that, each rule config keeps its last few complete
+result columns keyed by a fingerprint of the rule's input columns: changing a weight, one rule's
+threshold or ticking an extra rule reuses every other rule's columns without touching the
+per-ticket entries. Score / Weightage Score are always recomputed from the merged rule statuses,
+which is the only work a weight change costs.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from logic import (
+    COMMENT_COLUMNS,
+    OBSERVATION_COLUMNS,
+    PASSWORD_RULE,
+    RULE_INPUT_COLUMNS,
+    RULE_MAPPING_FILES,
+    RULE_ORDER,
+    RULE_THRESHOLD_KEYS,
+    RuleTimer,
+    _file_signature,
+    apply_scores,
+    compact_result_frame,
+    compute_observations1,
+    compute_observations2,
+    evaluate_rules,
+)
+
+IDENTIFIER_COLUMNS = ["Ticket Number", "Assigned to", "Application"]
+
+
+class TicketResultCache:
+    """
+    Per-rule stores of ticket results. Each distinct rule config (thresholds, mapping file
+    version, input column layout) gets its own store; the least recently used configs are
+    dropped beyond max_configs.
+    """
+
+    def __init__(self, max_configs=128, max_tickets_per_config=500000, max_frames_per_config=4):
+        self.max_configs = max_configs
+        self.max_tickets_per_config = max_tickets_per_config
+        self.max_frames_per_config = max_frames_per_config
+        self._stores = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def store(self, config_key):
+        with self._lock:
+            store = self._stores.get(config_key)
+            if store is None:
+                # results: per-ticket entries; frames: whole rule columns keyed by input fingerprint
+                store = {'columns': None, 'results': {}, 'frames': OrderedDict()}
+                self._stores[config_key] = store
+                while len(self._stores) > self.max_configs:
+                    self._stores.popitem(last=False)
+            else:
+                self._stores.move_to_end(config_key)
+            if len(store['results']) > self.max_tickets_per_config:
+                store['results'].clear()
+            return store
+
+    def clear(self):
+        with self._lock:
+            self._stores.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'configs': len(self._stores),
+            'tickets': sum(len(store['results']) for store in self._stores.values()),
+            'frames': sum(len(store['frames']) for store in self._stores.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits * 100 / total, 1) if total else None,
+        }
+
+
+# Shared by the app (one Streamlit server process) and the CLI / service when no cache is passed
+DEFAULT_TICKET_CACHE = TicketResultCache()
+
+
+def _mapping_signature(path):
+    try:
+        return _file_signature(path)
+    except OSError:
+        return None
+
+
+def _rule_config_key(rule, input_df, thresholds, password_filled):
+    """Everything besides the ticket's own fields that can change the rule's result."""
+    columns = RULE_INPUT_COLUMNS.get(rule, list(input_df.columns))
+    layout = tuple((col, str(input_df[col].dtype)) if col in input_df.columns else (col, None)
+                   for col in columns)
+    threshold_values = json.dumps({key: thresholds.get(key) for key in RULE_THRESHOLD_KEYS.get(rule, [])},
+                                  sort_keys=True, default=str)
+    mappings = tuple((path, _mapping_signature(path)) for path in RULE_MAPPING_FILES.get(rule, []))
+    return (rule, layout, threshold_values, mappings, password_filled)
+
+
+def _column_hash(series):
+    """uint64 hash per ticket of one column; object values are tagged with their type so 1 != '1'."""
+    hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    if series.dtype == object:
+        tags = series.map(lambda v: type(v).__name__)
+        hashes = hashes * np.uint64(1000003) ^ pd.util.hash_pandas_object(tags, index=False).to_numpy()
+    return hashes
+
+
+def _row_hashes(column_hashes, input_df, columns):
+    """Combine the cached per-column hashes of the columns a rule reads into one hash per ticket."""
+    combined = np.zeros(len(input_df), dtype='uint64')
+    for col in columns:
+        if col not in input_df.columns:
+            continue
+        if col not in column_hashes:
+            column_hashes[col] = _column_hash(input_df[col])
+        combined = combined * np.uint64(1000003) ^ column_hashes[col]
+    return combined
+
+
+def _fingerprint(*arrays):
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def _ticket_numbers(input_df):
+    if "Number" not in input_df.columns:
+        return [""] * len(input_df)
+    return ["" if pd.isnull(number) else str(number) for number in input_df["Number"]]
+
+
+def _evaluate_rule_tickets(store, rule, input_df, thresholds, ticket_numbers, row_hashes, password_filled):
+    """
+    Build one rule's output columns and status lists for input_df from the per-ticket results,
+    evaluating only the tickets not cached yet.
+    """
+    results = store['results']
+    ticket_keys = list(zip(ticket_numbers, row_hashes.tolist()))
+
+    missing_positions = [pos for pos, key in enumerate(ticket_keys) if key not in results]
+    if missing_positions or store['columns'] is None:
+        rule_input = input_df.iloc[missing_positions].reset_index(drop=True)
+        if password_filled:
+            # Same in-place fill the Password check does before the later rules run
+            for col in COMMENT_COLUMNS:
+                rule_input[col] = rule_input[col].fillna('')
+        rule_output, rule_statuses, _ = evaluate_rules(rule_input, [rule], thresholds)
+        rule_columns = [col for col in rule_output.columns if col not in IDENTIFIER_COLUMNS]
+        store['columns'] = rule_columns
+        column_values = [rule_output[col].tolist() for col in rule_columns]
+        for i, pos in enumerate(missing_positions):
+            results[ticket_keys[pos]] = (
+                tuple(values[i] for values in column_values),
+                tuple(statuses[i] for statuses in rule_statuses),
+            )
+
+    cached = [results[key] for key in ticket_keys]
+    rule_columns = store['columns'] or []
+    status_count = len(cached[0][1]) if cached else 0
+    return {
+        'columns': {col: [values[c] for values, _ in cached] for c, col in enumerate(rule_columns)},
+        'statuses': [[statuses[s] for _, statuses in cached] for s in range(status_count)],
+        'misses': len(missing_positions),
+    }
+
+
+def process_uploaded_file_incremental(input_df, selected_rules, thresholds, weights,
+                                      cache=None, include_observations=False):
+    """
+    Same result as process_uploaded_file, but each (ticket, rule) result is looked up in cache
+    first and only the misses are evaluated. Returns output_df with attrs['timings'], attrs['rule_stats'] and
+    attrs['cache'] (hits / misses for this call).
+    """
+    cache = DEFAULT_TICKET_CACHE if cache is None else cache
+    input_df = input_df.reset_index(drop=True)
+    rule_timer = RuleTimer(rows=len(input_df))
+
+    password_selected = PASSWORD_RULE in selected_rules and all(col in input_df.columns for col in COMMENT_COLUMNS)
+
+    output_df, pass_matrix, _ = evaluate_rules(input_df, [], thresholds)
+    ticket_numbers = _ticket_numbers(input_df)
+    number_hashes = pd.util.hash_pandas_object(pd.Series(ticket_numbers, dtype=object), index=False).to_numpy()
+    # Each input column is hashed once per call, however many rules read it
+    column_hashes = {}
+    call_hits = 0
+    call_misses = 0
+
+    for rule in [rule for rule in RULE_ORDER if rule in selected_rules]:
+        rule_timer.start(rule)
+        # Rules before the Password check ran on the unfilled comments
+        password_filled = password_selected and RULE_ORDER.index(rule) > RULE_ORDER.index(PASSWORD_RULE)
+        store = cache.store(_rule_config_key(rule, input_df, thresholds, password_filled))
+        row_hashes = _row_hashes(column_hashes, input_df, RULE_INPUT_COLUMNS.get(rule, input_df.columns))
+
+        # Fast path: same tickets with the same fields as a previous run -> reuse whole columns
+        fingerprint = _fingerprint(number_hashes, row_hashes)
+        frame = store['frames'].get(fingerprint)
+        if frame is None:
+            frame = _evaluate_rule_tickets(store, rule, input_df, thresholds, ticket_numbers, row_hashes,
+                                           password_filled)
+            call_misses += frame['misses']
+            call_hits += len(input_df) - frame['misses']
+            rule_timer.count_cache(len(input_df) - frame['misses'], frame['misses'])
+            store['frames'][fingerprint] = frame
+            while len(store['frames']) > cache.max_frames_per_config:
+                store['frames'].popitem(last=False)
+        else:
+            store['frames'].move_to_end(fingerprint)
+            call_hits += len(input_df)
+            rule_timer.count_cache(len(input_df), 0)
+
+        for col, values in frame['columns'].items():
+            output_df[col] = values
+        pass_matrix.extend(frame['statuses'])
+
+    cache.hits += call_hits
+    cache.misses += call_misses
+
+    if include_observations or any(col in selected_rules for col in OBSERVATION_COLUMNS):
+        rule_timer.start("Observations")
+        output_df['Observations1'] = compute_observations1(input_df, selected_rules)
+        output_df['Observations2'] = compute_observations2(output_df)
+
+    rule_timer.start("Scoring")
+    apply_scores(output_df, pass_matrix, weights, len(selected_rules))
+    compact_result_frame(output_df)
+    rule_timer.stop()
+    output_df.attrs['timings'] = rule_timer.timings
+    output_df.attrs['rule_stats'] = rule_timer.stats
+    output_df.attrs['cache'] = {'hits': call_hits, 'misses': call_misses}
+    print(f"♻️ Incremental audit: {call_hits} cached / {call_misses} evaluated rule results")
+    return output_df
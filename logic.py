@@ -1,7 +1,15 @@
 import pandas as pd
+import numpy as np
 import math
+import os
 import re
+import time
+import tracemalloc
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+
+from readers import read_excel_fast
 
 DATE_FORMAT_CONFIG = {
     'formats': [
@@ -55,9 +63,14 @@ def safe_parse_timestamp(timestamp_str):
     """
     if not timestamp_str or pd.isna(timestamp_str):
         return None
-        
-    timestamp_str = str(timestamp_str).strip()
-    
+
+    return _parse_timestamp_cached(str(timestamp_str).strip())
+
+
+@lru_cache(maxsize=100000)
+def _parse_timestamp_cached(timestamp_str):
+    # Work notes repeat the same timestamps across rules and files; datetimes are immutable so
+    # a parsed value can be shared safely
     for fmt in DATE_FORMAT_CONFIG['formats']:
         try:
             return datetime.strptime(timestamp_str, fmt)
@@ -68,6 +81,11 @@ def safe_parse_timestamp(timestamp_str):
     print(f"Warning: Could not parse timestamp '{timestamp_str}' with any known format")
     return None
 
+
+# Compiled once per process instead of on every call
+TIMESTAMP_PATTERNS = [re.compile(pattern) for pattern in DATE_FORMAT_CONFIG['patterns']]
+
+
 def extract_timestamps_safely(text):
     """
     Extract timestamps from text using multiple patterns and formats.
@@ -80,8 +98,8 @@ def extract_timestamps_safely(text):
     timestamps = []
     
     # Try all patterns to find potential timestamps
-    for pattern in DATE_FORMAT_CONFIG['patterns']:
-        matches = re.findall(pattern, text)
+    for pattern in TIMESTAMP_PATTERNS:
+        matches = pattern.findall(text)
         for match in matches:
             parsed_dt = safe_parse_timestamp(match)
             if parsed_dt:
@@ -89,6 +107,134 @@ def extract_timestamps_safely(text):
     
     return timestamps
 
+# Returned by parse_rule_dates for values pd.to_datetime raised on
+DATE_PARSE_ERROR = object()
+
+
+def _parse_rule_date(value):
+    try:
+        return pd.to_datetime(value)
+    except Exception:
+        return DATE_PARSE_ERROR
+
+
+@lru_cache(maxsize=200000, typed=True)
+def _parse_rule_date_cached(value):
+    return _parse_rule_date(value)
+
+
+def parse_rule_dates(values):
+    """
+    pd.to_datetime applied to each value, exactly as the Opened/Closed based rules always did
+    (per-value format inference, month first), but once per distinct value and shared between
+    rules. Values that raise come back as DATE_PARSE_ERROR.
+    """
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(_parse_rule_date_cached(value))
+        except TypeError:  # unhashable cell
+            parsed.append(_parse_rule_date(value))
+    return parsed
+
+
+# Formats accepted for the Opened / Closed columns when computing ticket Age (tried in order)
+AGE_DATE_FORMATS = [
+    '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M',
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y/%m/%d %H:%M:%S', '%Y/%m/%d %H:%M',
+    '%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%m/%d/%Y %H:%M:%S', '%m/%d/%Y %H:%M',
+    '%m-%d-%Y %H:%M:%S', '%m-%d-%Y %H:%M', '%m.%d.%Y %H:%M:%S', '%m.%d.%Y %H:%M',
+    '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%Y/%m/%d', '%d.%m.%Y', '%m/%d/%Y', '%m-%d-%Y', '%m.%d.%Y'
+]
+
+
+def parse_ticket_date(date_str):
+    """Parse an Opened/Closed value with AGE_DATE_FORMATS; None when nothing matches."""
+    if pd.isnull(date_str):
+        return None
+    return _parse_ticket_date_cached(str(date_str).strip())
+
+
+@lru_cache(maxsize=100000)
+def _parse_ticket_date_cached(date_str):
+    for fmt in AGE_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except Exception:
+            continue
+    return None
+
+
+# pandas' ISO fast path rolls ":60" seconds over to the next minute; strptime rejects them, so
+# those strings always go through parse_ticket_date
+_LEAP_SECOND_PATTERN = r':6[01](?!\d)'
+
+
+def parse_ticket_dates(values):
+    """
+    Vectorized parse_ticket_date for a whole column: one explicit-format pd.to_datetime pass per
+    AGE_DATE_FORMATS entry, in list order, over the values no earlier format matched (so every
+    value gets the same first-matching format as the scalar loop). What is left after the passes
+    is retried value by value with parse_ticket_date. Returns a datetime64[us] Series (NaT when
+    nothing matches).
+    """
+    values = pd.Series(values)
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[us]')
+    if values.empty:
+        return parsed
+
+    if pd.api.types.is_datetime64_any_dtype(values) and getattr(values.dt, 'tz', None) is None:
+        # Real Excel dates: str(Timestamp) only matches a format when there are no fractional seconds
+        whole_seconds = values.notna() & (values.dt.microsecond == 0) & (values.dt.nanosecond == 0)
+        parsed[whole_seconds] = values[whole_seconds].astype('datetime64[us]')
+        return parsed
+
+    present = values.notna()
+    remaining = values[present].map(lambda value: str(value).strip())
+    residue_mask = remaining.str.contains(_LEAP_SECOND_PATTERN, regex=True)
+    residue = remaining[residue_mask]
+    remaining = remaining[~residue_mask]
+    for fmt in AGE_DATE_FORMATS:
+        if remaining.empty:
+            break
+        attempt = pd.to_datetime(remaining, format=fmt, errors='coerce')
+        matched = attempt.notna()
+        if matched.any():
+            parsed[matched[matched].index] = attempt[matched].astype('datetime64[us]')
+            remaining = remaining[~matched]
+
+    for idx, value in pd.concat([remaining, residue]).items():
+        date = parse_ticket_date(value)
+        if date is not None:
+            parsed[idx] = date
+    return parsed
+
+
+def add_age_column(input_df):
+    """Calculate the Age column (days, rounded) from the Opened and Closed dates, in place."""
+    if input_df.empty:
+        input_df['Age'] = []
+        return input_df
+    opened = parse_ticket_dates(input_df['Opened']) if 'Opened' in input_df.columns else None
+    closed = parse_ticket_dates(input_df['Closed']) if 'Closed' in input_df.columns else None
+    if opened is None or closed is None:
+        input_df['Age'] = [None] * len(input_df)
+        return input_df
+
+    # Same arithmetic as timedelta.total_seconds() / 86400 and round() (half to even)
+    delta_us = (closed - opened).to_numpy(dtype='timedelta64[us]').astype('int64')
+    valid = (opened.notna() & closed.notna()).to_numpy()
+    days = np.where(valid, (delta_us / 1e6) / (24*3600), np.nan)
+    ages = np.round(days)
+    if valid.all():
+        input_df['Age'] = ages.astype('int64')
+    elif not valid.any():
+        input_df['Age'] = [None] * len(input_df)
+    else:
+        input_df['Age'] = ages
+    return input_df
+
+
 def suggest_similar_columns(input_df, target_column):
     """
     Suggest similar column names that might be used instead of the target column.
@@ -124,23 +270,1411 @@ def suggest_similar_columns(input_df, target_column):
     
     return list(set(suggestions))  # Remove duplicates
 
-def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
+# -------------------------
+# Mapping files (loaded once per on-disk version and shared across audits/workers)
+# -------------------------
+# Mapping files live next to this module, so headless runs work from any working directory
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+TOWER_MAPPING_FILE = os.path.join(TOOL_DIR, 'Tower_Maping.xlsx')
+CATEGORY_MAPPING_FILE = os.path.join(TOOL_DIR, 'Category_Subcategory_Mapping.xlsx')
 
-    sort_len_obs = ""
-    long_desc_obs = ""
-    response_time_obs = ""
-    worknote_obs = ""
-    resolution_notes_obs = ""
 
-    import re
-    import pandas as pd
-    print(selected_rules, thresholds)
-    output_df = pd.DataFrame()
+def _file_signature(path):
+    """(mtime, size) of a mapping file; raises FileNotFoundError when the file is absent."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=16)
+def _read_mapping_cached(path, signature):
+    return read_excel_fast(path)
+
+
+def read_mapping_file(path):
+    """Read a mapping workbook, re-reading it only when the file changes on disk."""
+    return _read_mapping_cached(os.path.abspath(path), _file_signature(path)).copy()
+
+
+def _norm_str(s):
+    '''Normalize for comparison: lower, trim, remove spaces; treat '', 'None', NaN as None.'''
+    if pd.isna(s):
+        return None
+    s = str(s).strip()
+    if s == '' or s.lower() == 'none':
+        return None
+    return re.sub(r'\s+', '', s.lower())
+
+
+def _tokenize(s):
+    '''Tokenize text into lowercase alphanumeric tokens; returns [] for None/NaN.'''
+    if pd.isna(s):
+        return []
+    s = str(s).lower()
+    # Split on non-alphanumeric boundaries; adjust if underscores/hyphens need to be preserved.
+    tokens = re.split(r'[^a-z0-9]+', s)
+    return [t for t in tokens if t]
+
+
+def _normalize_mapping_value(val):
+    return str(val).strip().lower() if pd.notnull(val) else ""
+
+
+@lru_cache(maxsize=8)
+def _tower_index_cached(path, signature):
+    tower = _read_mapping_cached(path, signature)
+    index = {}
+    for app_name, tower_name in zip(tower['Application Name'], tower['Tower']):
+        if pd.isnull(app_name):
+            continue
+        # Keep the first mapping row for an application (same as the original lookup)
+        index.setdefault(app_name, tower_name)
+    return index
+
+
+def load_tower_index(path=TOWER_MAPPING_FILE):
+    """Application Name -> Tower lookup built from the Tower mapping file."""
+    return _tower_index_cached(os.path.abspath(path), _file_signature(path))
+
+
+@lru_cache(maxsize=8)
+def _assignment_group_index_cached(path, signature):
+    tower = _read_mapping_cached(path, signature)
+    index = {}
+    for app_name, group in zip(tower['Application Name'], tower['Assignment group']):
+        index.setdefault(_normalize_mapping_value(app_name), set()).add(_normalize_mapping_value(group))
+    return index
+
+
+def load_assignment_group_index(path=TOWER_MAPPING_FILE):
+    """Normalized Application Name -> set of normalized Assignment groups allowed for it."""
+    return _assignment_group_index_cached(os.path.abspath(path), _file_signature(path))
+
+
+@lru_cache(maxsize=8)
+def _category_keyword_index_cached(path, signature):
+    keywords = _read_mapping_cached(path, signature)
+    if not {'Keywords', 'Category'}.issubset(keywords.columns):
+        raise ValueError("Mapping file must contain 'Keywords' and 'Category' columns")
+
+    keyword_index = []  # list of tuples: (kw_tokens_fset, kw_cat_norm, kw_sub_norm)
+    has_sub = 'Subcategory' in keywords.columns
+    for _, krow in keywords.iterrows():
+        kw_tokens = frozenset(_tokenize(krow.get('Keywords')))
+        if not kw_tokens:
+            # Skip empty keyword rows
+            continue
+        kw_cat_norm = _norm_str(krow.get('Category'))
+        kw_sub_norm = _norm_str(krow.get('Subcategory')) if has_sub else None
+        keyword_index.append((kw_tokens, kw_cat_norm, kw_sub_norm))
+
+    # Prefer the most specific match (largest token set) first
+    keyword_index.sort(key=lambda t: len(t[0]), reverse=True)
+    return tuple(keyword_index)
+
+
+def load_category_keyword_index(path=CATEGORY_MAPPING_FILE):
+    """Keyword index (most specific first) built from the Category/Subcategory mapping file."""
+    return _category_keyword_index_cached(os.path.abspath(path), _file_signature(path))
+
+
+def warm_mapping_caches(selected_rules):
+    """Pre-load the mapping indexes the selected rules need (used by worker processes)."""
+    try:
+        if 'Tower' in selected_rules:
+            load_tower_index()
+        if "Right Assignment group Usage" in selected_rules:
+            load_assignment_group_index()
+        if "Category Validation" in selected_rules:
+            load_category_keyword_index()
+    except Exception as e:
+        # The rules report missing/invalid mapping files themselves
+        print(f"⚠️ Could not pre-load mapping files: {str(e)}")
+
+
+# -------------------------
+# Observations1 / Observations2 (derived views, computed on demand)
+# -------------------------
+OBSERVATION_COLUMNS = ["Observations1", "Observations2"]
+
+OBS1_PUNCTUATION_MARKS = [".", ",", ";", ":", "!", "?"]
+OBS1_TIMESTAMP_PATTERN = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"  # Matches e.g., 2025-08-27 02:02:24
+
+# Ordered feedback codes for Observations2: (code, message, candidate output columns)
+OBS2_FEEDBACK_MAP = [
+    ('D', "Short Description has less than threshold characters", ['Short Description']),
+    ('E', "Long Description is less than threshold characters", ['Long Description']),
+    ('F', "Response time is more than threshold minutes", ['Response Time']),
+    ('G', "Response SLA is breached", ['Response SLA Met', 'Response SLA met', 'Response SLA']),
+    ('H', "Resolution SLA is breached", ['Resolution SLA Met', 'Resolution SLA met', 'Resolution SLA']),
+    ('I', "KBA is not tagged to the ticket", ['KBA Tagged?', 'KBA Tagged']),
+    ('J', "Ticket is reopened", ['Reopened?', 'Reopened']),
+    ('K', "Worknotes are not comprehensive", ['Work notes Length Check', 'Work notes Length']),
+    ('L', "Resolution notes are not comprehensive", ['Resolution Notes Length']),
+    ('M', "Ticket is assigned to an incorrect group", ['Assignment group check', 'Assignment Group Check']),
+    ('N', "Related record is not tagged", ['Related records tagged?', 'Related Records Tagged?']),
+    ('O', "Ticket is ageing > 20 days", ['Ticket Ageing Check', 'Ticket ageing Check', 'Ticket Ageing check']),
+    ('P', "3 Strike rule (Confirmation) is not followed", [
+        '3 Strike rule remainders check',
+        '3 Strike rule check(escalation policy check for Remainder)',
+        '3 Strike rule check (escalation policy check for Remainder)'
+    ]),
+    ('Q', "Reassignment count is > 3", ['Reassignment check?', 'Reassignment Check?']),
+    ('R', "1-1-1 Check is not followed", ['3 Strike Check(1-1-1)', '1-1-1 Check']),
+    ('S', "2-2-1 Check is not followed", ['3 Strike Check(2-2-1)', '2-2-1 Check']),
+    ('T', "3-2-1 Check is not followed", ['3 Strike Check(3-2-1)', '3-2-1 Check']),
+]
+
+
+def _obs1_feedback(row):
+    """Quality feedback for the 'Comments and Work notes' of one ticket."""
+    # Safely extract values
+    entry_str = str(row.get('Comments and Work notes', '') or '')
+    addl_val = str(row.get('Additional comments', '') or '')
+
+    feedback = set()
+
+    # Split remarks by newlines or timestamps
+    remarks = re.split(r"\n+|(?=" + OBS1_TIMESTAMP_PATTERN + ")", entry_str)
+    remarks = [r.strip() for r in remarks if r.strip()]
+
+    seen_remarks = set()
+    duplicate_found = False
+
+    for remark in remarks:
+        if remark in seen_remarks:
+            duplicate_found = True
+        else:
+            seen_remarks.add(remark)
+
+        # Word count check
+        if len(remark.split()) < 20:
+            feedback.add("Too few words less")
+
+        # Punctuation check
+        if not any(p in remark for p in OBS1_PUNCTUATION_MARKS):
+            feedback.add("Missing punctuation")
+
+        # Length check
+        if len(remark) < 100:
+            feedback.add("Too short")
+
+        # Capitalization check
+        if remark and not remark[0].isupper():
+            feedback.add("Does not start with capital")
+
+        # Attachment mention check
+        if re.search(r"\b(attachment[s]?|attached)\b", remark, re.IGNORECASE):
+            feedback.add("Attachment mentioned")
+
+    # Check Additional comments for attachment mention
+    if re.search(r"\b(attachment[s]?|attached)\b", addl_val, re.IGNORECASE):
+        feedback.add("Attachment mentioned")
+
+    if duplicate_found:
+        feedback.add("Duplicate comment found")
+
+    return ", ".join(sorted(feedback)) if feedback else "Work notes meet quality standards"
+
+
+def compute_observations1(input_df, selected_rules=()):
+    """Observations1: per-ticket work-note quality feedback built from the input rows."""
+    comment_cols = ['Comments and Work notes', 'Additional comments']
+    if "Password_detected?" in selected_rules and all(col in input_df.columns for col in comment_cols):
+        # In a full audit the password check blanks missing comments before observations run
+        input_df = input_df.assign(**{col: input_df[col].fillna('') for col in comment_cols})
+    if input_df.empty:
+        return pd.Series([], index=input_df.index, dtype=object)
+    return input_df.apply(_obs1_feedback, axis=1)
+
+
+def _is_fail(val) -> bool:
+    """Robust 'Fail' detector: handles 'Fail', 'Fail - Missing Column', case-insensitive."""
+    if val is None:
+        return False
+    s = str(val).strip().lower()
+    return s.startswith("fail")
+
+
+def compute_observations2(output_df):
+    """Observations2: comma-separated feedback for every failed check of a ticket."""
+    sources = []
+    for code, message, candidates in OBS2_FEEDBACK_MAP:
+        col = next((name for name in candidates if name in output_df.columns), None)
+        if col:
+            sources.append((message, output_df[col].tolist()))
+
+    feedback = []
+    for i in range(len(output_df)):
+        failed_msgs = [message for message, values in sources if _is_fail(values[i])]
+        feedback.append(", ".join(failed_msgs) if failed_msgs else "All key quality checks passed for this ticket.")
+    return pd.Series(feedback, index=output_df.index)
+
+
+def add_observations(output_df, input_df, selected_rules=()):
+    """
+    Return a copy of output_df with Observations1/Observations2 inserted before the score columns.
+    Used lazily by the dashboard and the export instead of computing them on every audit.
+    """
+    if all(col in output_df.columns for col in OBSERVATION_COLUMNS):
+        return output_df
+    result = output_df.copy()
+    position = result.columns.get_loc("Score") if "Score" in result.columns else len(result.columns)
+    obs1 = compute_observations1(input_df, selected_rules)
+    result.insert(position, 'Observations1', obs1.values if len(obs1) == len(result) else obs1)
+    result.insert(position + 1, 'Observations2', compute_observations2(result).values)
+    return result
+
+
+# ----------------------------------------------------------------------
+# Rule helpers (compiled once at import; batch runs call evaluate_rules back to back)
+# ----------------------------------------------------------------------
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+PRIORITY_LABELS = ['1-Critical', '2-High', '3-Medium', '4-Low']
+IMPACT_URGENCY_LABELS = ['1-High', '2-Medium', '3-Low']
+
+# Separate, centralized synonym maps (edit per project)
+PRIORITY_CANON_MAP = {
+    '1-critical': '1-Critical', 'critical': '1-Critical', 'p1': '1-Critical',
+    'severity 1': '1-Critical', 'sev1': '1-Critical', 's1': '1-Critical', 'priority 1': '1-Critical',
+
+    '2-high': '2-High', 'high': '2-High', 'p2': '2-High',
+    'severity 2': '2-High', 'sev2': '2-High', 's2': '2-High', 'priority 2': '2-High',
+
+    '3-medium': '3-Medium', '3-moderate': '3-Medium', 'moderate': '3-Medium', 'med': '3-Medium', 'mod': '3-Medium',
+    'p3': '3-Medium', 'severity 3': '3-Medium', 'sev3': '3-Medium', 's3': '3-Medium', 'priority 3': '3-Medium',
+
+    '4-low': '4-Low', 'low': '4-Low', 'p4': '4-Low',
+    'severity 4': '4-Low', 'sev4': '4-Low', 's4': '4-Low', 'priority 4': '4-Low',
+}
+
+IMPACT_URGENCY_CANON_MAP = {
+    '1-high': '1-High', 'high': '1-High', 'h': '1-High', 'urgent': '1-High', 'immediate': '1-High',
+    '2-medium': '2-Medium', 'medium': '2-Medium', 'moderate': '2-Medium', 'med': '2-Medium', 'mod': '2-Medium',
+    'normal': '2-Medium', 'standard': '2-Medium',
+    '3-low': '3-Low', 'low': '3-Low', 'l': '3-Low', 'minor': '3-Low',
+}
+
+PRIORITY_NUMBER_PATTERNS = [re.compile(pattern) for pattern in (
+    r'\bp\s*-?\s*([1-4])\b',
+    r'\bsev(?:erity)?\s*-?\s*([1-4])\b',
+    r'\bs\s*-?\s*([1-4])\b',
+    r'\bpriority\s*-?\s*([1-4])\b',
+)]
+PRIORITY_WORD_PATTERN = re.compile(r'\b([1-4])\s*-\s*(critical|high|medium|moderate|low)\b')
+IMPACT_URGENCY_WORD_PATTERN = re.compile(r'\b([1-3])\s*-\s*(high|medium|moderate|low)\b')
+IMPACT_URGENCY_NUMBER_PATTERN = re.compile(r'\b([1-3])\b')
+
+# (Impact, Urgency) -> Priority matrix
+VALID_PRIORITY_COMBINATIONS = frozenset([
+    ("1-High", "1-High", "1-Critical"),
+    ("1-High", "2-Medium", "2-High"),
+    ("1-High", "3-Low", "3-Medium"),
+    ("2-Medium", "1-High", "2-High"),
+    ("2-Medium", "2-Medium", "3-Medium"),
+    ("2-Medium", "3-Low", "4-Low"),
+    ("3-Low", "1-High", "3-Medium"),
+    ("3-Low", "2-Medium", "4-Low"),
+    ("3-Low", "3-Low", "4-Low"),
+])
+
+
+def _normalize_dashes(text):
+    return text.replace(' – ', '-').replace(' - ', '-').replace('–', '-')
+
+
+def _canonical_priority(key):
+    """Map a lower-cased, dash-normalized priority to 1-Critical..4-Low; None when unrecognised."""
+    if key in PRIORITY_CANON_MAP:
+        return PRIORITY_CANON_MAP[key]
+
+    for pattern in PRIORITY_NUMBER_PATTERNS:
+        m = pattern.search(key)
+        if m:
+            return PRIORITY_LABELS[int(m.group(1)) - 1]
+
+    m = PRIORITY_WORD_PATTERN.search(key)
+    if m:
+        word = m.group(2)
+        if 'critical' in word: return '1-Critical'
+        if 'high' in word:     return '2-High'
+        if 'medium' in word or 'moderate' in word: return '3-Medium'
+        if 'low' in word:      return '4-Low'
+
+    if 'critical' in key: return '1-Critical'
+    if 'high' in key:     return '2-High'
+    if 'medium' in key or 'moderate' in key: return '3-Medium'
+    if 'low' in key:      return '4-Low'
+
+    return None
+
+
+def normalize_priority(priority_str):
+    """Normalize priority to standard format: 1-Critical, 2-High, 3-Medium, 4-Low"""
+    if pd.isnull(priority_str) or str(priority_str).strip() == 'None':
+        return None
+
+    key = _normalize_dashes(str(priority_str).strip().lower())
+    key = ' '.join(key.split())
+    return _canonical_priority(key)
+
+
+def canonical_matrix_label(value, kind):
+    """Canonicalize Impact/Urgency (kind='iu') or Priority (kind='priority') to the matrix labels."""
+    if pd.isnull(value) or value == 'None':
+        return value
+    t = ' '.join(_normalize_dashes(str(value).strip()).split())
+    key = t.lower()
+
+    if kind == 'priority':
+        return _canonical_priority(key) or t
+
+    if key in IMPACT_URGENCY_CANON_MAP:
+        return IMPACT_URGENCY_CANON_MAP[key]
+
+    m = IMPACT_URGENCY_WORD_PATTERN.search(key)
+    if m:
+        n = int(m.group(1))
+        word = m.group(2)
+        if n == 1 or 'high' in word: return '1-High'
+        if n == 2 or 'medium' in word or 'moderate' in word: return '2-Medium'
+        if n == 3 or 'low' in word: return '3-Low'
+
+    if 'high' in key or 'urgent' in key or 'immediate' in key: return '1-High'
+    if 'medium' in key or 'moderate' in key or 'normal' in key or 'standard' in key: return '2-Medium'
+    if 'low' in key or 'minor' in key: return '3-Low'
+
+    m = IMPACT_URGENCY_NUMBER_PATTERN.search(key)
+    if m:
+        return IMPACT_URGENCY_LABELS[int(m.group(1)) - 1]
+
+    return t
+
 
+def normalize_priority_value(value):
+    if pd.isnull(value) or value == 'None':
+        return value
+    return _normalize_dashes(str(value).strip())
+
+
+def validate_priority_impact_urgency(impact, urgency, priority):
+    combination = (normalize_priority_value(impact), normalize_priority_value(urgency),
+                   normalize_priority_value(priority))
+    return "Pass" if combination in VALID_PRIORITY_COMBINATIONS else "Fail"
+
+
+# Canonical true/false strings accepted in the Reopened column
+REOPENED_TRUE_STRINGS = {'true', 'yes', 'y', '1'}
+REOPENED_FALSE_STRINGS = {'false', 'no', 'n', '0'}
+
+
+def clean_reopened_cell(v):
+    """Normalize cell: string, strip, lowercase, collapse whitespace, remove NBSP."""
+    if pd.isna(v):
+        return None
+    s = str(v).replace('\xa0', ' ')  # remove non-breaking space from Excel
+    return WHITESPACE_PATTERN.sub(' ', s.strip().lower())
+
+
+# "date time - Name (Work notes)" headers in front of each journal entry
+NOTE_HEADER_PATTERN = re.compile(
+    r'(?m)^\(?'
+    r'(?:\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{4})'   # YYYY-M-D or D/M/YYYY or M/D/YYYY; -, /, .; single/zero-padded
+    r'(?:\s+\d{1,2}:\d{2}(?::\d{2})?'                                     # time: H:MM or HH:MM or HH:MM:SS
+    r'(?:\s*(?:AM|PM|A\.M\.|P\.M\.))?'                                    # optional AM/PM with or without dots/spaces
+    r')?'                                                                 # whole time block optional
+    r'(?:\s*-\s*[^(\n]+(?:\s*\([^)]*\))?)?'                               # optional: " - Name" and optional "(...)" tag
+    r'\s*',                                                               # trailing spaces
+    re.IGNORECASE
+)
+NOTE_PUNCTUATION_PATTERN = re.compile(r'[.,?!]')
+
+
+def strip_note_headers(note):
+    """Journal text without the per-entry timestamp/name headers, stripped."""
+    return NOTE_HEADER_PATTERN.sub('', note).strip()
+
+
+PENDING_JUSTIFICATION_PHRASES = [
+    # === USER/CUSTOMER DEPENDENT ===
+    'confirmationpending',
+    'asperconfirmationweareclosingtheticket',
+    'awaitinguserconfirmation',
+    'waitingforuserreply',
+    'waitingforuserinput'
+    'waitingforuser',
+    'waitingforuserconfirmation',
+    'waitinguserinputs',
+    'awaitinguserinputs',
+    'waitingforuserresponse',
+    'pendingwithuser',
+    'awaitinguserinput',
+    'awaitinguserresponse',
+    'waitingforuserinput',
+    'waitingforuserreply',
+    'waitingonuser',
+    'pendinguserinput',
+    'pendinguserresponse',
+    'needuserinput',
+    'needuseraction',
+    'waitingforcustomer',
+    'awaitingcustomerresponse',
+    'waitingforcustomerreply',
+    'pendingwithcustomer',
+    'awaitingfeedbackfromuser',
+    'waitingforenduser',
+    'awaitingenduserresponse',
+    'waitingforuserconfirmation',
+    'waitingforuserclarification',
+    'usertoprovidedetails',
+    'useractionrequired',
+    'userresponseawaited',
+    'userreplypending',
+    'waitingforuseravailability',
+    'scheduledusermeeting',
+    'usernotavailable',
+    'usertesting',
+    'awaitingusertesting',
+    'waitingforusertesting',
+    
+    # === VENDOR/THIRD PARTY ===
+    'waitingforvendor',
+    'pendingwithvendor',
+    'awaitingvendorresponse',
+    'vendorworkingonit',
+    'escalatedtovendor',
+    'waitingforthirdparty',
+    'awaitingvendorsupport',
+    'vendorapprovalrequired',
+    'waitingforvendorupdate',
+    'vendorticketcreated',
+    'awaitingmanufacturerresponse',
+    
+    # === TECHNICAL/INVESTIGATION ===
+    'weareworkingonit',
+    'wearelookingintotheissue',
+    'underinvestigation',
+    'analyzingtheissue',
+    'troubleshootinginprogress',
+    'rootcauseanalysis',
+    'technicalanalysis',
+    'debugginginprogress',
+    'performingtests',
+    'runningdiagnostics',
+    'checkinglogs',
+    'monitoringthesystem',
+    'awaitingtestresults',
+    'testinginprogress',
+    'replicatingtheissue',
+    'gatheringlogs',
+    'systemanalysis',
+    
+    # === APPROVAL/AUTHORIZATION ===
+    'awaitingapproval',
+    'pendingapproval',
+    'waitingformanagerapproval',
+    'managementapprovalrequired',
+    'awaitingauthorization',
+    'budgetapprovalrequired',
+    'securityapprovalneeded',
+    'changeapprovalrequired',
+    'awaitingcabreview',
+    'cabapprovalrequired',
+    'escalationrequired',
+    
+    # === SCHEDULING/MAINTENANCE ===
+    'scheduledmaintenance',
+    'waitingformaintenancewindow',
+    'plannedoutage',
+    'scheduleddowntime',
+    'awaitingmaintenanceslot',
+    'scheduledforimplementation',
+    'waitingforchangewindow',
+    'deploymentscheduled',
+    'patchingscheduled',
+    'upgradewindowscheduled',
+    
+    # === RESOURCE/TEAM DEPENDENT ===
+    'awaitingsubjectmatterexpert',
+    'escalatedtospecialistteam',
+    'waitingforexpertassignment',
+    'assignedtoseniorteam',
+    'awaitingsme',
+    'l2escalation',
+    'l3escalation',
+    'transferredtospecialistteam',
+    'expertreviewrequired',
+    'awaitingteamleadreview',
+    
+    # === DEPENDENCY/COORDINATION ===
+    'waitingfordependentticket',
+    'relatedticketinprogress',
+    'coordinatingwithother teams',
+    'dependentonparentticket',
+    'blockedbyotherissue',
+    'awaitingprerequisitefixes',
+    'coordinationrequired',
+    'multipleagentsworking',
+    'crossteamcoordination',
+    
+    # === PROCUREMENT/DELIVERY ===
+    'waitingfordelivery',
+    'hardwareordered',
+    'awaitingshipment',
+    'procurementinprogress',
+    'purchaseordersubmitted',
+    'awaitinghardware',
+    'waitingforreplacement parts',
+    'deliveryscheduled',
+    'equipmentintransit',
+    
+    # === ENVIRONMENT/SYSTEM DEPENDENT ===
+    'systemmaintenance',
+    'environmentissue',
+    'networkissue',
+    'serverissue',
+    'applicationdown',
+    'systemunavailable',
+    'platformissue',
+    'infrastructureissue',
+    'servicedegradation',
+    'performanceissue',
+    
+    # === COMMUNICATION/UPDATE ===
+    'wewillgetbacktoyou',
+    'updateswillbeprovided',
+    'progressupdatetofollow',
+    'statusupdatepending',
+    'communicationinprogress',
+    'meetingscheduled',
+    'discussionrequired',
+    'conferenceorganized',
+    
+    # === DOCUMENTATION/COMPLIANCE ===
+    'documentationinprogress',
+    'procedurebeingrupdated',
+    'policyreviewrequired',
+    'compliancecheckneeded',
+    'auditinprogress',
+    'documentationreviewrequired',
+    'proceduralreviewneeded',
+    
+    # === COMMON SUPPORT PHRASES ===
+    'ticketescalated',
+    'furtheranalysisrequired',
+    'monitoringforfurtherissues',
+    'awaitingconfirmation',
+    'solutionbeingtested',
+    'resolutioninprogress',
+    'workingonthisticket',
+    'issuebeinginvestigated',
+    'lookingintotheissue',
+    'checkingwithbackendteam'
+]
+
+
+def pending_justification_check(input_df):
+    """Pass when there is no pending reason or the comments carry an accepted justification phrase."""
+    status_pending_justification = []
+    for val1, comment1, comment2 in zip(input_df['Pending reason'],
+    input_df['Comments and Work notes'], input_df['Additional comments']):
+        # If Pending reason is null or 'None', mark as Pass
+        if pd.isnull(val1) or str(val1).strip().lower() == None:
+            status_pending_justification.append('Pass')
+            continue
+
+        # Combine and normalize both comment fields
+        combined_text = ''
+        if pd.notnull(comment1):
+            combined_text += str(comment1) + ' '
+        if pd.notnull(comment2):
+            combined_text += str(comment2)
+
+        combined_text = combined_text.replace(' ', '').lower()
+
+        # Check for justification phrases
+        if any(phrase in combined_text for phrase in PENDING_JUSTIFICATION_PHRASES):
+            status_pending_justification.append('Pass')
+        else:
+            status_pending_justification.append('Fail')
+    return status_pending_justification
+
+
+# Reminder patterns for the 3-Strike rule
+FIRST_REMINDER_PATTERNS = [
+    r'\bfirst reminder\b',
+    r'\bgentle reminder\b',
+    r'\b1st reminder\b',
+    r'\breminder 1\b',
+    r'\breminder[\s\-:#]*1\b',
+    r'\breminder\b.*\b1\b',
+    r'\breminder\b.*\bfirst\b',
+    r'\br1\b',
+    r'\breminder[\s\-]*one\b',
+    # Additional patterns
+    r'\binitial reminder\b',
+    r'\breminder number one\b',
+    r'\bfirst follow[\s\-]*up\b',
+    r'\bfollow[\s\-]*up[\s\-]*1\b',
+    r'\breminder sent first\b',
+    r'\breminder sent on\b.*\bfirst\b'
+]
+
+SECOND_REMINDER_PATTERNS = [
+    r'\bsecond reminder\b',
+    r'\b2nd reminder\b',
+    r'\breminder 2\b',
+    r'\breminder[\s\-:#]*2\b',
+    r'\breminder\b.*\b2\b',
+    r'\breminder\b.*\bsecond\b',
+    r'\br2\b',
+    r'\breminder[\s\-]*two\b',
+    # Additional patterns
+    r'\breminder number two\b',
+    r'\bsecond follow[\s\-]*up\b',
+    r'\bfollow[\s\-]*up[\s\-]*2\b',
+    r'\banother reminder\b',
+    r'\breminder sent second\b',
+    r'\breminder again\b'
+]
+
+FINAL_REMINDER_PATTERNS = [
+    r'\bfinal reminder\b',
+    r'\bthird reminder\b',
+    r'\b3rd reminder\b',
+    r'\breminder 3\b',
+    r'\breminder[\s\-:#]*3\b',
+    r'\breminder\b.*\b3\b',
+    r'\breminder\b.*\bthird\b',
+    r'\blast 3rd\b',
+    r'\b3rd last\b',
+    r'\bthird last\b',
+    r'\br3\b',
+    r'\breminder[\s\-]*three\b',
+    # Additional patterns
+    r'\blast reminder\b',
+    r'\bfinal follow[\s\-]*up\b',
+    r'\bfollow[\s\-]*up[\s\-]*3\b',
+    r'\breminder number three\b',
+    r'\bultimate reminder\b',
+    r'\bclosing reminder\b',
+    r'\breminder before closure\b',
+    r'\breminder before escalation\b'
+]
+
+REMINDER_STAGE_PATTERNS = {
+    "1st reminder": re.compile('|'.join(FIRST_REMINDER_PATTERNS), re.IGNORECASE),
+    "1st/2nd reminder": re.compile('|'.join(FIRST_REMINDER_PATTERNS + SECOND_REMINDER_PATTERNS), re.IGNORECASE),
+    "final reminder": re.compile('|'.join(FINAL_REMINDER_PATTERNS), re.IGNORECASE),
+}
+
+
+def three_strike_rule_check(input_df, closure_threshold_days=3):
+    """
+    Optimized 3-Strike rule check for escalation policy:
+
+    1. If ticket is closed within X business days → Pass (no reminders needed)
+    2. If ticket opened and closed same day → Pass
+    3. If Age is missing or None → Pass (missing timestamps not mandatory)
+    4. If Age < 3 days → Pass (no reminder needed yet)
+    5. Age 3–5 → check for first reminder
+    6. Age 5–7 → check for first + second reminders
+    7. Age > 7 → check for final reminder
+    """
+    cnt = 0
+    status_3_Strike_rule_check = []
+
+    for idx, row in input_df.iterrows():
+        cnt += 1
+        age = row.get('Age')
+
+        # Check 1: If Age is missing or None → Pass (timestamps not mandatory)
+        if pd.isnull(age) or age == 'None':
+            status_3_Strike_rule_check.append('Pass - Missing timestamps')
+            continue
+
+        # Check 2: Check if ticket is same-day closure (Age ≈ 0)
+        if age <= 0.04167:  # Less than 1 hour, approximately same day
+            status_3_Strike_rule_check.append('Pass - Same-day closure')
+            continue
+
+        # Check 3: Check if ticket closed within X business days
+        if age < closure_threshold_days:
+            status_3_Strike_rule_check.append(f'Pass - Closed <{closure_threshold_days}d')
+            continue
+
+        # Check 4: If Age < 3 days → Pass (no reminder needed yet)
+        if age < 3:
+            status_3_Strike_rule_check.append('Pass - Age <3d')
+            continue
+
+        # Get comments
+        comment = input_df['Comments and Work notes'].iloc[cnt - 1]
+        additional_comment = input_df['Additional comments'].iloc[cnt - 1]
+
+        # Combine both comment fields
+        combined_text = ''
+        if pd.notnull(comment):
+            combined_text += str(comment) + ' '
+        if pd.notnull(additional_comment):
+            combined_text += str(additional_comment)
+
+        if not combined_text.strip():
+            status_3_Strike_rule_check.append('Fail - No comments')
+            continue
+
+        # Select reminder patterns based on age
+        if 3 <= age <= 5:
+            pattern_label = "1st reminder"
+        elif 5 < age <= 7:
+            pattern_label = "1st/2nd reminder"
+        else:  # age > 7
+            pattern_label = "final reminder"
+
+        if REMINDER_STAGE_PATTERNS[pattern_label].search(combined_text):
+            status_3_Strike_rule_check.append(f'Pass - {pattern_label} found')
+        else:
+            status_3_Strike_rule_check.append(f'Fail - No {pattern_label}')
+
+    return status_3_Strike_rule_check
+
+
+# ✅ Expanded "user confirmation" detection to also catch Slack/Teams/Email/Mail confirmations
+USER_CONFIRMATION_PATTERN = re.compile(r'''(?ix)
+    \b(
+        # Explicit confirmation wording
+        (user|end\s*user|customer|client|requester)\s+(confirm(?:ed|s|ing)?|acknowledge(?:d|s|ment)?|approve(?:d|s)?|agree(?:d|s)?)
+    | confirm(?:ed|s|ing)?
+    | confirmation
+    | approve(?:d|s)?
+    | agreed
+    | acknowledged
+    | verified
+    | validated
+    | tested(?:\s+and\s+working)?
+
+        # "Resolved/Fixed" confirmation from user perspective
+    | (issue|problem|it|this)\s+(is\s+)?(fixed|resolved|working|work(?:s|ed)|sorted|clear(?:ed)?)
+    | (now\s+)?(working\s+fine|works\s+fine|working\s+now|works\s+now)
+    | (looks|seems)\s+(good|fine)
+    | no\s+issues?\s+(now|anymore)
+    | (all\s+)?(good|set|sorted)\b
+    | (resolved|fixed)\s+from\s+my\s+side
+
+        # Access/Login success confirmations
+    | (able|can)\s+to\s+(login|log\s*in|sign\s*in|access|connect)
+    | login\s+(successful|works|working)
+    | access\s+(restored|working)
+    | (connected|connection)\s+(successful|works|working)
+
+        # Short affirmative replies (common)
+    | (ok|okay|kk|k)\b
+    | (yes|yep|yup|ya|yeah|y)\b
+    | sure\b
+    | sure\s+thing
+    | sounds\s+good
+    | please\s+proceed
+    | go\s+ahead
+    | proceed
+
+        # Emoji/thumbs-up confirmations (often used in chats)
+    | 👍
+    | ✅
+
+        # Channel-based confirmations (Slack/Teams/Email/Mail/Outlook etc.)
+    | (user|end\s*user|customer|client|requester)\s+replied\b.*\b(confirm|confirmed|acknowledged|all\s+good|working)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
+    | (user|end\s*user|customer|client|requester)\s+confirmed\b.*\b(over|via|on|in|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
+    | (user|end\s*user|customer|client|requester)\s+acknowledged\b.*\b(over|via|on|in|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
+    | confirmed\b.*\b(over|via|on|in|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
+    | acknowledged\b.*\b(over|via|on|in|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
+    | reply(?:ied|)\b.*\b(on|in|via|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b.*\b(confirm|confirmed|acknowledged|all\s+good|working)\b
+    | email\s+from\s+(user|end\s*user|customer|client|requester)\b.*\b(confirm|confirmed|acknowledged|all\s+good|working)\b
+    | mail\s+from\s+(user|end\s*user|customer|client|requester)\b.*\b(confirm|confirmed|acknowledged|all\s+good|working)\b
+    )\b
+    ''')
+
+# Detect intent to close/resolve/mark resolved (by agent or process)
+CLOSURE_INTENT_PATTERN = re.compile(r'''(?ix)
+    \b(
+        close|closure|closing
+    | (proceed|going)\s+to\s+close
+    | proceed\b.*to\b.*close
+    | good\s+to\s+close
+    | we\s+can\s+close
+    | you\s+can\s+close
+    | please\s+close
+    | close\b.*(ticket|incident)
+    | (mark|marking)\s+(this|the)?\s*ticket\s+as\s+resolved
+    | mark\s*resolved
+    | resolve(?:d|)\b
+    | resolving\s+the\s+incident
+    | (issue|ticket|incident)\s+(is\s+)?(resolved|completed|closed)
+    | (upon|post)\s+(your|user)\s+confirmation\b.*(mark|close|resolved)
+    | (hence|therefore)\b.*(closing|resolving)\b.*(incident|ticket|issue)
+    | thanks\b.*(close|closure)
+    )\b
+    ''')
+
+PASSWORD_PATTERN = re.compile(
+    r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$'
+)
+
+WORKNOTE_DATE_PATTERN = re.compile(
+    r'\b('
+    r'\d{1,2}[/\-\.]\d{1,2}[/\-\.]\d{4}'                              # dd/mm/yyyy, mm-dd-yyyy, dd.mm.yyyy
+    r'|'
+    r'\d{4}[/\-\.]\d{1,2}[/\-\.]\d{1,2}'                              # yyyy/mm/dd, yyyy-mm-dd
+    r'|'
+    r'\d{1,2}[-/\. ]?[A-Za-z]{3,9}[-/\. ]?\d{4}'                      # dd-MMM-yyyy or dd Month yyyy
+    r'|'
+    r'[A-Za-z]{3,9}[-/\. ]?\d{1,2},?[-/\. ]?\d{4}'                    # MMM dd, yyyy or Month dd yyyy
+    r'|'
+    r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2})?(\.\d+)?'              # ISO datetime
+    r'|'
+    r'\d{1,2}[/\-\.]\d{1,2}[/\-\.]\d{4}[ ,T]?\s*\d{1,2}:\d{2}(:\d{2})?(\.\d+)?'  # dd/mm/yyyy HH:MM[:SS][.fff]
+    r'|'
+    r'\d{4}[/\-\.]\d{1,2}[/\-\.]\d{1,2}[ ,T]?\s*\d{1,2}:\d{2}(:\d{2})?(\.\d+)?'  # yyyy-mm-dd HH:MM[:SS][.fff]
+    r'|'
+    r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?'      # ISO with timezone
+    r')\b'
+)
+
+# Sentence-ending punctuation marks to check
+SENTENCE_PUNCT = {'.', '!', '?', ';'}
+
+
+def evaluate_worknote_entry(entry):
+    """
+    Returns one of:
+    - "Comprehensive"
+    - "Needs improvement"
+    - "No match or invalid format"
+    """
+    try:
+        if entry is None:
+            return "No match or invalid format"
+
+        entry_str = str(entry).strip()
+        if not entry_str:
+            return "No match or invalid format"
+
+        # Find the FIRST date occurrence (to match existing behavior)
+        m = WORKNOTE_DATE_PATTERN.search(entry_str)
+        if not m:
+            return "No match or invalid format"
+
+        # Everything AFTER the date is considered the main content
+        after_date_text = entry_str[m.end():].strip()
+
+        # Basic content sufficiency checks
+        if len(after_date_text) <= 30:
+            return "Needs improvement"
+
+        # Count words (split on whitespace)
+        word_count = len(after_date_text.split())
+        if word_count < 10:
+            return "Needs improvement"
+
+        # Require at least one sentence-ending punctuation mark (., !, ?, ;)
+        if not any(p in after_date_text for p in SENTENCE_PUNCT):
+            return "Needs improvement"
+
+        # Capitalization check:
+        # Find the first alphabetic character after the date and ensure it's uppercase
+        first_alpha = next((ch for ch in after_date_text if ch.isalpha()), None)
+        if first_alpha is None or not first_alpha.isupper():
+            return "Needs improvement"
+
+        return "Comprehensive"
+
+    except Exception:
+        return "No match or invalid format"
+
+
+# ✅ Improved regex for timestamps, names, and markers
+WORKLOG_TIMESTAMP_PATTERN = re.compile(
+    r'(?:OR)?\s*\d{1,4}[-/]\d{1,2}[-/]\d{1,4}\s+\d{1,2}:\d{2}:\d{2}\s*-\s*[^\n()]+(?:\([^)]+\))?',
+    re.MULTILINE
+)
+
+
+def normalize_template_text(text):
+    """Collapse whitespace and lowercase, as templates and worklogs are compared."""
+    return WHITESPACE_PATTERN.sub(' ', text).strip().lower()
+
+
+def clean_worklog_text(text):
+    """Remove timestamps, names, and markers; normalize spaces and lowercase."""
+    if pd.isnull(text):
+        return ''
+    # Remove timestamp + name + markers
+    return normalize_template_text(WORKLOG_TIMESTAMP_PATTERN.sub('', str(text)))
+
+
+# ----------------------------------------------------------------------
+# Per-rule timing
+# ----------------------------------------------------------------------
+
+# lru caches whose hits / misses are attributed to the rule block that was running
+RULE_CACHES = (_parse_timestamp_cached, _parse_rule_date_cached, _parse_ticket_date_cached,
+               _read_mapping_cached, _tower_index_cached, _assignment_group_index_cached,
+               _category_keyword_index_cached)
+
+
+def _cache_counters():
+    hits = misses = 0
+    for cached in RULE_CACHES:
+        info = cached.cache_info()
+        hits += info.hits
+        misses += info.misses
+    return hits, misses
+
+
+class RuleTimer:
+    """
+    Wall-clock time spent in each rule block; start() closes the block that was running.
+    timings holds the seconds per rule; stats adds the rows evaluated, lru-cache hits / misses
+    and, while tracemalloc is tracing (see memory_tracking), the peak memory above the block's start.
+    """
+
+    def __init__(self, rows=0):
+        self.timings = {}
+        self.stats = {}
+        self.rows = rows
+        self._current = None
+        self._started = None
+        self._cache_start = (0, 0)
+        self._memory_start = None
+
+    def start(self, name):
+        self.stop()
+        self._current = name
+        self._cache_start = _cache_counters()
+        self._memory_start = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._memory_start = tracemalloc.get_traced_memory()[0]
+        self._started = time.perf_counter()
+
+    def stop(self):
+        if self._current is not None:
+            elapsed = time.perf_counter() - self._started
+            self.timings[self._current] = self.timings.get(self._current, 0.0) + elapsed
+            hits, misses = _cache_counters()
+            self.count_cache(hits - self._cache_start[0], misses - self._cache_start[1])
+            entry = self._entry(self._current)
+            entry['seconds'] += elapsed
+            entry['rows'] += self.rows
+            if self._memory_start is not None:
+                peak = (tracemalloc.get_traced_memory()[1] - self._memory_start) / (1024 * 1024)
+                entry['peak_memory_mb'] = max(entry['peak_memory_mb'] or 0.0, peak)
+            self._current = None
+
+    def count_cache(self, hits, misses):
+        """Add cache lookups (e.g. per-ticket result cache) to the block that is running."""
+        if self._current is not None:
+            entry = self._entry(self._current)
+            entry['cache_hits'] += hits
+            entry['cache_misses'] += misses
+
+    def _entry(self, name):
+        if name not in self.stats:
+            self.stats[name] = {'seconds': 0.0, 'rows': 0, 'cache_hits': 0, 'cache_misses': 0,
+                                'peak_memory_mb': None}
+        return self.stats[name]
+
+
+@contextmanager
+def memory_tracking(enabled=True):
+    """Trace allocations inside the block so RuleTimer can report peak memory per rule (slows the audit)."""
+    started = enabled and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+def merge_rule_stats(stats_list):
+    """Combine RuleTimer.stats from several chunks: seconds, rows and cache counts add up, memory peaks max."""
+    merged = {}
+    for stats in stats_list:
+        for name, entry in stats.items():
+            total = merged.setdefault(name, {'seconds': 0.0, 'rows': 0, 'cache_hits': 0, 'cache_misses': 0,
+                                             'peak_memory_mb': None})
+            for key in ('seconds', 'rows', 'cache_hits', 'cache_misses'):
+                total[key] += entry.get(key, 0)
+            if entry.get('peak_memory_mb') is not None:
+                total['peak_memory_mb'] = max(total['peak_memory_mb'] or 0.0, entry['peak_memory_mb'])
+    return merged
+
+
+def rule_stats_report(stats):
+    """One row per rule block, slowest first, with rows/sec and cache hit rate derived."""
+    report = []
+    for name, entry in sorted(stats.items(), key=lambda kv: kv[1]['seconds'], reverse=True):
+        lookups = entry['cache_hits'] + entry['cache_misses']
+        report.append({
+            'Rule': name,
+            'Seconds': round(entry['seconds'], 4),
+            'Rows': entry['rows'],
+            'Rows/sec': round(entry['rows'] / entry['seconds']) if entry['seconds'] > 0 else None,
+            'Peak memory (MB)': None if entry['peak_memory_mb'] is None else round(entry['peak_memory_mb'], 2),
+            'Cache hits': entry['cache_hits'],
+            'Cache misses': entry['cache_misses'],
+            'Cache hit rate %': round(100.0 * entry['cache_hits'] / lookups, 1) if lookups else None,
+        })
+    return report
+
+
+def format_rule_timings(timings, top=None):
+    """Render a timings dict (seconds per rule) as aligned lines, slowest first."""
+    items = sorted(timings.items(), key=lambda kv: kv[1], reverse=True)
+    if top:
+        items = items[:top]
+    width = max((len(name) for name, _ in items), default=0)
+    return "\n".join(f"  {name.ljust(width)}  {seconds:8.3f}s" for name, seconds in items)
+
+
+def format_rule_stats(stats, top=None):
+    """Like format_rule_timings, with rows/sec, cache hit rate and (when traced) peak memory per rule."""
+    report = rule_stats_report(stats)
+    if top:
+        report = report[:top]
+    width = max((len(row['Rule']) for row in report), default=0)
+    lines = []
+    for row in report:
+        line = f"  {row['Rule'].ljust(width)}  {row['Seconds']:8.3f}s"
+        if row['Rows/sec'] is not None:
+            line += f"  {row['Rows/sec']:>10,} rows/s"
+        if row['Cache hit rate %'] is not None:
+            line += f"  cache {row['Cache hit rate %']:5.1f}%"
+        if row['Peak memory (MB)'] is not None:
+            line += f"  peak +{row['Peak memory (MB)']:.1f} MB"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+# Mapping from UI rule names to DataFrame columns
+RULE_TO_COLUMN = {
+    # validation rule name : Output column name
+    "Short Description Length Check": "Short Description",
+    "Long Description Length Check": "Long Description",
+    "Actual Response Time took": "Response Time",
+    "Response SLA Met ?": "Response SLA Met",
+    "Resolution SLA Met ?": "Resolution SLA Met",
+    "KBA Tagged?": "KBA Tagged?",
+    "Reopened ?": "Reopened?",
+    "Related records tagged?": "Related records tagged?",
+    "Work Notes Updated Regularly": "Work Notes Updated Regularly",
+    "Ticket Updated Within Business Days": "Ticket Updated Within Business Days",
+    "Process Adherence Violation Check": "PA violation Check",
+    "Work notes Length Check": "Work notes Length",
+    "Resolution Notes / Additional comment Length Check": "Additional comments",
+    "Assignment group check": "Assignment group check",
+    "Related records tagged?": "Related records tagged?",
+    "Ticket Ageing Check": "Ticket Ageing Check",
+    "Reassignment check?": "Reassignment check?",
+    "Priority Validation": "Priority Validation",
+    "Category Validation": "Category Validation",
+    "Right Pending Justification Usage": "Pending Justification",
+    "Password_detected?": "Password Check",
+    "Has Attachments": "Has Attachments",
+    "Closed with User Confirmation?": "Closed with User Confirmation?",
+    "Work Notes Updated Regularly": "Work Notes Updated Regularly",
+    "Ticket Updated Within Business Days": "Ticket Updated Within Business Days",
+    "Process Adherence Violation Check": "PA violation Check",
+    "3 Strike rule check(escalation policy check for Remainder)": "3 Strike rule remainders check",
+    "Work Note Format & Content Check": "Work Note Format & Content Check",
+    "3 Strike Check(1-1-1)": "3 Strike Check(1-1-1)",
+    "3 Strike Check(2-2-1)": "3 Strike Check(2-2-1)",
+    "3 Strike Check(3-2-1)": "3 Strike Check(3-2-1)",
+    "Acknowledgment notes recorded in Worklog?": "Acknowledgment notes recorded in Worklog?",
+    "Is the resolution summary and closure notes updated as per appropriate template?": "Is the resolution summary and closure notes updated as per appropriate template?"
+}
+
+
+# Rules in the order evaluate_rules runs them (output columns appear in this order)
+RULE_ORDER = [
+    "Tower",
+    "Short Description Length Check",
+    "Long Description Length Check",
+    "Actual Response Time took",
+    "Response SLA Met ?",
+    "Resolution SLA Met ?",
+    "KBA Tagged?",
+    "Reopened ?",
+    "Work notes Length Check",
+    "Resolution Notes / Additional comment Length Check",
+    "Right Assignment group Usage",
+    "Right Pending Justification Usage",
+    "Related records tagged?",
+    "Ticket Ageing Check",
+    "3 Strike rule check(escalation policy check for Remainder)",
+    "Reassignment check?",
+    "Has Attachments",
+    "Priority Validation",
+    "Category Validation",
+    "Password_detected?",
+    "Closed with User Confirmation?",
+    "Work Notes Updated Regularly",
+    "Ticket Updated Within Business Days",
+    "Process Adherence Violation Check",
+    "Work Note Format & Content Check",
+    "Acknowledgment notes recorded in Worklog?",
+    "Is the resolution summary and closure notes updated as per appropriate template?",
+    "3 Strike Check(1-1-1)",
+    "3 Strike Check(2-2-1)",
+    "3 Strike Check(3-2-1)",
+]
+
+COMMENT_COLUMNS = ["Comments and Work notes", "Additional comments"]
+
+# Input columns each rule reads (a ticket's result for a rule only changes when these change)
+RULE_INPUT_COLUMNS = {
+    "Tower": ["Application Name / CI"],
+    "Short Description Length Check": ["Short description"],
+    "Long Description Length Check": ["Description"],
+    "Actual Response Time took": ["Response Time", "Priority"],
+    "Response SLA Met ?": ["Response SLA"],
+    "Resolution SLA Met ?": ["Resolution SLA"],
+    "KBA Tagged?": ["Knowledge Article Used"],
+    "Reopened ?": ["Reopened"],
+    "Work notes Length Check": ["Comments and Work notes"],
+    "Resolution Notes / Additional comment Length Check": ["Resolution notes"],
+    "Right Assignment group Usage": ["Assignment Group", "Application Name / CI"],
+    "Right Pending Justification Usage": ["Pending reason"] + COMMENT_COLUMNS,
+    "Related records tagged?": ["Pending reason", "Related Record"] + COMMENT_COLUMNS,
+    "Ticket Ageing Check": ["Age"] + COMMENT_COLUMNS,
+    "3 Strike rule check(escalation policy check for Remainder)": ["Age"] + COMMENT_COLUMNS,
+    "Reassignment check?": ["Reassignment count"],
+    "Has Attachments": ["Has Attachments"],
+    "Priority Validation": ["Priority", "Impact", "Urgency"],
+    "Category Validation": ["Description", "Category", "Subcategory"],
+    "Password_detected?": COMMENT_COLUMNS,
+    "Closed with User Confirmation?": COMMENT_COLUMNS,
+    "Work Notes Updated Regularly": ["Age"] + COMMENT_COLUMNS,
+    "Ticket Updated Within Business Days": ["Opened"] + COMMENT_COLUMNS,
+    "Process Adherence Violation Check": ["Opened", "Closed"] + COMMENT_COLUMNS,
+    "Work Note Format & Content Check": ["Comments and Work notes"],
+    "Acknowledgment notes recorded in Worklog?": COMMENT_COLUMNS,
+    "Is the resolution summary and closure notes updated as per appropriate template?": COMMENT_COLUMNS,
+    "3 Strike Check(1-1-1)": ["Age"] + COMMENT_COLUMNS,
+    "3 Strike Check(2-2-1)": ["Age"] + COMMENT_COLUMNS,
+    "3 Strike Check(3-2-1)": ["Age"] + COMMENT_COLUMNS,
+}
+
+# Threshold keys each rule reads
+RULE_THRESHOLD_KEYS = {
+    "Short Description Length Check": ["short_desc"],
+    "Long Description Length Check": ["long_desc"],
+    "Actual Response Time took": ["response_time_by_priority", "response_time"],
+    "Work notes Length Check": ["worknote"],
+    "Resolution Notes / Additional comment Length Check": ["Resolution_notes_value"],
+    "Ticket Ageing Check": ["Age Value"],
+    "3 Strike rule check(escalation policy check for Remainder)": ["3_strike_closure_threshold"],
+    "Reassignment check?": ["Reassignment threshold"],
+    "Work Notes Updated Regularly": ["Work Notes Updated Regularly"],
+    "Ticket Updated Within Business Days": ["ticket_update_days"],
+    "Acknowledgment notes recorded in Worklog?": ["Acknowledgment_notes_template"],
+    "Is the resolution summary and closure notes updated as per appropriate template?": ["Resolution_summary_template"],
+    "3 Strike Check(1-1-1)": ["1-1-1 Check"],
+    "3 Strike Check(2-2-1)": ["2-2-1 Check"],
+    "3 Strike Check(3-2-1)": ["3-2-1 Check"],
+}
+
+# Mapping files each rule reads
+RULE_MAPPING_FILES = {
+    "Tower": [TOWER_MAPPING_FILE],
+    "Right Assignment group Usage": [TOWER_MAPPING_FILE],
+    "Category Validation": [CATEGORY_MAPPING_FILE],
+}
+
+# The Password check fills blank comments with '' in place, so every rule after it in
+# RULE_ORDER sees '' instead of NaN when Password_detected? is selected
+PASSWORD_RULE = "Password_detected?"
+
+# Input columns every audit loads whatever rules are selected: the identifiers copied into the
+# output and the dates the Age column is calculated from
+IDENTIFIER_INPUT_COLUMNS = ["Number", "Assigned to", "Application Name / CI"]
+AGE_SOURCE_COLUMNS = ["Opened", "Closed"]
+
+
+def required_input_columns(selected_rules, include_observations=False, extra_requirements=None):
+    """
+    Ordered union of the input columns needed to audit selected_rules: identifiers, Age sources,
+    RULE_INPUT_COLUMNS and any extra rule -> columns requirements (e.g. the app's validation
+    table). Everything else in the export can be skipped when loading.
+    """
+    columns = IDENTIFIER_INPUT_COLUMNS + AGE_SOURCE_COLUMNS
+    for rule in selected_rules:
+        columns = columns + RULE_INPUT_COLUMNS.get(rule, [])
+        columns = columns + (extra_requirements or {}).get(rule, [])
+    if include_observations or any(rule in OBSERVATION_COLUMNS for rule in selected_rules):
+        columns = columns + COMMENT_COLUMNS
+    # Age is derived from Opened / Closed on load
+    return [col for col in dict.fromkeys(columns) if col != "Age"]
+
+
+# Low-cardinality input fields stored as category (one copy of each distinct value plus a small
+# integer code per ticket). Opened / Closed stay as text for the date parsers.
+INPUT_CATEGORY_COLUMNS = ["Priority", "State", "Impact", "Urgency", "Assignment Group", "Application Name / CI",
+                          "Assigned to", "Category", "Subcategory", "Pending reason", "Response SLA",
+                          "Resolution SLA", "Has Attachments"]
+
+# Result columns never converted: one distinct value per ticket
+RESULT_UNIQUE_COLUMNS = ["Ticket Number"]
+
+
+def compact_categories(df, columns=None, max_unique_ratio=0.5):
+    """
+    Convert text columns with few distinct values to the category dtype, in place. Only columns
+    holding strings (and blanks) are touched, so values and comparisons stay the same.
+    """
+    candidates = df.columns if columns is None else [col for col in columns if col in df.columns]
+    for col in candidates:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.infer_dtype(series, skipna=True) != 'string':
+            continue
+        if series.nunique() > max(1, len(series) * max_unique_ratio):
+            continue
+        df[col] = series.astype('category')
+    return df
+
+
+def compact_input_frame(input_df):
+    """Category dtype for the low-cardinality ticket fields (Priority, State, Assignment Group, ...)."""
+    return compact_categories(input_df, INPUT_CATEGORY_COLUMNS)
+
+
+def compact_result_frame(output_df):
+    """
+    Category dtype for the repeated result strings: rule statuses such as "Pass" / "Fail (Gap > 1
+    business day)", Score Category, Tower, Application, Assigned to.
+    """
+    return compact_categories(output_df, [col for col in output_df.columns if col not in RESULT_UNIQUE_COLUMNS])
+
+
+def apply_scores(output_df, pass_matrix, weights, total_checks):
+    """
+    Add Score, Score Category and Weightage Score to output_df (index 0..n-1).
+    pass_matrix holds one status list per evaluated rule; only Pass/Fail entries count.
+    """
     score_list = []
     score_category = []
+
+    # Scoring
+    # for i in range(len(output_df)):
+    #     cnt_pass = sum(1 for check in pass_matrix if check[i] == "Pass")
+    #     percent = (cnt_pass / total_checks) * 100 if total_checks else 0
+    #     percent = math.ceil(percent)
+    #     score_list.append(percent)
+    #     print(total_checks)
+    
+    #Only change inside your loop
+    for i in range(len(output_df)):
+        # Count passes as before
+        cnt_pass = sum(1 for check in pass_matrix if check[i] == "Pass")
+        # NEW: denominator = only Pass + Fail (ignores "No data found", "Not Enough Comments", blanks, etc.)
+        denom = sum(1 for check in pass_matrix if check[i] in ("Pass", "Fail"))
+        percent = math.ceil((cnt_pass * 100) / denom) if denom else 0
+        score_list.append(percent)
+
+        print(total_checks)  # left untouched to keep your logging the same
+
+        if percent < 75:
+            score_category.append('<75%')
+        elif percent < 90:
+            score_category.append('75%-90%')
+        else:
+            score_category.append('>90%-100%')
  
+    output_df["Score"] = score_list
+    output_df["Score Category"] = score_category
+
+    # ----------------------------------------------------------------------
+    # NEW: Weightage Score (adds a second score column without touching old Score)
+    # ----------------------------------------------------------------------
+
+    def _normalize_rule_name(name: str) -> str:
+        """Normalize rule labels so '&amp;' in UI matches '&' in DataFrame columns."""
+        return str(name).replace("&amp;", "&").strip()
+
+    # Build a lookup from normalized column name -> actual DataFrame column
+    normalized_col_map = {
+        _normalize_rule_name(col).lower(): col for col in output_df.columns
+    }
+
+    # # Debug prints to diagnose weightage score issues
+    # print("Normalized column map:", normalized_col_map)
+    # print("Weights dict:", weights)
+    # print("DataFrame columns:", list(output_df.columns))
+
+    use_weights = isinstance(weights, dict) and len(weights) > 0
+
+    weightage_scores = []
+    for i in range(len(output_df)):
+        if use_weights:
+            total_possible = 0
+            total_earned = 0
+            for rule_name, w in weights.items():
+                # Use the mapping to get the correct DataFrame column
+                df_col = RULE_TO_COLUMN.get(rule_name)
+                if not df_col or df_col not in output_df.columns:
+                    continue
+                status = str(output_df.at[i, df_col]).strip().lower()
+                print(f"Row {i}, Rule: {rule_name}, Col: {df_col}, Status: {status}, Weight: {w}")
+                if status in ("pass", "fail") and w > 0:
+                    total_possible += w
+                    if status == "pass":
+                        total_earned += w
+            if total_possible > 0:
+                variable = int(math.ceil((total_earned * 100) / total_possible))
+                weightage_scores.append(variable)
+                print(f"Weightage Score for row {i}: {variable}")
+            else:
+                weightage_scores.append(0)
+        else:
+            weightage_scores.append(score_list[i])  # fallback if weights not used
+        
+    output_df["Weightage Score"] = weightage_scores
+    return output_df
+
+
+def merge_rule_timings(timings_list):
+    """Sum per-rule timings from several chunks (seconds of CPU spent across workers)."""
+    merged = {}
+    for timings in timings_list:
+        for name, seconds in timings.items():
+            merged[name] = merged.get(name, 0.0) + seconds
+    return merged
+
+
+def evaluate_rules(input_df, selected_rules, thresholds, include_observations=False):
+    """
+    Run the selected rule blocks. Returns (output_df, pass_matrix, rule_timer): the identifier
+    and rule result columns, one status list per evaluated rule for scoring, and the per-rule timer.
+    """
+
+    print(selected_rules, thresholds)
+    # Shallow copy: the Password check replaces comment columns, which must not leak into the
+    # caller's frame (the app keeps the parsed upload across reruns)
+    input_df = input_df.copy(deep=False)
+    rule_timer = RuleTimer(rows=len(input_df))
+    output_df = pd.DataFrame()
+
+    # Opened / Closed as the date rules read them, parsed once and shared between those rules
+    rule_dates = {}
+
+    def get_rule_dates(column):
+        if column not in rule_dates:
+            rule_dates[column] = parse_rule_dates(input_df[column])
+        return rule_dates[column]
+
     # Always keep identifier columns
     output_df["Ticket Number"] = input_df.get("Number", "")
     
@@ -159,11 +1693,11 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # output_df["Observations1"] = input_df.get("Observations1", "")      
     # output_df["Observations2"] = input_df.get("Observations2", "")
-    total_checks = len(selected_rules)
  
     # Initialize result storage
     pass_matrix = []
     if 'Tower' in selected_rules:
+        rule_timer.start("Tower")
         # Tower Dependency Validation in logic layer
         print("🏗️ Processing Tower mapping with dependency validation...")
         
@@ -176,9 +1710,9 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             output_df['Tower'] = ["Missing Column"] * len(output_df)
         else:
             # Dependency Check 2: Tower mapping file validation
-            tower_mapping_file = 'Tower_Maping.xlsx'
+            tower_mapping_file = TOWER_MAPPING_FILE
             try:
-                tower = pd.read_excel(tower_mapping_file)
+                tower = read_mapping_file(tower_mapping_file)
                 
                 # Dependency Check 3: Tower file structure validation
                 required_tower_columns = ['Application Name', 'Tower']
@@ -189,19 +1723,15 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     print("💡 Creating Tower column with 'Invalid File' values")
                     output_df['Tower'] = ["Invalid File"] * len(output_df)
                 else:
-                    # Process tower mapping (original logic with enhanced error handling)
+                    # Process tower mapping (first match per application, looked up in a cached index)
                     L = list()
-                    tower = tower[['Application Name','Tower']]
+                    tower_index = load_tower_index(tower_mapping_file)
                     
                     # Handle tower mapping with error handling
                     for i in output_df['Application']:
                         try:
-                            ind = tower.loc[tower['Application Name']==i].index
-                            if len(ind) > 0:  # Check if application found in tower mapping
-                                tower_name = tower.loc[ind,'Tower']
-                                for j in tower_name:
-                                    L.append(j)
-                                    break  # Take only the first match
+                            if not pd.isnull(i) and i in tower_index:  # Check if application found in tower mapping
+                                L.append(tower_index[i])
                             else:
                                 # Application not found in tower mapping, assign default
                                 L.append("Unknown Tower")
@@ -236,6 +1766,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     #Short Description
     if "Short Description Length Check" in selected_rules:
+        rule_timer.start("Short Description Length Check")
         required_column = "Short description"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Short Description validation")
@@ -250,7 +1781,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             # Create result with failure reason in the result itself
             result = ["Fail - Missing Column"] * len(input_df)
             output_df["Short Description"] = result
-            sort_len_obs = "Short Description"
             pass_matrix.append(["Fail"] * len(input_df))  # Pass matrix needs simple Fail/Pass for scoring
         else:
             result = []
@@ -265,11 +1795,11 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     result.append("Pass")
             
             output_df["Short Description"] = result
-            sort_len_obs = "Short Description"
             pass_matrix.append(result)
  
     # Long Description
     if "Long Description Length Check" in selected_rules:
+        rule_timer.start("Long Description Length Check")
         required_column = "Description"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Long Description validation")
@@ -284,7 +1814,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             # Create result with failure reason in the result itself
             result = ["Fail - Missing Column"] * len(input_df)
             output_df["Long Description"] = result
-            long_desc_obs = "Long Description"
             pass_matrix.append(["Fail"] * len(input_df))
         else:
             result = []
@@ -299,11 +1828,11 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     result.append("Pass")
             
             output_df["Long Description"] = result
-            long_desc_obs = "Long Description"
             pass_matrix.append(result)
  
     # Response Time (Priority-Based)
     if "Actual Response Time took" in selected_rules:
+        rule_timer.start("Actual Response Time took")
         required_column = "Response Time"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Response Time validation")
@@ -317,57 +1846,10 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
             result = ["Fail - Missing Column"] * len(input_df)
             output_df["Response Time"] = result
-            response_time_obs = "Response Time"
             pass_matrix.append(["Fail"] * len(input_df))
         else:
             result = []
             
-            # Define priority canonicalization function
-            def normalize_priority_for_response(priority_str):
-                """Normalize priority to standard format: 1-Critical, 2-High, 3-Medium, 4-Low"""
-                if pd.isnull(priority_str) or str(priority_str).strip() == 'None':
-                    return None
-                
-                key = str(priority_str).strip().lower()
-                key = key.replace(' – ', '-').replace(' - ', '-').replace('–', '-')
-                key = ' '.join(key.split())
-                
-                PRIORITY_CANON_MAP = {
-                    '1-critical': '1-Critical', 'critical': '1-Critical', 'p1': '1-Critical',
-                    'severity 1': '1-Critical', 'sev1': '1-Critical', 's1': '1-Critical', 'priority 1': '1-Critical',
-                    '2-high': '2-High', 'high': '2-High', 'p2': '2-High',
-                    'severity 2': '2-High', 'sev2': '2-High', 's2': '2-High', 'priority 2': '2-High',
-                    '3-medium': '3-Medium', '3-moderate': '3-Medium', 'moderate': '3-Medium', 'med': '3-Medium', 'mod': '3-Medium',
-                    'p3': '3-Medium', 'severity 3': '3-Medium', 'sev3': '3-Medium', 's3': '3-Medium', 'priority 3': '3-Medium',
-                    '4-low': '4-Low', 'low': '4-Low', 'p4': '4-Low',
-                    'severity 4': '4-Low', 'sev4': '4-Low', 's4': '4-Low', 'priority 4': '4-Low',
-                }
-                
-                if key in PRIORITY_CANON_MAP:
-                    return PRIORITY_CANON_MAP[key]
-                
-                for pat in (r'\bp\s*-?\s*([1-4])\b', r'\bsev(?:erity)?\s*-?\s*([1-4])\b', 
-                           r'\bs\s*-?\s*([1-4])\b', r'\bpriority\s*-?\s*([1-4])\b'):
-                    m = re.search(pat, key)
-                    if m:
-                        n = int(m.group(1))
-                        return ['1-Critical','2-High','3-Medium','4-Low'][n-1]
-                
-                m = re.search(r'\b([1-4])\s*-\s*(critical|high|medium|moderate|low)\b', key)
-                if m:
-                    word = m.group(2)
-                    if 'critical' in word: return '1-Critical'
-                    if 'high' in word:     return '2-High'
-                    if 'medium' in word or 'moderate' in word: return '3-Medium'
-                    if 'low' in word:      return '4-Low'
-                
-                if 'critical' in key: return '1-Critical'
-                if 'high' in key:     return '2-High'
-                if 'medium' in key or 'moderate' in key: return '3-Medium'
-                if 'low' in key:      return '4-Low'
-                
-                return None
-            
             # Check if priority-based thresholds are configured (from UI after file upload)
             has_priority_config = "response_time_by_priority" in thresholds and thresholds["response_time_by_priority"]
             
@@ -381,7 +1863,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                 
                 for idx, (response_time, priority) in enumerate(zip(input_df["Response Time"], input_df["Priority"])):
                     # Normalize the priority from the data
-                    normalized_priority = normalize_priority_for_response(priority)
+                    normalized_priority = normalize_priority(priority)
                     
                     if pd.isnull(response_time) or not isinstance(response_time, (int, float)):
                         result.append("Fail")
@@ -410,11 +1892,11 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                         result.append("Pass")
             
             output_df["Response Time"] = result
-            response_time_obs = "Response Time"
             pass_matrix.append(result)
 
     #Response SLA
     if "Response SLA Met ?" in selected_rules:
+        rule_timer.start("Response SLA Met ?")
         required_column = "Response SLA"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Response SLA validation")
@@ -445,8 +1927,8 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             pass_matrix.append(status_response_sla)
 
     # Resolution SLA Met
-    import re
     if "Resolution SLA Met ?" in selected_rules:
+        rule_timer.start("Resolution SLA Met ?")
         required_column = "Resolution SLA"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Resolution SLA validation")
@@ -477,6 +1959,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
    
     # KBA Tagged
     if "KBA Tagged?" in selected_rules:
+        rule_timer.start("KBA Tagged?")
         required_column = "Knowledge Article Used"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for KBA Tagged validation")
@@ -503,6 +1986,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             pass_matrix.append(status_kba_tagged)
 
     if "Reopened ?" in selected_rules:
+        rule_timer.start("Reopened ?")
         required_column = "Reopened"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Reopened validation")
@@ -518,27 +2002,10 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             output_df['Reopened?'] = result
             pass_matrix.append(["Fail"] * len(input_df))
         else:
-            import re
-            import pandas as pd
-
             status_reopened = []
 
-            # Canonical true/false strings we will support
-            TRUE_STR = {'true', 'yes', 'y', '1'}
-            FALSE_STR = {'false', 'no', 'n', '0'}
-
-            def _clean_cell(v):
-                """Normalize cell: string, strip, lowercase, collapse whitespace, remove NBSP."""
-                if pd.isna(v):
-                    return None
-                s = str(v).replace('\xa0', ' ')  # remove non-breaking space from Excel
-                s = s.strip().lower()
-                # collapse multiple spaces to single
-                s = re.sub(r'\s+', ' ', s)
-                return s
-
             for reopened in input_df[required_column]:
-                s = _clean_cell(reopened)
+                s = clean_reopened_cell(reopened)
 
                 # 1) Null/empty -> Fail
                 if s is None or s == '':
@@ -556,10 +2023,10 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     continue
 
                 # 4) Canonical true/false strings
-                if s in TRUE_STR:
+                if s in REOPENED_TRUE_STRINGS:
                     status_reopened.append('Fail')
                     continue
-                if s in FALSE_STR:
+                if s in REOPENED_FALSE_STRINGS:
                     status_reopened.append('Pass')
                     continue
 
@@ -578,8 +2045,8 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             
 
     # Worknote
-    import re
     if "Work notes Length Check"in selected_rules:
+        rule_timer.start("Work notes Length Check")
         required_column = "Comments and Work notes"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Work notes validation")
@@ -593,12 +2060,10 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             
             result = ["Fail - Missing Column"] * len(input_df)
             output_df["Work notes Length"] = result
-            worknote_obs = "Work notes Length"
             pass_matrix.append(["Fail"] * len(input_df))
         else:
             status_worknote = []
             worknote_len = thresholds["worknote"]
-            import re
             for worknote in input_df[required_column]:
                 if pd.isnull(worknote):
                     status_worknote.append('Fail')
@@ -608,24 +2073,11 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     continue
                 #cleaned_note = re.sub(r'(?m)^[0-3]\d[-/][01]\d[-/]\d{4}\s+\d{2}:\d{2}:\d{2}\s*-\s*.+?\s+\((?:Additional comments|Work notes)\)\s*$', '', worknote)
                 #cleaned_note = re.sub(r'(?m)^(?:\d{4}[-/](?:0[1-9]|1[0-2])[-/](?:0[1-9]|[12]\d|3[01])|(?:0[1-9]|[12]\d|3[01])[-/](?:0[1-9]|1[0-2])[-/]\d{4}|(?:0[1-9]|1[0-2])[-/](?:0[1-9]|[12]\d|3[01])[-/]\d{4})\s+\d{2}:\d{2}:\d{2}\s*-\s*.+?\s+\((?:Additional comments|Work notes)\)\s*$', '', worknote)
-                cleaned_note = re.sub(
-                                    r'(?m)^\(?'
-                                    r'(?:\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{4})'   # YYYY-M-D or D/M/YYYY or M/D/YYYY; -, /, .; single/zero-padded
-                                    r'(?:\s+\d{1,2}:\d{2}(?::\d{2})?'                                     # time: H:MM or HH:MM or HH:MM:SS
-                                    r'(?:\s*(?:AM|PM|A\.M\.|P\.M\.))?'                                    # optional AM/PM with or without dots/spaces
-                                    r')?'                                                                 # whole time block optional
-                                    r'(?:\s*-\s*[^(\n]+(?:\s*\([^)]*\))?)?'                               # optional: " - Name" and optional "(...)" tag
-                                    r'\s*',                                                               # trailing spaces
-                                    '',
-                                    worknote,
-                                    flags=re.IGNORECASE
-                                )
-
-                cleaned_note = cleaned_note.strip()
+                cleaned_note = strip_note_headers(worknote)
 
                 word_count = len(cleaned_note.split())
                 char_count = len(cleaned_note)
-                has_punctuation = bool(re.search(r'[.,?!]', cleaned_note))
+                has_punctuation = bool(NOTE_PUNCTUATION_PATTERN.search(cleaned_note))
                 starts_with_capital = cleaned_note[0].isupper() if cleaned_note else False
                 
                 if word_count >= 20 and char_count > worknote_len and has_punctuation and starts_with_capital:
@@ -636,12 +2088,11 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             print(f"WORKNOTES: Word count: {word_count}, Char count: {char_count}, Has punctuation: {has_punctuation}, Starts with capital: {starts_with_capital}")
 
             output_df["Work notes Length Check"] = status_worknote
-            worknote_obs = "Work notes Length Check"
             pass_matrix.append(status_worknote)
 
     #Additional comments / Resolution Notes
-    import re
     if "Resolution Notes / Additional comment Length Check" in selected_rules:
+        rule_timer.start("Resolution Notes / Additional comment Length Check")
         required_column = "Resolution notes"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Additional comments validation")
@@ -655,7 +2106,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             
             result = ["Fail - Missing Column"] * len(input_df)
             output_df['Resolution Notes Length'] = result
-            resolution_notes_obs = 'Resolution Notes Length'
             pass_matrix.append(["Fail"] * len(input_df))
         else:
             status_resolution_notes = []
@@ -668,25 +2118,11 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     status_resolution_notes.append('Fail')
                     continue
                 
-                cleaned_note = re.sub(
-                                        r'(?m)^\(?'
-                                        r'(?:\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{4})'   # YYYY-M-D or D/M/YYYY or M/D/YYYY; -, /, .; single/zero-padded
-                                        r'(?:\s+\d{1,2}:\d{2}(?::\d{2})?'                                     # time: H:MM or HH:MM or HH:MM:SS
-                                        r'(?:\s*(?:AM|PM|A\.M\.|P\.M\.))?'                                    # optional AM/PM with or without dots/spaces
-                                        r')?'                                                                 # whole time block optional
-                                        r'(?:\s*-\s*[^(\n]+(?:\s*\([^)]*\))?)?'                               # optional: " - Name" and optional "(...)" tag
-                                        r'\s*',                                                               # trailing spaces
-                                        '',
-                                        note,
-                                        flags=re.IGNORECASE
-                                    )
-
-
-                cleaned_note = cleaned_note.strip()
+                cleaned_note = strip_note_headers(note)
 
                 word_count = len(cleaned_note.split())
                 char_count = len(cleaned_note)
-                has_punctuation = bool(re.search(r'[.,?!]', cleaned_note))
+                has_punctuation = bool(NOTE_PUNCTUATION_PATTERN.search(cleaned_note))
                 starts_with_capital = cleaned_note[0].isupper() if cleaned_note else False
 
                 if word_count >= 10 and char_count > resolution_notes_length and has_punctuation and starts_with_capital:
@@ -695,10 +2131,10 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     status_resolution_notes.append('Fail')
             print(f"Resolution Notes: Word count: {word_count}, Char count: {char_count}, Has punctuation: {has_punctuation}, Starts with capital: {starts_with_capital}")
             output_df['Resolution Notes Length'] = status_resolution_notes
-            resolution_notes_obs = 'Resolution Notes Length'
             pass_matrix.append(status_resolution_notes)
 
     if "Right Assignment group Usage" in selected_rules:
+        rule_timer.start("Right Assignment group Usage")
         required_column = "Assignment Group"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' in for Assignment group check validation")
@@ -715,21 +2151,16 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             pass_matrix.append(["Fail"] * len(input_df))
         else:
             status_Assig_group_check = []
-            tower = pd.read_excel('Tower_Maping.xlsx')
-            # Add normalized columns to the mapping DataFrame (do this once before the loop)
-            def normalize(val):
-                return str(val).strip().lower() if pd.notnull(val) else ""
-            tower['App_norm'] = tower['Application Name'].apply(normalize)
-            tower['Group_norm'] = tower['Assignment group'].apply(normalize)
+            # Normalized Application Name -> allowed assignment groups (built once per mapping file version)
+            group_index = load_assignment_group_index(TOWER_MAPPING_FILE)
+            normalize = _normalize_mapping_value
             for input_app, input_group in zip(input_df['Application Name / CI'], input_df['Assignment Group']):
                 app_norm = normalize(input_app)
                 group_norm = normalize(input_group)
-                # Find all mapping rows with matching normalized Application Name
-                matching_rows = tower[tower['App_norm'] == app_norm]
                 # Get all possible assignment groups for this app
-                possible_groups = matching_rows['Group_norm'].tolist()
+                possible_groups = group_index.get(app_norm, set())
                 # Debug print (optional, remove in production)
-                print(f"Input: {app_norm}, {group_norm} | Mapping: {possible_groups}")
+                print(f"Input: {app_norm}, {group_norm} | Mapping: {sorted(possible_groups)}")
                 if group_norm in possible_groups:
                     status_Assig_group_check.append('Pass')
                 else:
@@ -737,208 +2168,8 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             output_df['Assignment group check'] = status_Assig_group_check
             pass_matrix.append(status_Assig_group_check)
     
-    def Pending_Justification():
-        status_pending_justification = []
-        for val1, comment1, comment2 in zip(input_df['Pending reason'], 
-        input_df['Comments and Work notes'], input_df['Additional comments']):
-            # If Pending reason is null or 'None', mark as Pass
-            if pd.isnull(val1) or str(val1).strip().lower() == None:
-                status_pending_justification.append('Pass')
-                continue
-
-            # Combine and normalize both comment fields
-            combined_text = ''
-            if pd.notnull(comment1):
-                combined_text += str(comment1) + ' '
-            if pd.notnull(comment2):
-                combined_text += str(comment2)
-
-            combined_text = combined_text.replace(' ', '').lower()
-
-            # Check for justification phrases
-            if any(phrase in combined_text.lower() for phrase in [
-                # === USER/CUSTOMER DEPENDENT ===
-                'confirmationpending',
-                'asperconfirmationweareclosingtheticket',
-                'awaitinguserconfirmation',
-                'waitingforuserreply',
-                'waitingforuserinput'
-                'waitingforuser',
-                'waitingforuserconfirmation',
-                'waitinguserinputs',
-                'awaitinguserinputs',
-                'waitingforuserresponse',
-                'pendingwithuser',
-                'awaitinguserinput',
-                'awaitinguserresponse',
-                'waitingforuserinput',
-                'waitingforuserreply',
-                'waitingonuser',
-                'pendinguserinput',
-                'pendinguserresponse',
-                'needuserinput',
-                'needuseraction',
-                'waitingforcustomer',
-                'awaitingcustomerresponse',
-                'waitingforcustomerreply',
-                'pendingwithcustomer',
-                'awaitingfeedbackfromuser',
-                'waitingforenduser',
-                'awaitingenduserresponse',
-                'waitingforuserconfirmation',
-                'waitingforuserclarification',
-                'usertoprovidedetails',
-                'useractionrequired',
-                'userresponseawaited',
-                'userreplypending',
-                'waitingforuseravailability',
-                'scheduledusermeeting',
-                'usernotavailable',
-                'usertesting',
-                'awaitingusertesting',
-                'waitingforusertesting',
-                
-                # === VENDOR/THIRD PARTY ===
-                'waitingforvendor',
-                'pendingwithvendor',
-                'awaitingvendorresponse',
-                'vendorworkingonit',
-                'escalatedtovendor',
-                'waitingforthirdparty',
-                'awaitingvendorsupport',
-                'vendorapprovalrequired',
-                'waitingforvendorupdate',
-                'vendorticketcreated',
-                'awaitingmanufacturerresponse',
-                
-                # === TECHNICAL/INVESTIGATION ===
-                'weareworkingonit',
-                'wearelookingintotheissue',
-                'underinvestigation',
-                'analyzingtheissue',
-                'troubleshootinginprogress',
-                'rootcauseanalysis',
-                'technicalanalysis',
-                'debugginginprogress',
-                'performingtests',
-                'runningdiagnostics',
-                'checkinglogs',
-                'monitoringthesystem',
-                'awaitingtestresults',
-                'testinginprogress',
-                'replicatingtheissue',
-                'gatheringlogs',
-                'systemanalysis',
-                
-                # === APPROVAL/AUTHORIZATION ===
-                'awaitingapproval',
-                'pendingapproval',
-                'waitingformanagerapproval',
-                'managementapprovalrequired',
-                'awaitingauthorization',
-                'budgetapprovalrequired',
-                'securityapprovalneeded',
-                'changeapprovalrequired',
-                'awaitingcabreview',
-                'cabapprovalrequired',
-                'escalationrequired',
-                
-                # === SCHEDULING/MAINTENANCE ===
-                'scheduledmaintenance',
-                'waitingformaintenancewindow',
-                'plannedoutage',
-                'scheduleddowntime',
-                'awaitingmaintenanceslot',
-                'scheduledforimplementation',
-                'waitingforchangewindow',
-                'deploymentscheduled',
-                'patchingscheduled',
-                'upgradewindowscheduled',
-                
-                # === RESOURCE/TEAM DEPENDENT ===
-                'awaitingsubjectmatterexpert',
-                'escalatedtospecialistteam',
-                'waitingforexpertassignment',
-                'assignedtoseniorteam',
-                'awaitingsme',
-                'l2escalation',
-                'l3escalation',
-                'transferredtospecialistteam',
-                'expertreviewrequired',
-                'awaitingteamleadreview',
-                
-                # === DEPENDENCY/COORDINATION ===
-                'waitingfordependentticket',
-                'relatedticketinprogress',
-                'coordinatingwithother teams',
-                'dependentonparentticket',
-                'blockedbyotherissue',
-                'awaitingprerequisitefixes',
-                'coordinationrequired',
-                'multipleagentsworking',
-                'crossteamcoordination',
-                
-                # === PROCUREMENT/DELIVERY ===
-                'waitingfordelivery',
-                'hardwareordered',
-                'awaitingshipment',
-                'procurementinprogress',
-                'purchaseordersubmitted',
-                'awaitinghardware',
-                'waitingforreplacement parts',
-                'deliveryscheduled',
-                'equipmentintransit',
-                
-                # === ENVIRONMENT/SYSTEM DEPENDENT ===
-                'systemmaintenance',
-                'environmentissue',
-                'networkissue',
-                'serverissue',
-                'applicationdown',
-                'systemunavailable',
-                'platformissue',
-                'infrastructureissue',
-                'servicedegradation',
-                'performanceissue',
-                
-                # === COMMUNICATION/UPDATE ===
-                'wewillgetbacktoyou',
-                'updateswillbeprovided',
-                'progressupdatetofollow',
-                'statusupdatepending',
-                'communicationinprogress',
-                'meetingscheduled',
-                'discussionrequired',
-                'conferenceorganized',
-                
-                # === DOCUMENTATION/COMPLIANCE ===
-                'documentationinprogress',
-                'procedurebeingrupdated',
-                'policyreviewrequired',
-                'compliancecheckneeded',
-                'auditinprogress',
-                'documentationreviewrequired',
-                'proceduralreviewneeded',
-                
-                # === COMMON SUPPORT PHRASES ===
-                'ticketescalated',
-                'furtheranalysisrequired',
-                'monitoringforfurtherissues',
-                'awaitingconfirmation',
-                'solutionbeingtested',
-                'resolutioninprogress',
-                'workingonthisticket',
-                'issuebeinginvestigated',
-                'lookingintotheissue',
-                'checkingwithbackendteam'
-
-            ]):
-                status_pending_justification.append('Pass')
-            else:
-                status_pending_justification.append('Fail')
-        return status_pending_justification
-
     if "Right Pending Justification Usage" in selected_rules:
+        rule_timer.start("Right Pending Justification Usage")
         required_columns = ["Pending reason", "Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         
@@ -950,7 +2181,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             output_df['Pending Justification'] = result
             pass_matrix.append(["Fail"] * len(input_df))
         else:
-            pending_justification = Pending_Justification()
+            pending_justification = pending_justification_check(input_df)
             output_df['Pending Justification'] = pending_justification
             pass_matrix.append(pending_justification)
 
@@ -963,7 +2194,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             pendingproblem → must contain 'PRB'
             pendingfulfillment → must contain 'RITM'
             pendingincident → must contain 'INC'
-            pendingcustomer → uses external justification logic (Pending_Justification())
+            pendingcustomer → uses external justification logic (pending_justification_check())
             Remarks (possible results):
 
             Pass → Related record is correctly tagged for the given pending reason.
@@ -972,6 +2203,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             Pass → If Pending reason is null or 'None'."""
     
     if "Related records tagged?" in selected_rules:
+        rule_timer.start("Related records tagged?")
         required_columns = ["Pending reason", "Related Record"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         
@@ -984,6 +2216,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             pass_matrix.append(["Fail"] * len(input_df))
         else:
             status_related_rec_tagged = []
+            pending = None  # justification statuses, evaluated once on the first pendingcustomer row
             cnt= 0
             for record in input_df['Pending reason']:
                 cnt +=1
@@ -1070,7 +2303,8 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                         continue
 
                 elif record == 'pendingcustomer':
-                    pending = Pending_Justification()
+                    if pending is None:
+                        pending = pending_justification_check(input_df)
                     result= pending[cnt-1]
                     status_related_rec_tagged.append(result)
 
@@ -1082,6 +2316,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # Ticket Ageing Check   
     if "Ticket Ageing Check" in selected_rules:
+        rule_timer.start("Ticket Ageing Check")
         required_column = "Age"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Ticket Ageing Check validation")
@@ -1117,151 +2352,8 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # 3_Strike rule check (Optimized with same-day closure and X-business-day handling)
     
-    def three_strike_rule_check():
-        """
-        Optimized 3-Strike rule check for escalation policy:
-        
-        1. If ticket is closed within X business days → Pass (no reminders needed)
-        2. If ticket opened and closed same day → Pass
-        3. If Age is missing or None → Pass (missing timestamps not mandatory)
-        4. If Age < 3 days → Pass (no reminder needed yet)
-        5. Age 3–5 → check for first reminder
-        6. Age 5–7 → check for first + second reminders  
-        7. Age > 7 → check for final reminder
-        """
-        import re
-        import numpy as np
-        from datetime import datetime
-        
-        # Define reminder patterns
-        first_reminder_patterns = [
-            r'\bfirst reminder\b',
-            r'\bgentle reminder\b',
-            r'\b1st reminder\b',
-            r'\breminder 1\b',
-            r'\breminder[\s\-:#]*1\b',
-            r'\breminder\b.*\b1\b',
-            r'\breminder\b.*\bfirst\b',
-            r'\br1\b',
-            r'\breminder[\s\-]*one\b',
-            # Additional patterns
-            r'\binitial reminder\b',
-            r'\breminder number one\b',
-            r'\bfirst follow[\s\-]*up\b',
-            r'\bfollow[\s\-]*up[\s\-]*1\b',
-            r'\breminder sent first\b',
-            r'\breminder sent on\b.*\bfirst\b'
-        ]
-
-        second_reminder_patterns = [
-            r'\bsecond reminder\b',
-            r'\b2nd reminder\b',
-            r'\breminder 2\b',
-            r'\breminder[\s\-:#]*2\b',
-            r'\breminder\b.*\b2\b',
-            r'\breminder\b.*\bsecond\b',
-            r'\br2\b',
-            r'\breminder[\s\-]*two\b',
-            # Additional patterns
-            r'\breminder number two\b',
-            r'\bsecond follow[\s\-]*up\b',
-            r'\bfollow[\s\-]*up[\s\-]*2\b',
-            r'\banother reminder\b',
-            r'\breminder sent second\b',
-            r'\breminder again\b'
-        ]
-
-        final_reminder_patterns = [
-            r'\bfinal reminder\b',
-            r'\bthird reminder\b',
-            r'\b3rd reminder\b',
-            r'\breminder 3\b',
-            r'\breminder[\s\-:#]*3\b',
-            r'\breminder\b.*\b3\b',
-            r'\breminder\b.*\bthird\b',
-            r'\blast 3rd\b',
-            r'\b3rd last\b',
-            r'\bthird last\b',
-            r'\br3\b',
-            r'\breminder[\s\-]*three\b',
-            # Additional patterns
-            r'\blast reminder\b',
-            r'\bfinal follow[\s\-]*up\b',
-            r'\bfollow[\s\-]*up[\s\-]*3\b',
-            r'\breminder number three\b',
-            r'\bultimate reminder\b',
-            r'\bclosing reminder\b',
-            r'\breminder before closure\b',
-            r'\breminder before escalation\b'
-        ]
-
-        # Get X-business-days threshold (default 3 days)
-        closure_threshold_days = thresholds.get("3_strike_closure_threshold", 3)
-        
-        cnt = 0
-        status_3_Strike_rule_check = []
-
-        for idx, row in input_df.iterrows():
-            cnt += 1
-            age = row.get('Age')
-            
-            # Check 1: If Age is missing or None → Pass (timestamps not mandatory)
-            if pd.isnull(age) or age == 'None':
-                status_3_Strike_rule_check.append('Pass - Missing timestamps')
-                continue
-            
-            # Check 2: Check if ticket is same-day closure (Age ≈ 0)
-            if age <= 0.04167:  # Less than 1 hour, approximately same day
-                status_3_Strike_rule_check.append('Pass - Same-day closure')
-                continue
-            
-            # Check 3: Check if ticket closed within X business days
-            if age < closure_threshold_days:
-                status_3_Strike_rule_check.append(f'Pass - Closed <{closure_threshold_days}d')
-                continue
-
-            # Check 4: If Age < 3 days → Pass (no reminder needed yet)
-            if age < 3:
-                status_3_Strike_rule_check.append('Pass - Age <3d')
-                continue
-
-            # Get comments
-            comment = input_df['Comments and Work notes'].iloc[cnt - 1]
-            additional_comment = input_df['Additional comments'].iloc[cnt - 1]
-            
-            # Combine both comment fields
-            combined_text = ''
-            if pd.notnull(comment):
-                combined_text += str(comment) + ' '
-            if pd.notnull(additional_comment):
-                combined_text += str(additional_comment)
-
-            if not combined_text.strip():
-                status_3_Strike_rule_check.append('Fail - No comments')
-                continue
-
-            # Select reminder patterns based on age
-            if 3 <= age <= 5:
-                reminder_patterns = first_reminder_patterns
-                pattern_label = "1st reminder"
-            elif 5 < age <= 7:
-                reminder_patterns = first_reminder_patterns + second_reminder_patterns
-                pattern_label = "1st/2nd reminder"
-            else:  # age > 7
-                reminder_patterns = final_reminder_patterns
-                pattern_label = "final reminder"
-
-            combined_pattern = re.compile('|'.join(reminder_patterns), re.IGNORECASE)
-            matches = combined_pattern.findall(combined_text)
-
-            if matches:
-                status_3_Strike_rule_check.append(f'Pass - {pattern_label} found')
-            else:
-                status_3_Strike_rule_check.append(f'Fail - No {pattern_label}')
-                
-        return status_3_Strike_rule_check
-        
     if "3 Strike rule check(escalation policy check for Remainder)" in selected_rules:
+        rule_timer.start("3 Strike rule check(escalation policy check for Remainder)")
         required_columns = ["Age", "Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -1273,12 +2365,14 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             pass_matrix.append(["Fail"] * len(input_df))
 
         else:    
-            status_3_Strike_rule_check = three_strike_rule_check()
+            status_3_Strike_rule_check = three_strike_rule_check(
+                input_df, thresholds.get("3_strike_closure_threshold", 3))
             output_df['3 Strike rule remainders check'] = status_3_Strike_rule_check
             pass_matrix.append(status_3_Strike_rule_check)
 
     # Reassignment check?
     if "Reassignment check?" in selected_rules:
+        rule_timer.start("Reassignment check?")
         required_column = "Reassignment count"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Reassignment check validation")
@@ -1314,6 +2408,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # Has attachment column is selected then it will return This ticket have attachment if it is true else No attachment this validation rule is dependant from input template file
     if "Has Attachments" in selected_rules:
+        rule_timer.start("Has Attachments")
         required_column = "Has Attachments"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Has attachment validation")
@@ -1348,6 +2443,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             
     # Priority Validation
     if "Priority Validation" in selected_rules:
+        rule_timer.start("Priority Validation")
         required_columns = ["Priority", "Impact", "Urgency"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         
@@ -1361,111 +2457,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
         else:            
             status_priority_val = []
-            import re
-
-            # Separate, centralized synonym maps (edit per project)
-            IMPACT_URGENCY_CANON_MAP = {
-                '1-high': '1-High', 'high': '1-High', 'h': '1-High', 'urgent': '1-High', 'immediate': '1-High',
-                '2-medium': '2-Medium', 'medium': '2-Medium', 'moderate': '2-Medium', 'med': '2-Medium', 'mod': '2-Medium',
-                'normal': '2-Medium', 'standard': '2-Medium',
-                '3-low': '3-Low', 'low': '3-Low', 'l': '3-Low', 'minor': '3-Low',
-            }
-
-            PRIORITY_CANON_MAP = {
-                '1-critical': '1-Critical', 'critical': '1-Critical', 'p1': '1-Critical',
-                'severity 1': '1-Critical', 'sev1': '1-Critical', 's1': '1-Critical', 'priority 1': '1-Critical',
-
-                '2-high': '2-High', 'high': '2-High', 'p2': '2-High',
-                'severity 2': '2-High', 'sev2': '2-High', 's2': '2-High', 'priority 2': '2-High',
-
-                '3-medium': '3-Medium', '3-moderate': '3-Medium', 'moderate': '3-Medium', 'med': '3-Medium', 'mod': '3-Medium',
-                'p3': '3-Medium', 'severity 3': '3-Medium', 'sev3': '3-Medium', 's3': '3-Medium', 'priority 3': '3-Medium',
-
-                '4-low': '4-Low', 'low': '4-Low', 'p4': '4-Low',
-                'severity 4': '4-Low', 'sev4': '4-Low', 's4': '4-Low', 'priority 4': '4-Low',
-            }
-
-            def _canon(s, kind):
-                """Canonicalize to matrix labels with robust handling of case/dash/space and regex patterns."""
-                if pd.isnull(s) or s == 'None':
-                    return s
-                t = str(s).strip()
-                t = t.replace(' – ', '-').replace(' - ', '-').replace('–', '-')
-                t = ' '.join(t.split())
-                key = t.lower()
-
-                base_map = PRIORITY_CANON_MAP if kind == 'priority' else IMPACT_URGENCY_CANON_MAP
-                if key in base_map:
-                    return base_map[key]
-
-                if kind == 'priority':
-                    for pat in (r'\bp\s*-?\s*([1-4])\b',
-                                r'\bsev(?:erity)?\s*-?\s*([1-4])\b',
-                                r'\bs\s*-?\s*([1-4])\b',
-                                r'\bpriority\s*-?\s*([1-4])\b'):
-                        m = re.search(pat, key)
-                        if m:
-                            n = int(m.group(1))
-                            return ['1-Critical','2-High','3-Medium','4-Low'][n-1]
-
-                    m = re.search(r'\b([1-4])\s*-\s*(critical|high|medium|moderate|low)\b', key)
-                    if m:
-                        word = m.group(2)
-                        if 'critical' in word: return '1-Critical'
-                        if 'high' in word:     return '2-High'
-                        if 'medium' in word or 'moderate' in word: return '3-Medium'
-                        if 'low' in word:      return '4-Low'
-
-                    if 'critical' in key: return '1-Critical'
-                    if 'high' in key:     return '2-High'
-                    if 'medium' in key or 'moderate' in key: return '3-Medium'
-                    if 'low' in key:      return '4-Low'
-
-                else:  # kind == 'iu'
-                    m = re.search(r'\b([1-3])\s*-\s*(high|medium|moderate|low)\b', key)
-                    if m:
-                        n = int(m.group(1))
-                        word = m.group(2)
-                        if n == 1 or 'high' in word: return '1-High'
-                        if n == 2 or 'medium' in word or 'moderate' in word: return '2-Medium'
-                        if n == 3 or 'low' in word: return '3-Low'
-
-                    if 'high' in key or 'urgent' in key or 'immediate' in key: return '1-High'
-                    if 'medium' in key or 'moderate' in key or 'normal' in key or 'standard' in key: return '2-Medium'
-                    if 'low' in key or 'minor' in key: return '3-Low'
-
-                    m = re.search(r'\b([1-3])\b', key)
-                    if m:
-                        n = int(m.group(1))
-                        return ['1-High','2-Medium','3-Low'][n-1]
-
-                return t
-
-            def normalize_priority_value(value):
-                if pd.isnull(value) or value == 'None':
-                    return value
-                normalized = str(value).strip()
-                normalized = normalized.replace(' – ', '-').replace(' - ', '-').replace('–', '-')
-                return normalized
-
-            def validate_priority_impact_urgency(impact, urgency, priority):
-                norm_impact = normalize_priority_value(impact)
-                norm_urgency = normalize_priority_value(urgency)
-                norm_priority = normalize_priority_value(priority)
-
-                valid_combinations = [
-                    ("1-High", "1-High", "1-Critical"),
-                    ("1-High", "2-Medium", "2-High"),
-                    ("1-High", "3-Low", "3-Medium"),
-                    ("2-Medium", "1-High", "2-High"),
-                    ("2-Medium", "2-Medium", "3-Medium"),
-                    ("2-Medium", "3-Low", "4-Low"),
-                    ("3-Low", "1-High", "3-Medium"),
-                    ("3-Low", "2-Medium", "4-Low"),
-                    ("3-Low", "3-Low", "4-Low")
-                ]
-                return "Pass" if (norm_impact, norm_urgency, norm_priority) in valid_combinations else "Fail"
-
 
             # ✅ ONLY CHANGE IS HERE: safer index-based loop (no cnt / iloc[cnt-1])
             for idx, val in input_df['Priority'].items():
@@ -1480,9 +2471,9 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     status_priority_val.append('Fail')
                     continue
 
-                impact_canon   = _canon(impact,  'iu')
-                urgency_canon  = _canon(urgency, 'iu')
-                priority_canon = _canon(val,     'priority')
+                impact_canon   = canonical_matrix_label(impact,  'iu')
+                urgency_canon  = canonical_matrix_label(urgency, 'iu')
+                priority_canon = canonical_matrix_label(val,     'priority')
 
                 status_priority_val.append(
                     validate_priority_impact_urgency(impact_canon, urgency_canon, priority_canon)
@@ -1493,6 +2484,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
 
     if "Category Validation" in selected_rules:
+        rule_timer.start("Category Validation")
         required_columns = ["Description", "Category", "Subcategory"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -1506,45 +2498,8 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
         # Updated Version
         # checking for any combination (order-insensitive token subset match)
         else:
-            import re
-            import pandas as pd
-            # ---- Helpers (local scope, NaN-safe) ----
-            def _norm_str(s):
-                '''Normalize for comparison: lower, trim, remove spaces; treat '', 'None', NaN as None.'''
-                if pd.isna(s):
-                    return None
-                s = str(s).strip()
-                if s == '' or s.lower() == 'none':
-                    return None
-                return re.sub(r'\s+', '', s.lower())
-
-            def _tokenize(s):
-                '''Tokenize text into lowercase alphanumeric tokens; returns [] for None/NaN.'''
-                if pd.isna(s):
-                    return []
-                s = str(s).lower()
-                # Split on non-alphanumeric boundaries; adjust if underscores/hyphens need to be preserved.
-                tokens = re.split(r'[^a-z0-9]+', s)
-                return [t for t in tokens if t]
-
-            # ---- Load mapping and build keyword index (preprocessed for speed) ----
-            keywords = pd.read_excel("Category_Subcategory_Mapping.xlsx")
-            if not {'Keywords', 'Category'}.issubset(keywords.columns):
-                raise ValueError("Mapping file must contain 'Keywords' and 'Category' columns")
-
-            keyword_index = []  # list of tuples: (kw_tokens_fset, kw_cat_norm, kw_sub_norm)
-            has_sub = 'Subcategory' in keywords.columns
-            for _, krow in keywords.iterrows():
-                kw_tokens = frozenset(_tokenize(krow.get('Keywords')))
-                if not kw_tokens:
-                    # Skip empty keyword rows
-                    continue
-                kw_cat_norm = _norm_str(krow.get('Category'))
-                kw_sub_norm = _norm_str(krow.get('Subcategory')) if has_sub else None
-                keyword_index.append((kw_tokens, kw_cat_norm, kw_sub_norm))
-
-            # Prefer the most specific match (largest token set) first
-            keyword_index.sort(key=lambda t: len(t[0]), reverse=True)
+            # ---- Keyword index (built once per mapping file version, most specific first) ----
+            keyword_index = load_category_keyword_index(CATEGORY_MAPPING_FILE)
 
             # ---- Validate each input row ----
             status_category_val = []
@@ -1701,6 +2656,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # Password Check
     if "Password_detected?" in selected_rules:
+        rule_timer.start("Password_detected?")
         required_columns = ["Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -1713,9 +2669,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             # Fill NaN values
                 input_df['Comments and Work notes'] = input_df['Comments and Work notes'].fillna('')
                 input_df['Additional comments'] = input_df['Additional comments'].fillna('')
-                password_pattern = re.compile(
-                    r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$'
-                )
                 # Initialize the status list
                 status_password_detected = []
 
@@ -1726,7 +2679,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
                     # Split into words and check each word against the pattern
                     words = comment.split() + additional.split()
-                    detected = any(password_pattern.match(word) for word in words)
+                    detected = any(PASSWORD_PATTERN.match(word) for word in words)
 
                     status_password_detected.append('Fail' if detected else 'Pass')
                     #print(f"Row {idx}: Password detected? {'Fail' if detected else 'Pass'}")
@@ -1812,6 +2765,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     
     if "Closed with User Confirmation?" in selected_rules:
+        rule_timer.start("Closed with User Confirmation?")
         required_columns = ["Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -1824,82 +2778,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
         else:
             status_user_confirmation = []
 
-            # ✅ CHANGE ONLY HERE: Expanded "user confirmation" detection to also catch Slack/Teams/Email/Mail confirmations
-            confirmation_keywords = r'''(?ix)
-            \b(
-                # Explicit confirmation wording
-                (user|end\s*user|customer|client|requester)\s+(confirm(?:ed|s|ing)?|acknowledge(?:d|s|ment)?|approve(?:d|s)?|agree(?:d|s)?)
-            | confirm(?:ed|s|ing)?
-            | confirmation
-            | approve(?:d|s)?
-            | agreed
-            | acknowledged
-            | verified
-            | validated
-            | tested(?:\s+and\s+working)?
-
-                # "Resolved/Fixed" confirmation from user perspective
-            | (issue|problem|it|this)\s+(is\s+)?(fixed|resolved|working|work(?:s|ed)|sorted|clear(?:ed)?)
-            | (now\s+)?(working\s+fine|works\s+fine|working\s+now|works\s+now)
-            | (looks|seems)\s+(good|fine)
-            | no\s+issues?\s+(now|anymore)
-            | (all\s+)?(good|set|sorted)\b
-            | (resolved|fixed)\s+from\s+my\s+side
-
-                # Access/Login success confirmations
-            | (able|can)\s+to\s+(login|log\s*in|sign\s*in|access|connect)
-            | login\s+(successful|works|working)
-            | access\s+(restored|working)
-            | (connected|connection)\s+(successful|works|working)
-
-                # Short affirmative replies (common)
-            | (ok|okay|kk|k)\b
-            | (yes|yep|yup|ya|yeah|y)\b
-            | sure\b
-            | sure\s+thing
-            | sounds\s+good
-            | please\s+proceed
-            | go\s+ahead
-            | proceed
-
-                # Emoji/thumbs-up confirmations (often used in chats)
-            | 👍
-            | ✅
-
-                # Channel-based confirmations (Slack/Teams/Email/Mail/Outlook etc.)
-            | (user|end\s*user|customer|client|requester)\s+replied\b.*\b(confirm|confirmed|acknowledged|all\s+good|working)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
-            | (user|end\s*user|customer|client|requester)\s+confirmed\b.*\b(over|via|on|in|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
-            | (user|end\s*user|customer|client|requester)\s+acknowledged\b.*\b(over|via|on|in|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
-            | confirmed\b.*\b(over|via|on|in|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
-            | acknowledged\b.*\b(over|via|on|in|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b
-            | reply(?:ied|)\b.*\b(on|in|via|through)\b.*\b(slack|teams|email|e-?mail|mail|outlook)\b.*\b(confirm|confirmed|acknowledged|all\s+good|working)\b
-            | email\s+from\s+(user|end\s*user|customer|client|requester)\b.*\b(confirm|confirmed|acknowledged|all\s+good|working)\b
-            | mail\s+from\s+(user|end\s*user|customer|client|requester)\b.*\b(confirm|confirmed|acknowledged|all\s+good|working)\b
-            )\b
-            '''
-
-            # Detect intent to close/resolve/mark resolved (by agent or process)
-            closure_keywords = r'''(?ix)
-            \b(
-                close|closure|closing
-            | (proceed|going)\s+to\s+close
-            | proceed\b.*to\b.*close
-            | good\s+to\s+close
-            | we\s+can\s+close
-            | you\s+can\s+close
-            | please\s+close
-            | close\b.*(ticket|incident)
-            | (mark|marking)\s+(this|the)?\s*ticket\s+as\s+resolved
-            | mark\s*resolved
-            | resolve(?:d|)\b
-            | resolving\s+the\s+incident
-            | (issue|ticket|incident)\s+(is\s+)?(resolved|completed|closed)
-            | (upon|post)\s+(your|user)\s+confirmation\b.*(mark|close|resolved)
-            | (hence|therefore)\b.*(closing|resolving)\b.*(incident|ticket|issue)
-            | thanks\b.*(close|closure)
-            )\b
-            '''
-
             for val1, val2 in zip(input_df['Comments and Work notes'], input_df['Additional comments']):
                 combined_text = ''
                 
@@ -1912,7 +2790,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                 combined_text = combined_text.lower()
 
                 # ✅ Check for confirmation + closure keywords anywhere in text
-                if re.search(confirmation_keywords, combined_text) and re.search(closure_keywords, combined_text):
+                if USER_CONFIRMATION_PATTERN.search(combined_text) and CLOSURE_INTENT_PATTERN.search(combined_text):
                     status_user_confirmation.append('Pass')
                 else:
                     status_user_confirmation.append('Fail')
@@ -1924,6 +2802,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
         # Work Notes Updated Regularly
     if "Work Notes Updated Regularly" in selected_rules:
+        rule_timer.start("Work Notes Updated Regularly")
         required_columns = ["Age", "Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -1936,6 +2815,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
         else:
             status_worknotes_updated_regularly = []
             threshold_val = thresholds["Work Notes Updated Regularly"]
+            status_3_Strike_rule_check = None  # evaluated once on the first row over the threshold
             cnt = 0
 
             for age_val in input_df['Age']:
@@ -1946,7 +2826,9 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                 if age_val < threshold_val:
                     status_worknotes_updated_regularly.append('Pass')
                 else:
-                    status_3_Strike_rule_check = three_strike_rule_check()
+                    if status_3_Strike_rule_check is None:
+                        status_3_Strike_rule_check = three_strike_rule_check(
+                            input_df, thresholds.get("3_strike_closure_threshold", 3))
                     strike3 = status_3_Strike_rule_check[cnt - 1]
                     status_worknotes_updated_regularly.append(strike3)
 
@@ -1955,6 +2837,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # Ticket Updated Within Business Days
     if "Ticket Updated Within Business Days" in selected_rules:
+        rule_timer.start("Ticket Updated Within Business Days")
         required_columns = ["Opened", "Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -1968,19 +2851,13 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             # add new col 
             # Ticket Updated <48 Hrs (Check worknotes if it is having initial comments withing 48 Hours from created/Opened date)
             # Bussiness days excluded
-            import pandas as pd
-            import re
-            from datetime import datetime
-            from pandas.tseries.offsets import BDay
-            
             status_ticket_updated = []
+            opened_dates = get_rule_dates('Opened')
             
-            for _, row in input_df.iterrows():
+            for pos, (_, row) in enumerate(input_df.iterrows()):
                 # 1) parse the opened date
-                opened_raw = row['Opened']
-                try:
-                    opened_dt = pd.to_datetime(opened_raw)
-                except:
+                opened_dt = opened_dates[pos]
+                if opened_dt is DATE_PARSE_ERROR:
                     status_ticket_updated.append("Invalid Opened Date")
                     continue
                 if pd.isnull(opened_dt):
@@ -2019,6 +2896,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
         
     # PA violation Check
     if "Process Adherence Violation Check" in selected_rules:
+        rule_timer.start("Process Adherence Violation Check")
         required_columns = ["Opened", "Closed", "Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -2028,18 +2906,16 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             output_df['PA violation Check'] = result
             pass_matrix.append(["Fail"] * len(input_df))
         else:
-            import pandas as pd
-            import numpy as np
-            from datetime import datetime
             # PA violation Check (Check if ticket was updated every alternate business day from Opened to Closed)
             status_pa_check = []
+            opened_dates = get_rule_dates('Opened')
+            closed_dates = get_rule_dates('Closed')
 
-            for _, row in input_df.iterrows():
+            for pos, (_, row) in enumerate(input_df.iterrows()):
                 # Parse Opened and Closed dates
-                try:
-                    opened_dt = pd.to_datetime(row['Opened'])
-                    closed_dt = pd.to_datetime(row['Closed'])
-                except Exception:
+                opened_dt = opened_dates[pos]
+                closed_dt = closed_dates[pos]
+                if opened_dt is DATE_PARSE_ERROR or closed_dt is DATE_PARSE_ERROR:
                     status_pa_check.append("Invalid Opened/Closed Date")
                     continue
 
@@ -2088,6 +2964,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
  
     # Work Note Format & Content Check
     if "Work Note Format & Content Check" in selected_rules:
+        rule_timer.start("Work Note Format & Content Check")
         required_column = "Comments and Work notes"
         if required_column not in input_df.columns:
             print(f"❌ WARNING: Missing column '{required_column}' for Work Note Format & Content Check validation")
@@ -2097,98 +2974,23 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             output_df['Work Note Format & Content Check'] = result
             pass_matrix.append(["Fail"] * len(input_df))
         else:
-            import re
-            import pandas as pd
-
             status_wn_specified = []
             wn_series = input_df['Comments and Work notes']
 
-            # Sentence-ending punctuation marks to check
-            SENTENCE_PUNCT = {'.', '!', '?', ';'}
-
-            DATE_REGEX = re.compile(
-                    r'\b('
-                    r'\d{1,2}[/\-\.]\d{1,2}[/\-\.]\d{4}'                              # dd/mm/yyyy, mm-dd-yyyy, dd.mm.yyyy
-                    r'|'
-                    r'\d{4}[/\-\.]\d{1,2}[/\-\.]\d{1,2}'                              # yyyy/mm/dd, yyyy-mm-dd
-                    r'|'
-                    r'\d{1,2}[-/\. ]?[A-Za-z]{3,9}[-/\. ]?\d{4}'                      # dd-MMM-yyyy or dd Month yyyy
-                    r'|'
-                    r'[A-Za-z]{3,9}[-/\. ]?\d{1,2},?[-/\. ]?\d{4}'                    # MMM dd, yyyy or Month dd yyyy
-                    r'|'
-                    r'\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2})?(\.\d+)?'              # ISO datetime
-                    r'|'
-                    r'\d{1,2}[/\-\.]\d{1,2}[/\-\.]\d{4}[ ,T]?\s*\d{1,2}:\d{2}(:\d{2})?(\.\d+)?'  # dd/mm/yyyy HH:MM[:SS][.fff]
-                    r'|'
-                    r'\d{4}[/\-\.]\d{1,2}[/\-\.]\d{1,2}[ ,T]?\s*\d{1,2}:\d{2}(:\d{2})?(\.\d+)?'  # yyyy-mm-dd HH:MM[:SS][.fff]
-                    r'|'
-                    r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?'      # ISO with timezone
-                    r')\b'
-                )
-
-            def evaluate_entry(entry: str) -> str:
-                """
-                Returns one of:
-                - "Comprehensive"
-                - "Needs improvement"
-                - "No match or invalid format"
-                """
-                try:
-                    if entry is None:
-                        return "No match or invalid format"
-
-                    entry_str = str(entry).strip()
-                    if not entry_str:
-                        return "No match or invalid format"
-
-                    # Find the FIRST date occurrence (to match existing behavior)
-                    m = DATE_REGEX.search(entry_str)
-                    if not m:
-                        return "No match or invalid format"
-
-                    date_str = m.group(0)
-                    date_index = m.start()
-
-                    # Everything AFTER the date is considered the main content
-                    after_date_text = entry_str[m.end():].strip()
-
-                    # Basic content sufficiency checks
-                    if len(after_date_text) <= 30:
-                        return "Needs improvement"
-
-                    # Count words (split on whitespace)
-                    word_count = len(after_date_text.split())
-                    if word_count < 10:
-                        return "Needs improvement"
-
-                    # Require at least one sentence-ending punctuation mark (., !, ?, ;)
-                    if not any(p in after_date_text for p in SENTENCE_PUNCT):
-                        return "Needs improvement"
-
-                    # Capitalization check:
-                    # Find the first alphabetic character after the date and ensure it's uppercase
-                    first_alpha = next((ch for ch in after_date_text if ch.isalpha()), None)
-                    if first_alpha is None or not first_alpha.isupper():
-                        return "Needs improvement"
-
-                    return "Comprehensive"
-
-                except Exception:
-                    return "No match or invalid format"
-
             for worknote in wn_series:
                 # Preserve your legacy handling for nulls and the literal 'None'
                 if pd.isnull(worknote) or worknote == 'None':
                     status_wn_specified.append('Fail')
                     continue
 
-                result = evaluate_entry(worknote)
+                result = evaluate_worknote_entry(worknote)
                 status_wn_specified.append(result)
 
             output_df['Work Note Format & Content Check'] = status_wn_specified
             pass_matrix.append(status_wn_specified)
 
     if "Acknowledgment notes recorded in Worklog?" in selected_rules:
+            rule_timer.start("Acknowledgment notes recorded in Worklog?")
             required_columns = ["Comments and Work notes", "Additional comments"]
             missing_cols = [col for col in required_columns if col not in input_df.columns]
 
@@ -2199,10 +3001,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                     output_df['Acknowledgment notes recorded in Worklog?'] = result
                     pass_matrix.append(["Fail"] * len(input_df))
             else:
-                
-                import re
-                import pandas as pd
-
                 # Hardcoded template from thresholds or UI
                 acknowledgment_template = thresholds.get("Acknowledgment_notes_template", "Enter Text here")
                 # acknowledgment_template = """Dear User,
@@ -2212,29 +3010,13 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                 #                             Regards,
                 #                             Support Team"""
                 # Normalize template
-                norm_template = re.sub(r'\s+', ' ', acknowledgment_template).strip().lower()
-
-                # ✅ Improved regex for timestamps, names, and markers
-                timestamp_pattern = re.compile(
-                    r'(?:OR)?\s*\d{1,4}[-/]\d{1,2}[-/]\d{1,4}\s+\d{1,2}:\d{2}:\d{2}\s*-\s*[^\n()]+(?:\([^)]+\))?',
-                    re.MULTILINE
-                )
-
-                def clean_text(text: str) -> str:
-                    """Remove timestamps, names, and markers; normalize spaces and lowercase."""
-                    if pd.isnull(text):
-                        return ''
-                    text = str(text)
-                    # Remove timestamp + name + markers
-                    text = timestamp_pattern.sub('', text)
-                    # Normalize spaces and lowercase
-                    return re.sub(r'\s+', ' ', text).strip().lower()
+                norm_template = normalize_template_text(acknowledgment_template)
 
                 status_acknowledgment = []
                 for _, row in input_df.iterrows():
                     combined_text = ''
                     for col in ['Comments and Work notes', 'Additional comments']:
-                        combined_text += ' ' + clean_text(row.get(col, ''))
+                        combined_text += ' ' + clean_worklog_text(row.get(col, ''))
                     combined_text = combined_text.strip()
                     # ✅ Substring match for normalized template
                     if norm_template in combined_text:
@@ -2246,6 +3028,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                 pass_matrix.append(status_acknowledgment)
 
     if "Is the resolution summary and closure notes updated as per appropriate template?" in selected_rules:
+            rule_timer.start("Is the resolution summary and closure notes updated as per appropriate template?")
             required_columns = ["Comments and Work notes", "Additional comments"]
             missing_cols = [col for col in required_columns if col not in input_df.columns]
             if missing_cols:
@@ -2256,35 +3039,17 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
                 pass_matrix.append(["Fail"] * len(input_df))
 
             else:
-                import re
-                import pandas as pd
                 # Hardcoded template from thresholds or UI
                 acknowledgment_template = thresholds.get("Resolution_summary_template", "Enter Text here")
-                
-                # Normalize template
-                norm_template = re.sub(r'\s+', ' ', acknowledgment_template).strip().lower()
 
-                # ✅ Improved regex for timestamps, names, and markers
-                timestamp_pattern = re.compile(
-                    r'(?:OR)?\s*\d{1,4}[-/]\d{1,2}[-/]\d{1,4}\s+\d{1,2}:\d{2}:\d{2}\s*-\s*[^\n()]+(?:\([^)]+\))?',
-                    re.MULTILINE
-                )
-
-                def clean_text(text: str) -> str:
-                    """Remove timestamps, names, and markers; normalize spaces and lowercase."""
-                    if pd.isnull(text):
-                        return ''
-                    text = str(text)
-                    # Remove timestamp + name + markers
-                    text = timestamp_pattern.sub('', text)
-                    # Normalize spaces and lowercase
-                    return re.sub(r'\s+', ' ', text).strip().lower()
+                # Normalize template
+                norm_template = normalize_template_text(acknowledgment_template)
 
                 status_acknowledgment = []
                 for _, row in input_df.iterrows():
                     combined_text = ''
                     for col in ['Comments and Work notes', 'Additional comments']:
-                        combined_text += ' ' + clean_text(row.get(col, ''))
+                        combined_text += ' ' + clean_worklog_text(row.get(col, ''))
                     combined_text = combined_text.strip()
                     # ✅ Substring match for normalized template
                     if norm_template in combined_text:
@@ -2300,6 +3065,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # 1-1-1
     if "3 Strike Check(1-1-1)" in selected_rules:
+        rule_timer.start("3 Strike Check(1-1-1)")
         required_columns = ["Age", "Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -2310,12 +3076,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             output_df['3 Strike Check(1-1-1)'] = result
             pass_matrix.append(["Fail"] * len(input_df))
         else:    
-            import pandas as pd
-            import re
-            from datetime import datetime
-            from pandas.tseries.offsets import BDay
-            import numpy as np
-
             # Initialize result list
             status_1_1_1_check = []
             input_1_1_1 = thresholds['1-1-1 Check']
@@ -2381,6 +3141,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # 2-2-1
     if "3 Strike Check(2-2-1)" in selected_rules:
+        rule_timer.start("3 Strike Check(2-2-1)")
         required_columns = ["Age", "Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -2392,12 +3153,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             pass_matrix.append(["Fail"] * len(input_df))
         
         else:
-            import pandas as pd
-            import re
-            from datetime import datetime
-            from pandas.tseries.offsets import BDay
-            import numpy as np
-
             # Initialize result list
             status_2_2_1_check = []
             input_2_2_1 = thresholds['2-2-1 Check']
@@ -2461,6 +3216,7 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
 
     # 3-2-1
     if "3 Strike Check(3-2-1)" in selected_rules:
+        rule_timer.start("3 Strike Check(3-2-1)")
         required_columns = ["Age", "Comments and Work notes", "Additional comments"]
         missing_cols = [col for col in required_columns if col not in input_df.columns]
         if missing_cols:
@@ -2471,12 +3227,6 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             output_df['3 Strike Check(3-2-1)'] = result
             pass_matrix.append(["Fail"] * len(input_df))
         else:
-            import pandas as pd
-            import re
-            from datetime import datetime
-            from pandas.tseries.offsets import BDay
-            import numpy as np
-
             # Initialize result list
             status_3_2_1_check = []
             input_3_2_1 = thresholds['3-2-1 Check']
@@ -2539,424 +3289,91 @@ def process_uploaded_file(input_df, selected_rules, thresholds, weights):
             pass_matrix.append(status_3_2_1_check)
 
 
-    # Observation1
-    #  Comments and Work notes observation
-# #    if "Observations1" in selected_rules:
-#     punctuation_marks = [".", ",", ";", ":", "!", "?"]
-#     timestamp_pattern = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"  # Matches e.g. 2025-08-27 02:02:24
-
-#     def obs1_feedback(row):
-#         entry_str = str(row.get('Comments and Work notes', '')) if not pd.isnull(row.get('Comments and Work notes', '')) else ''
-#         addl_val = str(row.get('Additional comments', '')) if 'Additional comments' in row and not pd.isnull(row.get('Additional comments', '')) else ''
-#         feedback = set()
-#         # Split into remarks by newlines and/or timestamps
-#         remarks = re.split(r"\n+|(?=" + timestamp_pattern + ")", entry_str)
-#         remarks = [r.strip() for r in remarks if r.strip()]
-#         seen_remarks = set()
-#         duplicate_found = False
-#         for remark in remarks:
-#             if remark in seen_remarks:
-#                 duplicate_found = True
-#             else:
-#                 seen_remarks.add(remark)
-#             # Word count check
-#             word_count = len(remark.split())
-#             if word_count < 20:
-#                 feedback.add("Too few words")
-#             if not any(p in remark for p in punctuation_marks):
-#                 feedback.add("Missing punctuation")
-#             if len(remark) < 100:
-#                 feedback.add("Too short")
-#             first_char = remark[0] if remark else ''
-#             if not first_char.isupper():
-#                 feedback.add("Does not start with capital")
-#             # Check for attachment, attachments, or attached (whole word)
-#             if re.search(r"\b(attachment[s]?|attached)\b", remark, re.IGNORECASE):
-#                 feedback.add("Attachment mentioned")
-#         # Also check in Additional comments
-#         if re.search(r"\b(attachment[s]?|attached)\b", addl_val, re.IGNORECASE):
-#             feedback.add("Attachment mentioned")
-#         if duplicate_found:
-#             feedback.add("Duplicate comment found")
-#         return ", ".join(sorted(feedback))
-
-#     status_wn_observation = input_df.apply(obs1_feedback, axis=1)
-#     output_df['Observations1'] = status_wn_observation
-#     pass_matrix.append(status_wn_observation.tolist())
-
-# -------------------------
-# Observations1 ()
-# -------------------------
-    import re
-    import pandas as pd
-
-    punctuation_marks = [".", ",", ";", ":", "!", "?"]
-    timestamp_pattern = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"  # Matches e.g., 2025-08-27 02:02:24
+    # Observations1 / Observations2 are derived views (never Pass/Fail), so they stay out of
+    # pass_matrix and are only built when explicitly requested; see add_observations()
+    if include_observations or any(col in selected_rules for col in OBSERVATION_COLUMNS):
+        rule_timer.start("Observations")
+        output_df['Observations1'] = compute_observations1(input_df, selected_rules)
+        output_df['Observations2'] = compute_observations2(output_df)
 
-    def obs1_feedback(row):
-        # Safely extract values
-        entry_str = str(row.get('Comments and Work notes', '') or '')
-        addl_val = str(row.get('Additional comments', '') or '')
 
-        feedback = set()
+    rule_timer.stop()
+    return output_df, pass_matrix, rule_timer
 
-        # Split remarks by newlines or timestamps
-        remarks = re.split(r"\n+|(?=" + timestamp_pattern + ")", entry_str)
-        remarks = [r.strip() for r in remarks if r.strip()]
 
-        seen_remarks = set()
-        duplicate_found = False
-
-        for remark in remarks:
-            if remark in seen_remarks:
-                duplicate_found = True
-            else:
-                seen_remarks.add(remark)
-
-            # Word count check
-            if len(remark.split()) < 20:
-                feedback.add("Too few words less")
-
-            # Punctuation check
-            if not any(p in remark for p in punctuation_marks):
-                feedback.add("Missing punctuation")
-
-            # Length check
-            if len(remark) < 100:
-                feedback.add("Too short")
-
-            # Capitalization check
-            if remark and not remark[0].isupper():
-                feedback.add("Does not start with capital")
-
-            # Attachment mention check
-            if re.search(r"\b(attachment[s]?|attached)\b", remark, re.IGNORECASE):
-                feedback.add("Attachment mentioned")
-
-        # Check Additional comments for attachment mention
-        if re.search(r"\b(attachment[s]?|attached)\b", addl_val, re.IGNORECASE):
-            feedback.add("Attachment mentioned")
+def process_uploaded_file(input_df, selected_rules, thresholds, weights, include_observations=False):
+    output_df, pass_matrix, rule_timer = evaluate_rules(input_df, selected_rules, thresholds,
+                                                        include_observations=include_observations)
 
-        if duplicate_found:
-            feedback.add("Duplicate comment found")
-
-        return ", ".join(sorted(feedback)) if feedback else "Work notes meet quality standards"
-
-    # Apply feedback function row-wise
-    status_wn_observation = input_df.apply(obs1_feedback, axis=1)
-
-    # Add to output DataFrame
-    output_df['Observations1'] = status_wn_observation
-
-    # Append to pass_matrix for scoring
-    pass_matrix.append(status_wn_observation.tolist())
-
-    # Obsevation2
-#    if "Obsevations2" in selected_rules:
-    # status_feedback_map_observation2 = []
-
-    # def generate_feedback(evaluation):
-    #     feedback_map = {
-    #         'D': "Short Description has less than thresold char ,",
-    #         'E': "Long Description is less than thresold Char ,",
-    #         'F': "Response time is more than thresold Min ,",
-    #         'G': "Response SLA is breached ,",
-    #         'H': "Resolution SLA is breached ,",
-    #         'I': "KBA is not tagged to the ticket ,",
-    #         'J': "Ticket is reopened ,",
-    #         'K': "worknotes is not comprehensive ,",
-    #         'L': "Resolution notes is not comprehensive ,",
-    #         'M': "Ticket is assigned to incorrect group ,",
-    #         'N': "Related record is not tagged ,",
-    #         'O': "Ticket is ageing>20 days ,",
-    #         'P': "3 Strike rule(Confirmation) is not followed ,",
-    #         'Q': "Reassignment count is >3 ,",
-    #         'R': "1-1-1 Check is not followed ,",
-    #         'S': "2-2-1 Check is not followed ,",
-    #         'T': "3-2-1 Check is not followed ,"
-    #     }
-
-    #     feedback_parts = [message for key, message in feedback_map.items() if evaluation.get(key) == "Fail"]
-    #     return ''.join(feedback_parts) if feedback_parts else "All key quality checks passed for this ticket."
-    # # Iterate through the DataFrame
-    # for idx, row in output_df.iterrows():
-    #     evaluation_dict = {}
-    #     if sort_len_obs in row:
-    #         evaluation_dict = {"D": row[sort_len_obs],}
-    #     if long_desc_obs in row:
-    #         evaluation_dict.update({'E' : row[long_desc_obs]})
-    #     if response_time_obs in row:
-    #         evaluation_dict.update({'F': row[response_time_obs]})
-    #     if 'Response SLA Met' in row:
-    #         evaluation_dict.update({'G' : row['Response SLA Met']})
-    #     if 'Resolution SLA Met' in row:
-    #         evaluation_dict= {'H' : row['Resolution SLA Met']}
-    #     if 'KBA Tagged?' in row:
-    #         evaluation_dict = {'I' : row['KBA Tagged?']}
-    #     if 'Reopened?' in row:
-    #         evaluation_dict = {'J' : row['Reopened?']}
-    #     if worknote_obs in row:
-    #         evaluation_dict = {'K' : row[worknote_obs]}
-    #     if resolution_notes_obs in row:
-    #         evaluation_dict = {'L' : row[resolution_notes_obs]}
-    #     if 'assignment group check' in row:
-    #         evaluation_dict = {'M': row['Assignment group check']}
-    #     if 'Related records tagged?' in row:
-    #         evaluation_dict = {'N': row['Related records tagged?']}
-    #     if 'ticket ageing check' in row:
-    #         evaluation_dict = {'O': row['Ticket Ageing Check']}
-    #     if '3 Strike rule remainders check' in row:
-    #         evaluation_dict = {'P': row['3 Strike rule remainders check']}
-    #     if 'reassignment check?' in row:
-    #         evaluation_dict = {'Q': row['Reassignment check?']}
-    #     if '1-1-1 Check' in row:
-    #         evaluation_dict = {'R': row['1-1-1 Check']}
-    #     if '2-2-1 Check' in row:
-    #         evaluation_dict = {'S': row['2-2-1 Check']}
-    #     if '3-2-1 Check' in row:
-    #         evaluation_dict = {'T': row['3-2-1 Check']}
-
-    #     feedback = generate_feedback(evaluation_dict)
-    #     status_feedback_map_observation2.append(feedback)
-
-    # output_df['Observations2'] = status_feedback_map_observation2
-    # pass_matrix.append(status_feedback_map_observation2)
-
-
-
-    # -------------------------
-    # Observations2 (DROP-IN)
-    # -------------------------
-    status_feedback_map_observation2 = []
-
-    def _is_fail(val) -> bool:
-        """Robust 'Fail' detector: handles 'Fail', 'Fail - Missing Column', case-insensitive."""
-        if val is None:
-            return False
-        s = str(val).strip().lower()
-        return s.startswith("fail")
-
-    def generate_feedback(evaluation: dict) -> str:
-        """Build a readable, comma-separated feedback string for failed checks only."""
-        feedback_map = {
-            'D': "Short Description has less than threshold characters",
-            'E': "Long Description is less than threshold characters",
-            'F': "Response time is more than threshold minutes",
-            'G': "Response SLA is breached",
-            'H': "Resolution SLA is breached",
-            'I': "KBA is not tagged to the ticket",
-            'J': "Ticket is reopened",
-            'K': "Worknotes are not comprehensive",
-            'L': "Resolution notes are not comprehensive",
-            'M': "Ticket is assigned to an incorrect group",
-            'N': "Related record is not tagged",
-            'O': "Ticket is ageing > 20 days",
-            'P': "3 Strike rule (Confirmation) is not followed",
-            'Q': "Reassignment count is > 3",
-            'R': "1-1-1 Check is not followed",
-            'S': "2-2-1 Check is not followed",
-            'T': "3-2-1 Check is not followed"
-        }
-        failed_msgs = [msg for code, msg in feedback_map.items() if _is_fail(evaluation.get(code))]
-        return ", ".join(failed_msgs) if failed_msgs else "All key quality checks passed for this ticket."
-
-    def _first_available(row, candidates):
-        """Return the first column name from candidates that exists in the row, else None."""
-        for name in candidates:
-            if name in row.index:
-                return name
-        return None
-
-    # Build Observations2 row-wise
-    for _, row in output_df.iterrows():
-        evaluation_dict = {}
-
-        # Dynamic columns produced earlier in your pipeline
-        # (keep these variables as you already set them where those checks are computed)
-        if 'sort_len_obs' in locals():
-            if sort_len_obs in row.index:
-                evaluation_dict.update({'D': row[sort_len_obs]})
-        if 'long_desc_obs' in locals():
-            if long_desc_obs in row.index:
-                evaluation_dict.update({'E': row[long_desc_obs]})
-        if 'response_time_obs' in locals():
-            if response_time_obs in row.index:
-                evaluation_dict.update({'F': row[response_time_obs]})
-        if 'worknote_obs' in locals():
-            if worknote_obs in row.index:
-                evaluation_dict.update({'K': row[worknote_obs]})
-        if 'resolution_notes_obs' in locals():
-            if resolution_notes_obs in row.index:
-                evaluation_dict.update({'L': row[resolution_notes_obs]})
-
-        # Fixed-name columns (with tolerant variants)
-        col = _first_available(row, ['Response SLA Met', 'Response SLA met', 'Response SLA'])
-        if col: evaluation_dict.update({'G': row[col]})
-
-        col = _first_available(row, ['Resolution SLA Met', 'Resolution SLA met', 'Resolution SLA'])
-        if col: evaluation_dict.update({'H': row[col]})
-
-        col = _first_available(row, ['KBA Tagged?', 'KBA Tagged'])
-        if col: evaluation_dict.update({'I': row[col]})
-
-        col = _first_available(row, ['Reopened?', 'Reopened'])
-        if col: evaluation_dict.update({'J': row[col]})
-
-        col = _first_available(row, ['Assignment group check', 'Assignment Group Check'])
-        if col: evaluation_dict.update({'M': row[col]})
-
-        col = _first_available(row, ['Related records tagged?', 'Related Records Tagged?'])
-        if col: evaluation_dict.update({'N': row[col]})
-
-        col = _first_available(row, ['Ticket Ageing Check', 'Ticket ageing Check', 'Ticket Ageing check'])
-        if col: evaluation_dict.update({'O': row[col]})
-
-        col = _first_available(row, [
-            '3 Strike rule remainders check',
-            '3 Strike rule check(escalation policy check for Remainder)',
-            '3 Strike rule check (escalation policy check for Remainder)'
-        ])
-        if col: evaluation_dict.update({'P': row[col]})
-
-        col = _first_available(row, ['Reassignment check?', 'Reassignment Check?'])
-        if col: evaluation_dict.update({'Q': row[col]})
-
-        # 3-Strike variants (support both your output names)
-        col = _first_available(row, ['3 Strike Check(1-1-1)', '1-1-1 Check'])
-        if col: evaluation_dict.update({'R': row[col]})
-
-        col = _first_available(row, ['3 Strike Check(2-2-1)', '2-2-1 Check'])
-        if col: evaluation_dict.update({'S': row[col]})
-
-        col = _first_available(row, ['3 Strike Check(3-2-1)', '3-2-1 Check'])
-        if col: evaluation_dict.update({'T': row[col]})
-
-        # Compose feedback
-        feedback = generate_feedback(evaluation_dict)
-        status_feedback_map_observation2.append(feedback)
-
-    # Attach to output
-    output_df['Observations2'] = status_feedback_map_observation2
-
-    # (If pass_matrix is expected to include this narrative list, keep as is)
-    pass_matrix.append(status_feedback_map_observation2)
-
-
-    # Scoring
-    # for i in range(len(input_df)):
-    #     cnt_pass = sum(1 for check in pass_matrix if check[i] == "Pass")
-    #     percent = (cnt_pass / total_checks) * 100 if total_checks else 0
-    #     percent = math.ceil(percent)
-    #     score_list.append(percent)
-    #     print(total_checks)
-    
-    #Only change inside your loop
-    for i in range(len(input_df)):
-        # Count passes as before
-        cnt_pass = sum(1 for check in pass_matrix if check[i] == "Pass")
-        # NEW: denominator = only Pass + Fail (ignores "No data found", "Not Enough Comments", blanks, etc.)
-        denom = sum(1 for check in pass_matrix if check[i] in ("Pass", "Fail"))
-        percent = math.ceil((cnt_pass * 100) / denom) if denom else 0
-        score_list.append(percent)
+    rule_timer.start("Scoring")
+    apply_scores(output_df, pass_matrix, weights, len(selected_rules))
+    compact_result_frame(output_df)
+    rule_timer.stop()
+    # Seconds spent per rule block, for the CLI / benchmarks; rule_stats adds rows, cache and memory
+    output_df.attrs['timings'] = rule_timer.timings
+    output_df.attrs['rule_stats'] = rule_timer.stats
 
-        print(total_checks)  # left untouched to keep your logging the same
+    # --- return as before ---
 
-        if percent < 75:
-            score_category.append('<75%')
-        elif percent < 90:
-            score_category.append('75%-90%')
-        else:
-            score_category.append('>90%-100%')
- 
-    output_df["Score"] = score_list
-    output_df["Score Category"] = score_category
+    return output_df
 
-    # ----------------------------------------------------------------------
-    # NEW: Weightage Score (adds a second score column without touching old Score)
-    # ----------------------------------------------------------------------
 
-    def _normalize_rule_name(name: str) -> str:
-        """Normalize rule labels so '&amp;' in UI matches '&' in DataFrame columns."""
-        return str(name).replace("&amp;", "&").strip()
+# ----------------------------------------------------------------------
+# Parallel execution: shard rows across a process pool
+# ----------------------------------------------------------------------
 
-    # Build a lookup from normalized column name -> actual DataFrame column
-    normalized_col_map = {
-        _normalize_rule_name(col).lower(): col for col in output_df.columns
-    }
+def _init_audit_worker(working_dir, selected_rules):
+    """Process-pool initializer: same folder as the parent, mapping indexes loaded once per worker."""
+    os.chdir(working_dir)
+    warm_mapping_caches(selected_rules)
 
-    # Mapping from UI rule names to DataFrame columns
-    RULE_TO_COLUMN = {
-        # validation rule name : Output column name
-        "Short Description Length Check": "Short Description",
-        "Long Description Length Check": "Long Description",
-        "Actual Response Time took": "Response Time",
-        "Response SLA Met ?": "Response SLA Met",
-        "Resolution SLA Met ?": "Resolution SLA Met",
-        "KBA Tagged?": "KBA Tagged?",
-        "Reopened ?": "Reopened?",
-        "Related records tagged?": "Related records tagged?",
-        "Work Notes Updated Regularly": "Work Notes Updated Regularly",
-        "Ticket Updated Within Business Days": "Ticket Updated Within Business Days",
-        "Process Adherence Violation Check": "PA violation Check",
-        "Work notes Length Check": "Work notes Length",
-        "Resolution Notes / Additional comment Length Check": "Additional comments",
-        "Assignment group check": "Assignment group check",
-        "Related records tagged?": "Related records tagged?",
-        "Ticket Ageing Check": "Ticket Ageing Check",
-        "Reassignment check?": "Reassignment check?",
-        "Priority Validation": "Priority Validation",
-        "Category Validation": "Category Validation",
-        "Right Pending Justification Usage": "Pending Justification",
-        "Password_detected?": "Password Check",
-        "Has Attachments": "Has Attachments",
-        "Closed with User Confirmation?": "Closed with User Confirmation?",
-        "Work Notes Updated Regularly": "Work Notes Updated Regularly",
-        "Ticket Updated Within Business Days": "Ticket Updated Within Business Days",
-        "Process Adherence Violation Check": "PA violation Check",
-        "3 Strike rule check(escalation policy check for Remainder)": "3 Strike rule remainders check",
-        "Work Note Format & Content Check": "Work Note Format & Content Check",
-        "3 Strike Check(1-1-1)": "3 Strike Check(1-1-1)",
-        "3 Strike Check(2-2-1)": "3 Strike Check(2-2-1)",
-        "3 Strike Check(3-2-1)": "3 Strike Check(3-2-1)",
-        "Acknowledgment notes recorded in Worklog?": "Acknowledgment notes recorded in Worklog?",
-        "Is the resolution summary and closure notes updated as per appropriate template?": "Is the resolution summary and closure notes updated as per appropriate template?"
-    }
 
-    # # Debug prints to diagnose weightage score issues
-    # print("Normalized column map:", normalized_col_map)
-    # print("Weights dict:", weights)
-    # print("DataFrame columns:", list(output_df.columns))
+def _audit_chunk(chunk_df, selected_rules, thresholds, weights, include_observations):
+    return process_uploaded_file(chunk_df, selected_rules, thresholds, weights,
+                                 include_observations=include_observations)
 
-    use_weights = isinstance(weights, dict) and len(weights) > 0
 
-    weightage_scores = []
-    for i in range(len(input_df)):
-        if use_weights:
-            total_possible = 0
-            total_earned = 0
-            for rule_name, w in weights.items():
-                # Use the mapping to get the correct DataFrame column
-                df_col = RULE_TO_COLUMN.get(rule_name)
-                if not df_col or df_col not in output_df.columns:
-                    continue
-                status = str(output_df.at[i, df_col]).strip().lower()
-                print(f"Row {i}, Rule: {rule_name}, Col: {df_col}, Status: {status}, Weight: {w}")
-                if status in ("pass", "fail") and w > 0:
-                    total_possible += w
-                    if status == "pass":
-                        total_earned += w
-            if total_possible > 0:
-                variable = int(math.ceil((total_earned * 100) / total_possible))
-                weightage_scores.append(variable)
-                print(f"Weightage Score for row {i}: {variable}")
-            else:
-                weightage_scores.append(0)
-        else:
-            weightage_scores.append(score_list[i])  # fallback if weights not used
-        
-    output_df["Weightage Score"] = weightage_scores
+def process_uploaded_file_parallel(input_df, selected_rules, thresholds, weights,
+                                   max_workers=None, chunk_size=None, include_observations=False):
+    """
+    Same result as process_uploaded_file, but the rows are split into chunks that are audited
+    on a ProcessPoolExecutor. Every rule is evaluated per ticket, so chunks are independent and
+    are merged back in their original order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
 
+    max_workers = max_workers or os.cpu_count() or 1
+    total_rows = len(input_df)
+    if max_workers <= 1 or total_rows < 2:
+        return process_uploaded_file(input_df, selected_rules, thresholds, weights,
+                                     include_observations=include_observations)
 
-    # --- return as before ---
+    if not chunk_size:
+        # A few chunks per worker keeps the pool busy when some tickets have long work notes
+        chunk_size = max(1, math.ceil(total_rows / (max_workers * 4)))
 
+    chunks = [
+        input_df.iloc[start:start + chunk_size].reset_index(drop=True)
+        for start in range(0, total_rows, chunk_size)
+    ]
+    max_workers = min(max_workers, len(chunks))
+    print(f"⚙️ Auditing {total_rows} tickets in {len(chunks)} chunk(s) on {max_workers} worker process(es)")
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_audit_worker,
+                             initargs=(os.getcwd(), list(selected_rules))) as executor:
+        results = list(executor.map(
+            _audit_chunk,
+            chunks,
+            [selected_rules] * len(chunks),
+            [thresholds] * len(chunks),
+            [weights] * len(chunks),
+            [include_observations] * len(chunks),
+        ))
+
+    output_df = pd.concat(results, ignore_index=True)
+    # Shards with different category sets concatenate back to object columns
+    compact_result_frame(output_df)
+    output_df.index = input_df.index
+    output_df.attrs['timings'] = merge_rule_timings(result.attrs.get('timings', {}) for result in results)
+    output_df.attrs['rule_stats'] = merge_rule_stats(result.attrs.get('rule_stats', {}) for result in results)
     return output_df
@@ -0,0 +1,137 @@
+"""
+Opt-in profiling of audit runs, for diagnosing a slow client file without the file itself.
+
+Turned on by the TQA_PROFILE environment variable (1 / cprofile / pyinstrument), by
+`tqa_cli.py --profile`, or in the app by opening it with ?profile=1 (or ?profile=pyinstrument).
+Each profiled run writes, to TQA_PROFILE_DIR (default profiles/ next to the tool):
+
+    audit-<time>-<input fingerprint>-<rules hash>.prof   cProfile stats (snakeviz / pstats)
+    audit-...-.txt                                        top functions by cumulative time
+    audit-...-.html                                       pyinstrument flame view (pyinstrument only)
+    audit-...-.json                                       input fingerprint, rules, profiler, seconds
+
+Only function names and timings are recorded, never ticket data.
+"""
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+TOOL_DIR = os.path.dirname(os.path.abspath(__file__))
+PROFILE_ENV_VAR = "TQA_PROFILE"
+PROFILE_DIR_ENV_VAR = "TQA_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = os.path.join(TOOL_DIR, "profiles")
+PROFILERS = ("cprofile", "pyinstrument")
+# Rows of the text summary (functions sorted by cumulative time)
+SUMMARY_LINES = 40
+
+
+def pyinstrument_available():
+    return importlib.util.find_spec('pyinstrument') is not None
+
+
+def parse_profiler(value):
+    """'1' / 'true' / 'cprofile' -> 'cprofile', 'pyinstrument' -> 'pyinstrument', empty / '0' -> None."""
+    value = str(value or "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    if value in PROFILERS:
+        return value
+    return "cprofile"
+
+
+def profiler_from_env():
+    return parse_profiler(os.environ.get(PROFILE_ENV_VAR))
+
+
+def profile_dir():
+    return os.environ.get(PROFILE_DIR_ENV_VAR) or DEFAULT_PROFILE_DIR
+
+
+def file_fingerprint(path):
+    """sha256 of a file's bytes (or of the path itself for a folder / glob)."""
+    if not os.path.isfile(path):
+        return hashlib.sha256(str(path).encode("utf-8")).hexdigest()
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def profile_tag(input_fingerprint, selected_rules, label="audit"):
+    """File name stem: label, start time, first 12 chars of the input fingerprint, hash of the rules."""
+    rules_hash = hashlib.sha256("|".join(sorted(selected_rules)).encode("utf-8")).hexdigest()[:8]
+    return f"{label}-{datetime.now():%Y%m%d-%H%M%S}-{str(input_fingerprint)[:12] or 'noinput'}-{rules_hash}"
+
+
+def _write_cprofile(profiler, stem):
+    import pstats
+
+    profiler.dump_stats(stem + ".prof")
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(SUMMARY_LINES)
+    with open(stem + ".txt", "w", encoding="utf-8") as f:
+        f.write(summary.getvalue())
+    return [stem + ".prof", stem + ".txt"]
+
+
+def _write_pyinstrument(profiler, stem):
+    with open(stem + ".html", "w", encoding="utf-8") as f:
+        f.write(profiler.output_html())
+    with open(stem + ".txt", "w", encoding="utf-8") as f:
+        f.write(profiler.output_text(unicode=True, color=False))
+    return [stem + ".html", stem + ".txt"]
+
+
+@contextmanager
+def profile_run(profiler, input_fingerprint="", selected_rules=(), output_dir=None, label="audit"):
+    """
+    Profile the block with cProfile or pyinstrument (None = no profiling). Yields a dict whose
+    'paths' lists the report files once the block has finished.
+    """
+    run = {"paths": []}
+    if profiler is None:
+        yield run
+        return
+    if profiler == "pyinstrument" and not pyinstrument_available():
+        print("⚠️ pyinstrument is not installed, profiling with cProfile instead")
+        profiler = "cprofile"
+
+    output_dir = output_dir or profile_dir()
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.join(output_dir, profile_tag(input_fingerprint, selected_rules, label))
+
+    if profiler == "pyinstrument":
+        from pyinstrument import Profiler
+        active = Profiler()
+        active.start()
+    else:
+        import cProfile
+        active = cProfile.Profile()
+        active.enable()
+    start = time.perf_counter()
+    try:
+        yield run
+    finally:
+        seconds = time.perf_counter() - start
+        if profiler == "pyinstrument":
+            active.stop()
+            paths = _write_pyinstrument(active, stem)
+        else:
+            active.disable()
+            paths = _write_cprofile(active, stem)
+        with open(stem + ".json", "w", encoding="utf-8") as f:
+            json.dump({
+                "input_fingerprint": input_fingerprint,
+                "selected_rules": list(selected_rules),
+                "profiler": profiler,
+                "seconds": round(seconds, 3),
+                "created": datetime.now().isoformat(timespec="seconds"),
+            }, f, indent=2)
+        run["paths"] = paths + [stem + ".json"]
+        print(f"🔬 Profile written to {paths[0]}")
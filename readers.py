@@ -0,0 +1,298 @@
+import importlib.util
+import os
+
+import pandas as pd
+
+# Default number of tickets per chunk in streaming mode
+DEFAULT_CHUNK_SIZE = 20000
+
+
+# Excel engines in order of preference; calamine (python-calamine) is several times faster than
+# openpyxl and yields the same frames for our extracts and mapping files
+EXCEL_ENGINES = ('calamine', 'openpyxl')
+
+
+def excel_engine_available(engine):
+    # Only checks that the package is installed; if importing it fails, read_excel_fast falls
+    # back to the next engine
+    module = {'calamine': 'python_calamine', 'openpyxl': 'openpyxl'}.get(engine, engine)
+    return importlib.util.find_spec(module) is not None
+
+
+def read_excel_fast(source, usecols=None, engine=None, **kwargs):
+    """
+    pd.read_excel with the fastest installed engine (calamine, then openpyxl). If the fast engine
+    fails on a particular workbook the next one is tried, so behaviour never gets worse than the
+    plain openpyxl read. source can be a path or a file-like object (e.g. a Streamlit upload).
+    """
+    engines = [engine] if engine else [e for e in EXCEL_ENGINES if excel_engine_available(e)]
+    if not engines:
+        raise ImportError("No Excel reader installed: install python-calamine or openpyxl "
+                          "(pip install -r requirements.txt)")
+    last_error = None
+    for candidate in engines:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        try:
+            return pd.read_excel(source, engine=candidate, usecols=usecols, **kwargs)
+        except Exception as e:
+            last_error = e
+            if candidate != engines[-1]:
+                print(f"⚠️ Excel engine '{candidate}' failed ({e}); falling back")
+    raise last_error
+
+
+def column_selector(columns):
+    """
+    usecols callable keeping only the given columns. Every header it is asked about is recorded
+    in the returned list, so the caller can report the columns that were skipped without a
+    separate header read; columns missing from the file are simply not loaded.
+    """
+    wanted = set(columns)
+    seen = []
+
+    def keep(column):
+        seen.append(column)
+        return column in wanted
+
+    return keep, seen
+
+
+def _ignored_columns(seen, columns):
+    wanted = set(columns)
+    return [col for col in dict.fromkeys(seen) if col not in wanted]
+
+
+def _file_extension(path):
+    return os.path.splitext(str(path))[1].lower()
+
+
+def _convert_excel_cell(value):
+    """Convert an openpyxl cell value the same way pd.read_excel does."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _rows_to_frame(header, rows):
+    # TextParser applies the same type inference as pd.read_excel
+    parser = pd.io.parsers.TextParser([header] + rows, header=0)
+    return parser.read()
+
+
+def iter_excel_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, sheet_name=0, columns=None):
+    """
+    Yield DataFrames of chunk_size tickets from an xlsx file using openpyxl's read-only mode,
+    so only one chunk of rows is held in memory at a time. With columns, only those are kept.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        row_iter = worksheet.iter_rows(values_only=True)
+        header = next(row_iter, None)
+        if header is None:
+            return
+        # Drop trailing empty header cells (formatted but unused columns)
+        header = list(header)
+        while header and header[-1] is None:
+            header.pop()
+        width = len(header)
+        header = [str(h) if h is not None else f"Unnamed: {i}" for i, h in enumerate(header)]
+        keep, _ = column_selector(header if columns is None else columns)
+        positions = [i for i, name in enumerate(header) if keep(name)]
+        header = [header[i] for i in positions]
+
+        rows = []
+        for values in row_iter:
+            values = list(values[:width]) + [None] * (width - len(values))
+            if all(v is None for v in values):
+                continue
+            rows.append([_convert_excel_cell(values[i]) for i in positions])
+            if len(rows) >= chunk_size:
+                yield _rows_to_frame(header, rows)
+                rows = []
+        if rows:
+            yield _rows_to_frame(header, rows)
+    finally:
+        workbook.close()
+
+
+# Free-text columns read from CSV as strings: skips type inference on the widest columns and keeps
+# a note that happens to look numeric from giving the column mixed types between chunks
+CSV_TEXT_COLUMNS = ["Short description", "Description", "Comments and Work notes", "Additional comments",
+                    "Resolution notes"]
+
+INPUT_FILE_TYPES = ('.xlsx', '.xlsm', '.csv', '.parquet', '.feather')
+
+
+def _csv_options(columns=None):
+    """read_csv keyword arguments: text dtype hints, plus column pruning when columns is given."""
+    options = {'dtype': {col: str for col in CSV_TEXT_COLUMNS}}
+    seen = None
+    if columns is not None:
+        keep, seen = column_selector(columns)
+        options['usecols'] = keep
+    return options, seen
+
+
+def _is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def _source_extension(source):
+    """Extension of a path or of a named file-like object (e.g. a Streamlit upload)."""
+    return _file_extension(source if _is_path(source) else getattr(source, 'name', ''))
+
+
+def _unsupported_input(extension):
+    return ValueError(f"Unsupported input file type '{extension}' (expected {', '.join(INPUT_FILE_TYPES)})")
+
+
+def _arrow_to_frame(table):
+    # split_blocks / self_destruct hand the Arrow buffers to pandas column by column instead of
+    # consolidating them into one 2-D block per dtype, so the table is not held twice
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _selected_names(names, columns):
+    if columns is None:
+        return None
+    wanted = set(columns)
+    return [name for name in names if name in wanted]
+
+
+def iter_csv_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Yield DataFrames of chunk_size tickets from a CSV file."""
+    options, _ = _csv_options(columns)
+    for chunk in pd.read_csv(path, chunksize=chunk_size, **options):
+        yield chunk.reset_index(drop=True)
+
+
+def iter_parquet_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Yield DataFrames of chunk_size tickets from a Parquet file, one record batch at a time."""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    selected = _selected_names(parquet_file.schema_arrow.names, columns)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=selected):
+        yield batch.to_pandas()
+
+
+def iter_feather_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """Yield DataFrames of chunk_size tickets from a memory-mapped Feather (Arrow IPC) file."""
+    import pyarrow as pa
+
+    with pa.memory_map(str(path)) as source:
+        table = pa.ipc.open_file(source).read_all()
+        selected = _selected_names(table.column_names, columns)
+        if selected is not None:
+            table = table.select(selected)
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            yield batch.to_pandas()
+
+
+def iter_input_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    """
+    Yield the tickets of an input file in fixed-size chunks, dispatching on the file extension.
+    columns limits the columns parsed (all columns when None), as in read_input_file.
+    """
+    extension = _file_extension(path)
+    if extension in ('.xlsx', '.xlsm'):
+        return iter_excel_chunks(path, chunk_size, columns=columns)
+    if extension == '.csv':
+        return iter_csv_chunks(path, chunk_size, columns=columns)
+    if extension == '.parquet':
+        return iter_parquet_chunks(path, chunk_size, columns=columns)
+    if extension == '.feather':
+        return iter_feather_chunks(path, chunk_size, columns=columns)
+    raise _unsupported_input(extension)
+
+
+def read_excel_columns(source, columns=None, **kwargs):
+    """
+    read_excel_fast limited to columns (all columns when None). The names of the columns left
+    out are stored in df.attrs['ignored_columns'].
+    """
+    if columns is None:
+        input_df = read_excel_fast(source, **kwargs)
+        input_df.attrs['ignored_columns'] = []
+        return input_df
+    keep, seen = column_selector(columns)
+    input_df = read_excel_fast(source, usecols=keep, **kwargs)
+    input_df.attrs['ignored_columns'] = _ignored_columns(seen, columns)
+    return input_df
+
+
+def read_csv_columns(source, columns=None):
+    """pd.read_csv with the text dtype hints, limited to columns (all columns when None)."""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    options, seen = _csv_options(columns)
+    input_df = pd.read_csv(source, **options)
+    input_df.attrs['ignored_columns'] = _ignored_columns(seen, columns) if columns is not None else []
+    return input_df
+
+
+def read_parquet_columns(source, columns=None):
+    """Read a Parquet file through Arrow, decoding only the selected columns."""
+    import pyarrow.parquet as pq
+
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    parquet_file = pq.ParquetFile(source)
+    names = parquet_file.schema_arrow.names
+    input_df = _arrow_to_frame(parquet_file.read(columns=_selected_names(names, columns)))
+    input_df.attrs['ignored_columns'] = _ignored_columns(names, columns) if columns is not None else []
+    return input_df
+
+
+def read_feather_columns(source, columns=None):
+    """
+    Read a Feather (Arrow IPC) file; paths are memory-mapped, so the selected columns are handed
+    to pandas without first copying the file into memory.
+    """
+    import pyarrow as pa
+
+    if _is_path(source):
+        # Closed on the way out so the file can be replaced or deleted afterwards (Windows)
+        with pa.memory_map(str(source)) as mapped:
+            return read_feather_columns(mapped, columns)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    table = pa.ipc.open_file(source).read_all()
+    names = table.column_names
+    selected = _selected_names(names, columns)
+    if selected is not None:
+        table = table.select(selected)
+    input_df = _arrow_to_frame(table)
+    input_df.attrs['ignored_columns'] = _ignored_columns(names, columns) if columns is not None else []
+    return input_df
+
+
+def read_input(source, columns=None):
+    """
+    Read a whole ticket export (.xlsx, .csv, .parquet or .feather) from a path or a named
+    file-like object such as a Streamlit upload. With columns, only those columns are parsed and
+    the others are listed in df.attrs['ignored_columns'].
+    """
+    extension = _source_extension(source)
+    if extension in ('.xlsx', '.xlsm', '.xls'):
+        return read_excel_columns(source, columns)
+    if extension == '.csv':
+        return read_csv_columns(source, columns)
+    if extension == '.parquet':
+        return read_parquet_columns(source, columns)
+    if extension == '.feather':
+        return read_feather_columns(source, columns)
+    raise _unsupported_input(extension)
+
+
+def read_input_file(path, columns=None):
+    """Read a whole ticket export file into a DataFrame (see read_input)."""
+    return read_input(path, columns)
@@ -0,0 +1,382 @@
+import contextlib
+import glob
+import io
+import json
+import math
+import os
+import time
+
+import pandas as pd
+
+from logic import (
+    add_age_column,
+    compact_input_frame,
+    compact_result_frame,
+    process_uploaded_file,
+    warm_mapping_caches,
+    merge_rule_stats,
+    merge_rule_timings,
+    _init_audit_worker,
+    _audit_chunk,
+    required_input_columns,
+    RULE_TO_COLUMN,
+)
+from readers import DEFAULT_CHUNK_SIZE, INPUT_FILE_TYPES, iter_input_chunks, read_input_file
+from exporters import StreamingResultWriter, write_results_file
+
+# Same defaults as the sidebar inputs in app.py; a config file only needs to override what differs
+DEFAULT_THRESHOLDS = {
+    "short_desc": 50,
+    "long_desc": 150,
+    "worknote": 100,
+    "Resolution_notes_value": 50,
+    "Additional_comments_value": 50,
+    "Age Value": 20,
+    "Reassignment threshold": 3,
+    "ticket_update_days": 2,
+    "1-1-1 Check": 3,
+    "2-2-1 Check": 3,
+    "3-2-1 Check": 3,
+    "Acknowledgment_notes_template": "Thank you for reaching out to us.",
+    "Resolution_summary_template": "Enter Resolution/Closure Summary here",
+    "Work Notes Updated Regularly": 7,
+    "response_time_by_priority": {'1-Critical': 5, '2-High': 30, '3-Medium': 120, '4-Low': 1440},
+}
+
+
+def load_audit_config(path):
+    """
+    Load a JSON audit config: {"selected_rules": [...], "thresholds": {...}, "weights": {...}}.
+    Thresholds are merged over DEFAULT_THRESHOLDS; weights default to none (plain Score).
+    Returns (selected_rules, thresholds, weights).
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+
+    selected_rules = config.get("selected_rules")
+    if not selected_rules or not isinstance(selected_rules, list):
+        raise ValueError(f"Config '{path}' must contain a non-empty 'selected_rules' list")
+
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    thresholds.update(config.get("thresholds") or {})
+    weights = config.get("weights") or {}
+    return selected_rules, thresholds, weights
+
+
+def _audit_chunk_on_pool(executor, chunk_df, selected_rules, thresholds, weights,
+                         include_observations, max_workers):
+    """Split one streamed chunk into sub-chunks and audit them on an already running pool."""
+    sub_size = max(1, math.ceil(len(chunk_df) / max_workers))
+    sub_chunks = [
+        chunk_df.iloc[start:start + sub_size].reset_index(drop=True)
+        for start in range(0, len(chunk_df), sub_size)
+    ]
+    results = list(executor.map(
+        _audit_chunk,
+        sub_chunks,
+        [selected_rules] * len(sub_chunks),
+        [thresholds] * len(sub_chunks),
+        [weights] * len(sub_chunks),
+        [include_observations] * len(sub_chunks),
+    ))
+    result_df = pd.concat(results, ignore_index=True)
+    # concat turns categoricals with different categories back into object columns
+    compact_result_frame(result_df)
+    result_df.attrs['timings'] = merge_rule_timings(result.attrs.get('timings', {}) for result in results)
+    result_df.attrs['rule_stats'] = merge_rule_stats(result.attrs.get('rule_stats', {}) for result in results)
+    return result_df
+
+
+def stream_audit_file(input_path, output_path, selected_rules, thresholds, weights,
+                      chunk_size=DEFAULT_CHUNK_SIZE, include_observations=False, max_workers=None):
+    """
+    Audit a ticket export that may not fit in memory: read it in chunks of chunk_size tickets,
+    run the rules on each chunk and append the results to output_path (.xlsx, .csv, .csv.gz or .parquet).
+    Only one chunk of input and results is held at a time. With max_workers > 1 every chunk is
+    additionally spread over a process pool that stays up for the whole file.
+
+    Returns a summary dict with the number of tickets, chunks, average score and run time.
+    """
+    start_time = time.perf_counter()
+    total_rows = 0
+    chunk_count = 0
+    score_sum = 0.0
+    score_count = 0
+    timings = {}
+    rule_stats = {}
+
+    executor = None
+    if max_workers and max_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_audit_worker,
+                                       initargs=(os.getcwd(), list(selected_rules)))
+    else:
+        warm_mapping_caches(selected_rules)
+
+    # Only the columns the selected rules read are parsed, as in audit_file
+    columns = required_input_columns(selected_rules, include_observations)
+    try:
+        with StreamingResultWriter(output_path) as writer:
+            for chunk_df in iter_input_chunks(input_path, chunk_size, columns):
+                add_age_column(chunk_df)
+                if executor is not None:
+                    result_df = _audit_chunk_on_pool(executor, chunk_df, selected_rules, thresholds,
+                                                     weights, include_observations, max_workers)
+                else:
+                    result_df = process_uploaded_file(chunk_df, selected_rules, thresholds, weights,
+                                                      include_observations=include_observations)
+                writer.write(result_df)
+                timings = merge_rule_timings([timings, result_df.attrs.get('timings', {})])
+                rule_stats = merge_rule_stats([rule_stats, result_df.attrs.get('rule_stats', {})])
+
+                chunk_count += 1
+                total_rows += len(result_df)
+                if 'Score' in result_df.columns:
+                    scores = result_df['Score'].dropna()
+                    score_sum += float(scores.sum())
+                    score_count += len(scores)
+                print(f"📦 Chunk {chunk_count}: {len(result_df)} tickets audited ({total_rows} total)")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - start_time
+    summary = {
+        'input_file': str(input_path),
+        'output_file': str(output_path),
+        'rows': total_rows,
+        'chunks': chunk_count,
+        'average_score': round(score_sum / score_count, 2) if score_count else None,
+        'seconds': round(elapsed, 2),
+        'timings': timings,
+        'rule_stats': rule_stats,
+    }
+    print(f"✅ Streamed audit finished: {total_rows} tickets in {chunk_count} chunk(s), {elapsed:.1f}s")
+    return summary
+
+
+# ----------------------------------------------------------------------
+# Batch mode: many input files, one warm worker pool
+# ----------------------------------------------------------------------
+
+INPUT_EXTENSIONS = INPUT_FILE_TYPES
+
+
+def resolve_batch_inputs(source):
+    """Expand a directory, glob pattern or list of paths into a sorted list of input files."""
+    if isinstance(source, (list, tuple)):
+        paths = []
+        for item in source:
+            paths.extend(resolve_batch_inputs(item))
+        return sorted(set(paths))
+    source = str(source)
+    if os.path.isdir(source):
+        candidates = [os.path.join(source, name) for name in os.listdir(source)]
+    elif any(ch in source for ch in '*?['):
+        candidates = glob.glob(source)
+    else:
+        candidates = [source]
+    return sorted(
+        path for path in candidates
+        if os.path.isfile(path)
+        and path.lower().endswith(INPUT_EXTENSIONS)
+        and not os.path.basename(path).startswith('~$')  # Excel lock files
+    )
+
+
+def batch_output_path(input_path, output_dir, output_format='xlsx'):
+    base = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f"{base}_Audit_Results.{output_format}")
+
+
+# Rules whose output column holds a mapping or a remark, not a Pass / Fail status
+NON_STATUS_RULES = ('Tower', 'Has Attachments', 'Work Note Format & Content Check')
+
+# Columns a rule writes that RULE_TO_COLUMN does not name (checked before it), e.g. the
+# Work notes rule writes 'Work notes Length' instead when the input column is missing
+RULE_STATUS_COLUMNS = {
+    'Work notes Length Check': ['Work notes Length Check', 'Work notes Length'],
+    'Resolution Notes / Additional comment Length Check': ['Resolution Notes Length'],
+    'Right Assignment group Usage': ['Assignment group check'],
+    'Password_detected?': ['password_detected?'],
+}
+
+
+def rule_status_column(output_df, rule):
+    """Output column holding the Pass / Fail status of rule, or None if it is not in output_df."""
+    candidates = RULE_STATUS_COLUMNS.get(rule, []) + [RULE_TO_COLUMN.get(rule, rule), rule]
+    return next((col for col in candidates if col in output_df.columns), None)
+
+
+def _rule_pass_rates(output_df, selected_rules):
+    """Pass % per selected Pass / Fail rule (Pass / (Pass + Fail)), for the batch roll-up."""
+    rates = {}
+    for rule in selected_rules:
+        if rule in NON_STATUS_RULES:
+            continue
+        column = rule_status_column(output_df, rule)
+        if column is None:
+            print(f"⚠️ No output column found for rule '{rule}', left out of the pass rates")
+            rates[rule] = None
+            continue
+        # Statuses carry reasons ("Fail - No comments", "Pass - final reminder found")
+        statuses = output_df[column].astype(str).str.strip().str.lower()
+        passed = int(statuses.str.startswith('pass').sum())
+        failed = int(statuses.str.startswith('fail').sum())
+        rates[rule] = round(passed * 100 / (passed + failed), 1) if passed + failed else None
+    return rates
+
+
+def audit_file(input_path, output_path, selected_rules, thresholds, weights,
+               include_observations=False, quiet=True):
+    """Audit one input file end to end and write its results; returns a per-file summary dict."""
+    start_time = time.perf_counter()
+    quiet_ctx = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    try:
+        input_df = read_input_file(input_path, required_input_columns(selected_rules, include_observations))
+        add_age_column(input_df)
+        compact_input_frame(input_df)
+        with quiet_ctx:
+            output_df = process_uploaded_file(input_df, selected_rules, thresholds, weights,
+                                              include_observations=include_observations)
+        write_results_file(output_df, output_path)
+    except Exception as e:
+        return {
+            'input_file': str(input_path),
+            'output_file': None,
+            'status': f"Error: {e}",
+            'rows': 0,
+            'seconds': round(time.perf_counter() - start_time, 2),
+        }
+
+    return {
+        'input_file': str(input_path),
+        'output_file': str(output_path),
+        'status': 'OK',
+        'rows': len(output_df),
+        'ignored_columns': input_df.attrs.get('ignored_columns', []),
+        'average_score': round(float(output_df['Score'].mean()), 2) if len(output_df) else None,
+        'average_weightage_score': round(float(output_df['Weightage Score'].mean()), 2) if len(output_df) else None,
+        'score_categories': output_df['Score Category'].value_counts().to_dict(),
+        'rule_pass_rates': _rule_pass_rates(output_df, selected_rules),
+        'timings': output_df.attrs.get('timings', {}),
+        'rule_stats': output_df.attrs.get('rule_stats', {}),
+        'seconds': round(time.perf_counter() - start_time, 2),
+    }
+
+
+def build_batch_rollup(file_summaries):
+    """Combine per-file summaries into (files_df, rules_df) for the roll-up workbook."""
+    file_rows = []
+    for summary in file_summaries:
+        categories = summary.get('score_categories') or {}
+        file_rows.append({
+            'Input File': os.path.basename(summary['input_file']),
+            'Status': summary['status'],
+            'Tickets': summary['rows'],
+            'Average Score': summary.get('average_score'),
+            'Average Weightage Score': summary.get('average_weightage_score'),
+            '<75%': categories.get('<75%', 0),
+            '75%-90%': categories.get('75%-90%', 0),
+            '>90%-100%': categories.get('>90%-100%', 0),
+            'Seconds': summary['seconds'],
+            'Output File': summary.get('output_file'),
+        })
+    files_df = pd.DataFrame(file_rows)
+
+    ok = [s for s in file_summaries if s['status'] == 'OK' and s['rows']]
+    total_rows = sum(s['rows'] for s in ok)
+    if total_rows:
+        overall = {
+            'Input File': 'ALL FILES',
+            'Status': f"{len(ok)}/{len(file_summaries)} OK",
+            'Tickets': total_rows,
+            # Ticket-weighted, so large towers count for what they are
+            'Average Score': round(sum(s['average_score'] * s['rows'] for s in ok) / total_rows, 2),
+            'Average Weightage Score': round(sum(s['average_weightage_score'] * s['rows'] for s in ok) / total_rows, 2),
+            '<75%': int(files_df['<75%'].sum()),
+            '75%-90%': int(files_df['75%-90%'].sum()),
+            '>90%-100%': int(files_df['>90%-100%'].sum()),
+            'Seconds': round(float(files_df['Seconds'].sum()), 2),
+            'Output File': None,
+        }
+        files_df = pd.concat([files_df, pd.DataFrame([overall])], ignore_index=True)
+
+    rules_df = pd.DataFrame({
+        os.path.basename(s['input_file']): s.get('rule_pass_rates', {}) for s in ok
+    })
+    rules_df.index.name = 'Rule'
+    return files_df, rules_df.reset_index()
+
+
+def write_batch_rollup(file_summaries, rollup_path):
+    files_df, rules_df = build_batch_rollup(file_summaries)
+    with pd.ExcelWriter(rollup_path, engine='openpyxl') as writer:
+        files_df.to_excel(writer, index=False, sheet_name='Files')
+        rules_df.to_excel(writer, index=False, sheet_name='Rule Pass %')
+    return files_df
+
+
+def _audit_file_job(args):
+    return audit_file(*args)
+
+
+def run_batch(source, output_dir, selected_rules, thresholds, weights, max_workers=None,
+              include_observations=False, output_format='xlsx', quiet=True):
+    """
+    Audit every input file in a directory / glob / list in one run. Files are spread over a
+    process pool whose workers load the mapping indexes once and then keep their regex and
+    timestamp caches warm for every file they handle. Writes one results file per input plus
+    Batch_Summary.xlsx in output_dir, and returns the per-file summaries.
+    """
+    input_paths = resolve_batch_inputs(source)
+    if not input_paths:
+        raise ValueError(f"No input files ({', '.join(INPUT_EXTENSIONS)}) found for '{source}'")
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = [
+        (path, batch_output_path(path, output_dir, output_format), selected_rules, thresholds, weights,
+         include_observations, quiet)
+        for path in input_paths
+    ]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    print(f"📁 Batch audit: {len(jobs)} file(s) on {max_workers} worker process(es)")
+    start_time = time.perf_counter()
+
+    summaries = []
+    if max_workers <= 1:
+        warm_mapping_caches(selected_rules)
+        for job in jobs:
+            summary = _audit_file_job(job)
+            print(f"  {summary['status']:<6} {os.path.basename(job[0])}: {summary['rows']} tickets, {summary['seconds']}s")
+            summaries.append(summary)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_audit_worker,
+                                 initargs=(os.getcwd(), list(selected_rules))) as executor:
+            for job, summary in zip(jobs, executor.map(_audit_file_job, jobs)):
+                print(f"  {summary['status']:<6} {os.path.basename(job[0])}: {summary['rows']} tickets, {summary['seconds']}s")
+                summaries.append(summary)
+
+    rollup_path = os.path.join(output_dir, 'Batch_Summary.xlsx')
+    write_batch_rollup(summaries, rollup_path)
+    print(f"✅ Batch finished in {time.perf_counter() - start_time:.1f}s, roll-up: {rollup_path}")
+    return summaries
+
+
+# ----------------------------------------------------------------------
+# In-memory ticket batches (used by the HTTP service)
+# ----------------------------------------------------------------------
+
+def audit_records(records, selected_rules, thresholds, weights, include_observations=False, quiet=True):
+    """
+    Audit a list of ticket dicts (same keys as the input workbook columns) and return the
+    results DataFrame, with rule timings in attrs. Age is derived from Opened/Closed like the app.
+    """
+    input_df = pd.DataFrame.from_records(records)
+    add_age_column(input_df)
+    quiet_ctx = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with quiet_ctx:
+        return process_uploaded_file(input_df, selected_rules, thresholds, weights,
+                                     include_observations=include_observations)
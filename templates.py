@@ -0,0 +1,462 @@
+"""
+Input template download: column list, sample row and instructions, plus the generated workbook.
+
+The workbook is built once per template version (a hash of the definitions below) and stored as
+assets/Ticket_Audit_Template_<version>.xlsx; later starts serve those bytes without creating an
+openpyxl workbook. `python templates.py` pre-builds the asset (run by TQA_Install.bat).
+"""
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from io import BytesIO
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+
+# Bump when the styling in build_template_workbook changes (the definitions are hashed anyway)
+TEMPLATE_FORMAT_VERSION = 1
+
+TEMPLATE_COLUMNS = [
+    "Number", "Priority", "State", "Pending reason",
+    "Application Name / CI", "Assignment Group", "Assigned to", "Knowledge Article Used",
+    "Short description", "Comments and Work notes", "Additional comments",
+    "Description", "Closed", "Opened", "Closed by", "Subcategory",
+    "Category", "Response Time", "Response SLA", "Resolution SLA", "Reopened",
+    "Related Record", "Reassignment count", "Impact", "Urgency", "Age",
+    "Has Attachments"
+]
+
+TEMPLATE_SAMPLE_ROW = [
+    "INC647839/RITM3551234", "3-Medium", "Closed Complete", "",
+    "SAP_Production_Environment", "AMS.DIT.Enterprise.Apps.Cognizant.L2", "John.Doe", "KB0048434",
+    "User unable to access SAP application after password reset", 
+    "15/01/2025 09:30:00 - John Doe (Work notes)\nHello User,\n\nWe acknowledge your request. We have started looking into the ticket and we will get back to you if we need any additional information.\n\nRegards,\nSAP Support Team\n\n16/01/2025 14:20:00 - John Doe (Work notes)\nHello User,\n\nIssue has been resolved. Password reset completed and user access verified.\n\nRegards,\nSAP Support Team", 
+    "16/01/2025 15:45:00 - John Doe (Additional comments)\nKnowledge article KB0048434:\nSAP User Access Management\n\nPassword reset performed successfully and user access restored.",
+    "User reported login failure after recent password policy update. Investigation revealed account lock due to multiple failed attempts. Performed password reset and verified successful login.", 
+    "16/01/2025 15:45:00", "15/01/2025 09:15:00", "Jane.Smith",
+    "User Access Management", "Software", "2.5", "Met", "Met", "0/1/2 or True,False/Yes,No,y,n",
+    "CHG0123456", "0", "3-Medium", "3-Medium", "1.7", "TRUE/FALSE"
+]
+
+TEMPLATE_INSTRUCTIONS = [
+    "🎯 Ticket Audit Tool – Validation Rules & Instructions",
+    "",
+    "──────────────────────────────────────────────────────────────",
+    "📌 General Notes:",
+    "• If a required column is missing, the corresponding validation will fail for all tickets.",
+    "• Use the provided mapping files (Tower_Maping.xlsx, Category_Subcategory_Mapping.xlsx) in the same folder.",
+    "• Do NOT rename mapping files or their headers.",
+    "• Do NOT rename the column headers in the input template",
+    "",
+    "──────────────────────────────────────────────────────────────",
+    "✅ Validation Rules: and required columns in input file",
+    "Ticket Number",
+    "   • Required column: Number",
+    "   • Logic: Unique identifier for each ticket.",
+    "",
+    "Assigned to",
+    "   • Required column in input file: Assigned to",
+    "   • Logic: Name of the person assigned to the ticket.",
+    "",
+    "Application",
+    "   • Required column: Application Name / CI",
+    "   • Logic: Application or CI related to the ticket.",
+    "",
+    "Tower",
+    "   • Required column: Application Name / CI",
+    "   • Logic: Derived from Tower_Maping.xlsx. If missing, shows 'Missing Column', 'File Missing', or 'File Error'.",
+    "",
+    "1. Short Description Length Check",
+    "   • Required column: Short description",
+    "   • Logic: Must not be empty/null and must meet minimum character length.",
+    "",
+    "2. Long Description Length Check",
+    "   • Required column: Description",
+    "   • Logic: Must not be empty/null and must meet minimum character length.",
+    "",
+    "3. Actual Response Time took",
+    "   • Required column: Response Time",
+    "   • Logic: Must be a number and in minutes.", 
+    "     - Calculates time difference between 'Opened' date and first comment timestamp. Fails if response time exceeds threshold.",
+    "",
+    "4. Response SLA Met ?",
+    "   • Required column: Response SLA",
+    "   • Logic: Fail if null/None/'Breached'/True in any case; pass otherwise.",
+    "",
+    "5. Resolution SLA Met ?",
+    "   • Required column: Resolution SLA",
+    "   • Logic: Fail if null/None/'Breached'/True in any case; pass otherwise.",
+    "",
+    "6. KBA Tagged?",
+    "    • Required column: Knowledge Article Used",
+    "    • Logic: Pass if contains 'KB', 'True', or 'TRUE'; fail otherwise.",
+    "",
+    "7. Reopened ?",
+    "    • Required column: Reopened",
+    "    • Logic: Fail if null/None or value > 0; pass if value is 0.",
+    "",
+    "8. Work notes Length Check",
+    "    • Required column: Comments and Work notes",
+    "    • Logic: Must meet minimum char/word count, have punctuation, and start with a capital letter.",
+            "We remove system-like headers (date/time/name/tags) from each line, then the incident’s cleaned text must be well‑formed (word_count >= 10, char_count > 50, has . , ? !, and starts with a capital) to Pass. Default character threshold is 100.",
+    "    • Supported Date Formats",
+    "        - YYYY-MM-DD (ISO)",
+    "        - YYYY/MM/DD",
+    "        - YYYY.MM.DD",
+    "        - DD-MM-YYYY",
+    "        - DD/MM/YYYY",
+    "        - DD.MM.YYYY",
+    "        - MM-DD-YYYY",
+    "        - MM/DD/YYYY",
+    "        - MM.DD.YYYY",
+    "        - (Single-digit day/month also supported, e.g., 6/4/2022)",
+    "        - Separators supported: '-', '/', '.'",
+    "    • Supported Time Formats",
+    "        - 24-hour: HH:MM (e.g., 09:27), HH:MM:SS (e.g., 09:27:00)",
+    "        - 12-hour with AM/PM: HH:MM AM/PM, HH:MM:SS AM/PM",
+    "        - Variants with dots: A.M. / P.M.",
+    "        - Case-insensitive and optional spaces before AM/PM are supported",
+    "    • Header Handling",
+    "        - Removes optional '- Name'",
+    "        - Removes optional '- Name (Work notes)' or '- Name (Additional comments)'",
+    "        - If header is missing, only date/time is stripped and comment text remains",
+    "",
+    "9. Resolution Notes Length/ Additional comments",
+    "    • Required column: Additional comments",
+    "    • Logic: Must meet minimum char/word count, have punctuation, and start with a capital letter.",
+    "      We remove system-like headers (date/time/name/tags) from each line, then the incident’s cleaned text must be well‑formed (10+ words (word_count &gt;= 10), char_count &gt; Additional_com_length, has . , ? !, and starts with a capital) to Pass. Default character threshold is 50.",
+    "    • Supported Date Formats",
+    "        - YYYY-MM-DD (ISO)",
+    "        - YYYY/MM/DD",
+    "        - YYYY.MM.DD",
+    "        - DD-MM-YYYY",
+    "        - DD/MM/YYYY",
+    "        - DD.MM.YYYY",
+    "        - MM-DD-YYYY",
+    "        - MM/DD/YYYY",
+    "        - MM.DD.YYYY",
+    "        - (Single-digit day/month also supported, e.g., 6/4/2022)",
+    "        - Separators supported: '-', '/'",
+    "    • Supported Time Formats",
+    "        - 24-hour: HH:MM (e.g., 09:27), HH:MM:SS (e.g., 09:27:00)",
+    "        - 12-hour with AM/PM: HH:MM AM/PM, HH:MM:SS AM/PM",
+    "        - Variants with dots: A.M. / P.M.",
+    "        - Case-insensitive and optional spaces before AM/PM are supported",
+    "    • Header Handling",
+    "        - Removes optional '- Name'",
+    "        - Removes optional '- Name (Work notes)' or '- Name (Additional comments)'",
+    "        - If header is missing, only date/time is stripped and comment text remains",
+    "10. Right Assignment group Usage",
+    "    • Required columns: Application Name / CI, Assignment Group",
+    "    • Logic: Checks if Assignment Group matches mapping in Tower_Maping.xlsx.",
+    "",
+    "11. Right Pending Justification Usage",
+    "    • Required columns: Pending reason, Comments and Work notes, Additional comments",
+    "    • Logic: Pass if Pending reason is null/None; otherwise, checks for valid justification phrases in comments.",
+    "",
+    "12. Related records tagged?",
+    "    • Required columns: Pending reason, Related Record",
+    "    • Logic: For specific pending reasons, checks if Related Record matches expected format (e.g., CHG, PRB, RITM, INC).",
+    "    • For each ticket, check if the Related Record field is correctly tagged based on the Pending reason:",
+
+    "   •   pendingchange → Related Record must contain 'CHG'",
+    "   •   pendingvendor → Related Record must be present (any value except null/'None')",
+    "   •   pendingproblem → must contain 'PRB'",
+    "   •   pendingfulfillment → must contain 'RITM'",
+    "   •   pendingincident → must contain 'INC'",
+    "   •   pendingcustomer → uses external justification logic (Pending_Justification())",
+    "   •   Remarks (possible results):",
+    "           Pass → Related record is correctly tagged for the given pending reason.",
+    "           Fail → Related record is missing or incorrectly tagged.",
+    "           Fail - Missing Column → Required columns are missing from the input.",
+    "           Pass → If Pending reason is null or 'None'."
+    "",
+    "13. Ticket Ageing Check",
+    "    • Required column: Age",
+    "    • Logic: Fail if Age is missing/None/above threshold; pass if below threshold.",
+    "",
+    "14. 3 Strike rule remainders check",
+    "    • Required columns: Age, Comments and Work notes, Additional comments",
+    "    • Logic: Checks for reminder phrases in comments based on ticket age.",
+    "",
+    "15. Reassignment check?",
+    "    • Required column: Reassignment count",
+    "    • Logic: Fail if count is missing/None/above threshold; pass if below threshold.",
+    "",
+    "16. Priority Validation",
+    "    • Required columns: Priority, Impact, Urgency",
+    "    • Logic: Checks if Priority matches valid combinations of Impact and Urgency.",
+    "",
+    "17. Category Validation",
+    "    • Required column: Description and mapping file Category_Subcategory_Mapping.xlsx",
+    "    • Logic: Finds the best matching keyword from the mapping based on words in the Description",
+            " then checks if the ticket's Category (and Subcategory, if given) matches the mapping.",
+            " Returns 'Pass' if both match, otherwise 'Fail'",
+    "",
+    "18. password_detected?",
+    "    • Required columns: Comments and Work notes, Additional comments",
+    "    • Logic: Checks for presence of password-related terms in either column.",
+    "     Loop through each ticket: Combine both comment fields Split into words Check each word against the password pattern",
+    "",
+    "19. Closed with User Confirmation?",
+    "    • Required columns: Comments and Work notes, Additional comments",
+    "    • Logic: Pass if user confirmation phrases are found in either column; fail otherwise.",
+    "",
+    "20. Work Note Format & Content Check",
+    "    • Required column: Comments and Work notes",
+    "    • Logic: For each ticket’s Comments and Work notes:",
+    "         - Find a date (e.g., dd/mm/yyyy, dd-mm-yyyy, or dd-MMM-yyyy).",
+    "         - Take the text after that date and verify it is:",
+    "         - > 30 characters and ≥ 10 words,",
+    "         - Contains at least one sentence-ending punctuation (. ! ? ;), and",
+    "         - The first alphabetic character after the date is uppercase.",
+    "    • Remarks (possible results):",
+    "         - Comprehensive → All conditions satisfied.",
+    "         - Needs improvement → Date found, but content fails one or more checks.",
+    "         - No match or invalid format → No recognizable date or parsing issue.",
+    "         - Fail → Work note is NaN or the literal string 'None'.",
+    "",
+    "21. Ticket Updated Within Business Days",
+    "    • Required columns: Comments and Work notes, Additional comments",
+    "    • Logic: Pass if ticket was updated within the defined business days; fail otherwise.",
+    "",
+    "22. Process Adherence Violation Check",
+    "    • Required columns: Opened, Closed, Comments and Work notes, Additional comments",
+    "    • Logic: Checks if ticket updates in Comments and Work notes or Additional comments occur at least every alternate business day (excluding weekends and holidays) from Opened to Closed.",
+    "    • If there is a gap of more than one business day between any two updates (including from Opened to first update and last update to Closed), the ticket fails the PA violation check; otherwise, it passes.",
+    "",
+    "- Strike Pattern Logics Overview:",
+
+    "1-1-1 Pattern:",
+
+    "Requires three consecutive business days with comments",
+    "Fails if any gap is more than 1 business day",
+    "Works correctly for handling duplicate timestamps",
+    "2-2-1 Pattern:",
+
+    "First two gaps can be up to 2 business days",
+    "Last gap must be 1 business day",
+    "Works correctly but could be optimized for clarity",
+    "3-2-1 Pattern:",
+
+    "First gap can be up to 3 business days",
+    "Second gap can be up to 2 business days",
+    "Last gap must be 1 business day",
+    "Works correctly but could be optimized for clarity",
+    "",
+    "",
+    "23. 3 Strike Check(1-1-1)",
+    "    • Required columns: Comments and Work notes, Additional comments",
+    "    • Logic: For each ticket, if its age is less than or equal to the threshold (e.g., 3 days), it is marked as 'Age <= 3 Days' and not checked further.",
+    "    • If there are fewer than 4 comment timestamps, it marks 'Not Enough Comments'.",
+    "    • The first three updates must be every other day, and the 4th update must be on the immediate next business day after the 3rd.",
+    "    • If this pattern is followed, the ticket passes; otherwise, it fails.",
+    "",
+    "24. 3 Strike Check(2-2-1)",
+    "    • Required columns: Comments and Work notes, Additional comments",
+    "    • Logic: For tickets older than a set threshold, collect all comment timestamps from 'Comments and Work notes' and 'Additional comments'",
+    "    • Check if the first four distinct comment dates follow this pattern:",
+    "        - The gap between the 1st and 2nd comment is ≤ 2 business days",
+    "        - The gap between the 2nd and 3rd comment is ≤ 2 business days",
+    "        - The gap between the 3rd and 4th comment is ≤ 1 business day",
+    "    • Remarks (possible results):",
+                " - Pass → All three gaps meet the 2–2–1 rule.",
+                " - Fail → At least one gap exceeds the allowed limit, or fewer than 4 distinct dates.",
+                " - Age ≤ Threshold → Ticket is too new (e.g., ≤ 3 days), so the check is skipped.",
+                " - Not Enough Comments → Fewer than 4 timestamps found in comments.",
+    "",
+    "25. 3 Strike Check(3-2-1)",
+    "    • Required columns: Comments and Work notes, Additional comments",
+    "    • Logic: For tickets older than a set threshold, collect all comment timestamps from 'Comments and Work notes' and 'Additional comments'.",
+    "    • Check if the first four distinct comment dates follow this pattern:",
+    "        - The gap between the 1st and 2nd comment is ≤ 3 business days",
+    "        - The gap between the 2nd and 3rd comment is ≤ 2 business days",
+    "        - The gap between the 3rd and 4th comment is ≤ 1 business day",
+    "    • Remarks (possible results):",
+    "        - Pass → All three gaps meet the 3–2–1 rule.",
+    "        - Fail → At least one gap exceeds the allowed limit, or there are fewer than 4 distinct dates.",
+    "        - Age ≤ Threshold → Ticket is too new (e.g., ≤ N days), so the check is skipped.",
+    "        - Not Enough Comments → Fewer than 4 timestamps found in comments.",
+    "",
+    "26. Score",
+    "    • Logic: Total number of validations passed for each ticket.",
+    "",
+    "27. Score Category",
+    "    • Logic: Categorizes score: Below 75%, 75%-90%, Above 90%.",
+    "",
+    "28. Observations1",
+    "    • Optional: generated only when 'Include Observations1 / Observations2' is ticked or the dashboard summary is opened.",
+    "    • Evaluates the 'Comments and Work notes' field for each ticket.",
+    "    • Checks for:",
+    "        - Word count (should be at least 20 words)",
+    "        - Presence of punctuation",
+    "        - Minimum length (at least 100 characters)",
+    "        - Starts with a capital letter",
+    "    • Returns feedback like 'Too few words', 'Missing punctuation', 'Too short', 'Does not start with capital' (comma-separated if multiple issues).",
+    "    • If the entry is missing or 'None', marks as 'Fail'.",
+    """   IMPORTANT: If any single remark in the ticket triggers a flag (e.g., "Too short", "Too few words", etc.)", then that flag is shown for the entire ticket in the Observations1 output.""",
+    "       Even if most remarks are good, just one short or problematic remark will cause the flag to appear for the whole ticket.",
+    "       The output does not show which specific remark triggered the flag—just that at least one did.",
+    "",
+    "29. Observations2",
+    "    • Optional: generated together with Observations1.",
+    "    • Generates feedback based on multiple validation checks (using a feedback map).",
+    "    • Maps codes to specific feedback messages:",
+    "        - D: Short Description too short",
+    "        - E: Long Description too short",
+    "        - F: Response time too high",
+    "        - G: Response SLA breached",
+    "        - H: Resolution SLA breached",
+    "        - I: KBA not tagged",
+    "        - J: Ticket reopened",
+    "        - K: worknotes is not comprehensive",
+    "        - L: Resolution notes is not comprehensive",
+    "        - M: Ticket is assigned to incorrect group",
+    "        - N: Related record is not tagged",
+    "        - O: Ticket is ageing>20 days",
+    "        - P: 3 Strike rule(Confirmation) is not followed",
+    "        - Q: Reassignment count is >3",
+    "        - R: 1-1-1 Check is not followed",
+    "        - S: 2-2-1 Check is not followed",
+    "        - T: 3-2-1 Check is not followed",
+    "",
+    "30. Work Notes Updated Regularly",
+    "    • Required column: Age, Comments and Work notes",
+"        • If the work note is recent (< 7 days) → it's automatically marked as Pass.",
+"        • If it's older (≥ 7 days) → it goes through a Three Strike Rule check function to decide Pass/Fail.",
+"        • If the age is missing or invalid → it's marked as Fail.",
+"        • The result is stored in the output and used for reporting.",
+" • Three Strike Rule check fuction Explained below:",
+"      • The function checks the ticket's age and comments to see if reminders were sent as per the escalation policy.",
+        """"If Age is missing or 'None' → mark as "Fail"."
+        If Age < 3 → mark as "Pass" (no reminder needed yet).
+ 
+        Merge 'Comments and Work notes' and 'Additional comments' into one string.
+ 
+        If combined comment text is empty → mark as "Fail".
+        Select reminder patterns based on age:
+ 
+        Age 3–5 → check for first reminder.
+        Age 6–7 → check for first + second reminders.
+        Age > 7 → check for final reminder.
+        Pattern matching:
+ 
+#         Use regex to search for reminder phrases in the combined comment text.
+#         If any match is found → "Pass", else → "Fail"."""
+    "",
+    "30. Has Attachments",
+    "    • Required column: Has Attachments",
+    "    • Logic: Check if the ticket has an attachment based on values in the specified column.",
+    "    • Remarks:",
+    "        - This ticket has attachment → If the value contains 'TRUE', 'true', 'True', 'YES', 'yes', or 'Yes'",
+    "        - No attachment → If the value is present but doesn't match the above",
+    "        - No data found → If the value is None, NaN, or the string 'None'",
+    "       - Missing Column → If the 'Has Attachments' column is missing in the input file",
+ ]
+
+
+def build_template_workbook():
+    """Template workbook bytes: styled Input Template sheet with a sample row, and Instructions."""
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Font
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Input Template"
+
+    # Simple, robust header styling
+    for col_num, col_name in enumerate(TEMPLATE_COLUMNS, 1):
+        cell = ws.cell(row=1, column=col_num, value=col_name)
+        cell.font = Font(bold=True, size=11)
+        cell.alignment = Alignment(horizontal='left', vertical='center')
+
+        # Set appropriate column width - not too wide to avoid scrolling
+        ws.column_dimensions[cell.column_letter].width = 14
+
+    # Add sample data row
+    for col_num, value in enumerate(TEMPLATE_SAMPLE_ROW, 1):
+        if col_num <= len(TEMPLATE_COLUMNS):
+            cell = ws.cell(row=2, column=col_num, value=value)
+            cell.alignment = Alignment(horizontal='left', vertical='top')
+
+    # Freeze header row
+    ws.freeze_panes = "A2"
+
+    # Add instructions sheet
+    instructions_ws = wb.create_sheet("Instructions")
+    instructions_ws.cell(row=1, column=1, value="🎯 Ticket Audit Tool - Instructions").font = Font(bold=True, size=16)
+
+    for i, instruction in enumerate(TEMPLATE_INSTRUCTIONS, 1):
+        cell = instructions_ws.cell(row=i+1, column=1, value=instruction)
+        # Bold all validation rule names (lines starting with a number and dot)
+        if instruction.strip() and instruction[0].isdigit() and '.' in instruction:
+            cell.font = Font(bold=True, size=12)
+        # Make required column names italic and colored to look like column headers
+        elif instruction.strip().startswith('• Required column') or instruction.strip().startswith('• Required column in input file'):
+            match = re.search(r':\s*(.+)', instruction)
+            if match:
+                col_name = match.group(1)
+                # Replace column name with formatted version
+                cell.value = instruction.split(':')[0] + ': ' + col_name
+                cell.font = Font(italic=True, color="0070C0", size=11)
+            else:
+                cell.font = Font(size=11)
+        else:
+            cell.font = Font(size=11)
+        cell.alignment = Alignment(wrap_text=True)
+
+    instructions_ws.column_dimensions['A'].width = 80
+
+    output = BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+
+def template_version():
+    """Short hash of the template definition; changes whenever the generated workbook would."""
+    definition = json.dumps([TEMPLATE_FORMAT_VERSION, TEMPLATE_COLUMNS, TEMPLATE_SAMPLE_ROW, TEMPLATE_INSTRUCTIONS],
+                            ensure_ascii=False)
+    return hashlib.sha256(definition.encode('utf-8')).hexdigest()[:12]
+
+
+def template_asset_path(version=None):
+    return os.path.join(TEMPLATE_DIR, f"Ticket_Audit_Template_{version or template_version()}.xlsx")
+
+
+def write_template_asset():
+    """Build the workbook for the current version and store it under assets/; returns its path."""
+    path = template_asset_path()
+    data = build_template_workbook()
+    os.makedirs(TEMPLATE_DIR, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return path
+
+
+@lru_cache(maxsize=1)
+def load_template_bytes():
+    """
+    Template bytes for the download button: read from the versioned asset, which is built (and
+    saved) only when it does not exist yet, e.g. after the template definition changed.
+    """
+    path = template_asset_path()
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        pass
+    try:
+        path = write_template_asset()
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError as e:
+        # Read-only install folder: serve the freshly built workbook from memory
+        print(f"⚠️ Could not store template asset ({e}); building it in memory")
+        return build_template_workbook()
+
+
+if __name__ == "__main__":
+    print(f"✅ Template written to {write_template_asset()}")
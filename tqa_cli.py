@@ -0,0 +1,130 @@
+"""
+Headless TQA audit runner (no Streamlit / plotly / echarts).
+
+Usage:
+    python tqa_cli.py INPUT CONFIG OUTPUT [--workers N] [--chunk-size N] [--observations] [--profile-memory]
+                      [--profile [cprofile|pyinstrument]]
+
+INPUT is an .xlsx, .csv, .parquet or .feather ticket export, CONFIG a JSON file with selected_rules,
+thresholds and weights, OUTPUT an .xlsx (same workbook as the app download), .csv, .csv.gz, .parquet or .zip
+(CSV per tower) file.
+
+Batch mode: when INPUT is a folder or a glob (e.g. "exports/*.xlsx"), every file is audited in
+one run and OUTPUT is the folder for the per-file results and Batch_Summary.xlsx.
+
+--profile (or TQA_PROFILE=1 in the environment) saves a cProfile / pyinstrument report of the run
+to profiles/, tagged with the input fingerprint and the selected rules (see profiling.py).
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+from logic import (add_age_column, compact_input_frame, format_rule_stats, format_rule_timings, memory_tracking,
+                   process_uploaded_file, process_uploaded_file_parallel, required_input_columns)
+from profiling import PROFILERS, file_fingerprint, parse_profiler, profile_run, profiler_from_env
+from readers import read_input_file
+from runner import load_audit_config, run_batch, stream_audit_file
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the TQA audit rules on a ticket export without the web UI.")
+    parser.add_argument("input", help="Ticket export (.xlsx, .csv, .parquet or .feather), or a folder / glob for batch mode")
+    parser.add_argument("config", help="JSON config with selected_rules, thresholds and weights")
+    parser.add_argument("output", help="Results file (.xlsx, .csv, .csv.gz, .parquet or .zip), or the output folder in batch mode")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the rules (default 1, 0 = all CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Stream the input in chunks of this many tickets (for very large files)")
+    parser.add_argument("--observations", action="store_true",
+                        help="Add the Observations1 / Observations2 columns")
+    parser.add_argument("--format", choices=["xlsx", "csv", "csv.gz", "parquet", "zip"], default="xlsx",
+                        help="Per-file results format in batch mode (default xlsx)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="Report the peak memory each rule allocates (slower; measured with --workers 1)")
+    parser.add_argument("--profile", nargs="?", const="cprofile", choices=PROFILERS, default=None,
+                        help="Save a profiler report of the run to profiles/ (default cprofile; "
+                             "with --workers 1 the rules themselves are profiled)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Show the per-ticket rule logging (hidden by default)")
+    return parser
+
+
+def _write_output(output_df, output_path):
+    from exporters import write_results_file
+    write_results_file(output_df, output_path)
+
+
+def is_batch_input(path):
+    return os.path.isdir(path) or any(ch in path for ch in '*?[')
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    selected_rules, thresholds, weights = load_audit_config(args.config)
+    max_workers = None if args.workers == 0 else args.workers
+
+    profiler = parse_profiler(args.profile) if args.profile else profiler_from_env()
+    input_fingerprint = file_fingerprint(args.input) if profiler else ''
+    with profile_run(profiler, input_fingerprint, selected_rules):
+        return _run_audit(args, selected_rules, thresholds, weights, max_workers)
+
+
+def _run_audit(args, selected_rules, thresholds, weights, max_workers):
+    # The rules print per-ticket debug lines; keep the console readable unless asked
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    start_time = time.perf_counter()
+
+    if is_batch_input(args.input):
+        summaries = run_batch(args.input, args.output, selected_rules, thresholds, weights,
+                              max_workers=max_workers, include_observations=args.observations,
+                              output_format=args.format, quiet=not args.verbose)
+        failed = [s for s in summaries if s['status'] != 'OK']
+        for summary in failed:
+            print(f"❌ {summary['input_file']}: {summary['status']}")
+        return 1 if failed else 0
+
+    if args.chunk_size:
+        with quiet, memory_tracking(args.profile_memory):
+            summary = stream_audit_file(args.input, args.output, selected_rules, thresholds, weights,
+                                        chunk_size=args.chunk_size,
+                                        include_observations=args.observations,
+                                        max_workers=max_workers)
+        rows, timings, rule_stats = summary['rows'], summary['timings'], summary.get('rule_stats', {})
+        average_score = summary['average_score']
+    else:
+        input_df = read_input_file(args.input, required_input_columns(selected_rules, args.observations))
+        ignored_columns = input_df.attrs.get('ignored_columns', [])
+        if ignored_columns:
+            print(f"ℹ️ Ignored {len(ignored_columns)} column(s) not used by the selected rules: {', '.join(ignored_columns)}")
+        add_age_column(input_df)
+        compact_input_frame(input_df)
+        with quiet, memory_tracking(args.profile_memory):
+            if max_workers is None or max_workers > 1:
+                output_df = process_uploaded_file_parallel(input_df, selected_rules, thresholds, weights,
+                                                           max_workers=max_workers,
+                                                           include_observations=args.observations)
+            else:
+                output_df = process_uploaded_file(input_df, selected_rules, thresholds, weights,
+                                                  include_observations=args.observations)
+        _write_output(output_df, args.output)
+        rows, timings = len(output_df), output_df.attrs.get('timings', {})
+        rule_stats = output_df.attrs.get('rule_stats', {})
+        average_score = round(output_df['Score'].mean(), 2) if rows else None
+
+    elapsed = time.perf_counter() - start_time
+    print(f"✅ Audited {rows} tickets from {args.input} -> {args.output} in {elapsed:.2f}s")
+    print(f"📊 Average score: {average_score}")
+    if rule_stats:
+        print("⏱️ Time per rule:")
+        print(format_rule_stats(rule_stats))
+    elif timings:
+        print("⏱️ Time per rule:")
+        print(format_rule_timings(timings))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+Local HTTP/JSON audit service with a warm worker pool.
+
+Usage:
+    python tqa_service.py [--config tqa_config.json] [--host 127.0.0.1] [--port 8765]
+                          [--workers N] [--queue-size N] [--chunk-size N]
+
+Endpoints:
+    GET  /health  -> pool size, requests running / queued, completed / failed / rejected counts
+    POST /audit   -> body {"tickets": [{...}, ...],
+                           "selected_rules": [...], "thresholds": {...}, "weights": {...},
+                           "include_observations": false}
+                     rules / thresholds / weights are optional and default to --config.
+                     Returns {"results": [...], "summary": {...}, "timings": {...}, "rule_stats": {...}}.
+
+The worker processes load the mapping indexes once at start-up and keep their regex and
+timestamp caches between requests. At most --workers requests run at a time and at most
+--queue-size more wait for a slot; anything beyond that gets HTTP 503 so the caller can retry.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from logic import RULE_ORDER, _init_audit_worker, merge_rule_stats, merge_rule_timings
+from runner import DEFAULT_THRESHOLDS, audit_records, load_audit_config
+
+# Largest request body accepted (bytes)
+MAX_BODY_BYTES = 50 * 1024 * 1024
+
+
+class AuditService:
+    """Worker pool plus admission control shared by all HTTP handler threads."""
+
+    def __init__(self, selected_rules, thresholds, weights, max_workers=None, queue_size=None,
+                 chunk_size=500):
+        self.selected_rules = selected_rules
+        self.thresholds = thresholds
+        self.weights = weights
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = self.max_workers * 4 if queue_size is None else queue_size
+        self.chunk_size = chunk_size
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_audit_worker,
+                                            initargs=(os.getcwd(), list(selected_rules or [])))
+        # Admission: running + queued requests; a full service answers 503 instead of piling up
+        self._admission = threading.BoundedSemaphore(self.max_workers + self.queue_size)
+        self._running = threading.BoundedSemaphore(self.max_workers)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def warm_up(self):
+        """Start every worker process now so the first request does not pay for it."""
+        list(self.executor.map(time.sleep, [0.1] * self.max_workers))
+
+    def status(self):
+        with self._lock:
+            return {
+                'status': 'ok',
+                'workers': self.max_workers,
+                'queue_size': self.queue_size,
+                'in_flight': self.in_flight,
+                'running': min(self.in_flight, self.max_workers),
+                'queued': max(0, self.in_flight - self.max_workers),
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+            }
+
+    def try_admit(self):
+        if not self._admission.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.in_flight += 1
+        return True
+
+    def release(self, succeeded=True):
+        with self._lock:
+            self.in_flight -= 1
+            if succeeded:
+                self.completed += 1
+            else:
+                self.failed += 1
+        self._admission.release()
+
+    def resolve_options(self, selected_rules=None, thresholds=None, weights=None):
+        """
+        Request options merged over the service config, as (selected_rules, thresholds, weights).
+        Raises ValueError for a malformed request, before any ticket reaches the pool.
+        """
+        if selected_rules is not None and (not isinstance(selected_rules, list)
+                                           or not all(isinstance(rule, str) for rule in selected_rules)):
+            raise ValueError("'selected_rules' must be a list of rule names")
+        selected_rules = selected_rules or self.selected_rules
+        if not selected_rules:
+            raise ValueError("No selected_rules in the request or the service config")
+        unknown = [rule for rule in selected_rules if rule not in RULE_ORDER]
+        if unknown:
+            raise ValueError(f"Unknown rule(s): {unknown}")
+
+        if thresholds is None:
+            thresholds = self.thresholds
+        elif isinstance(thresholds, dict):
+            thresholds = {**DEFAULT_THRESHOLDS, **thresholds}
+        else:
+            raise ValueError("'thresholds' must be an object")
+
+        if weights is None:
+            weights = self.weights
+        elif not isinstance(weights, dict) or not all(
+                isinstance(w, (int, float)) and not isinstance(w, bool) for w in weights.values()):
+            raise ValueError("'weights' must be an object of rule name -> number")
+        return selected_rules, thresholds, weights
+
+    def audit(self, records, selected_rules=None, thresholds=None, weights=None, include_observations=False):
+        """Audit one batch of tickets; large batches are split over the pool and merged in order."""
+        selected_rules, thresholds, weights = self.resolve_options(selected_rules, thresholds, weights)
+
+        chunk_size = max(1, self.chunk_size)
+        chunks = [records[start:start + chunk_size] for start in range(0, len(records), chunk_size)]
+        with self._running:
+            futures = [
+                self.executor.submit(audit_records, chunk, selected_rules, thresholds, weights, include_observations)
+                for chunk in chunks
+            ]
+            results = [future.result() for future in futures]
+
+        output_df = pd.concat(results, ignore_index=True) if len(results) > 1 else results[0]
+        output_df.attrs['timings'] = merge_rule_timings(result.attrs.get('timings', {}) for result in results)
+        output_df.attrs['rule_stats'] = merge_rule_stats(result.attrs.get('rule_stats', {}) for result in results)
+        return output_df
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+def _json_default(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class AuditRequestHandler(BaseHTTPRequestHandler):
+    service = None  # set by serve()
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, default=_json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/health':
+            self._send_json(200, self.service.status())
+        else:
+            self._send_json(404, {'error': f"Unknown path '{self.path}'"})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/audit':
+            self._send_json(404, {'error': f"Unknown path '{self.path}'"})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(413 if length > MAX_BODY_BYTES else 400,
+                            {'error': f"Request body must be 1..{MAX_BODY_BYTES} bytes of JSON"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length))
+            tickets = request['tickets']
+            if not isinstance(tickets, list) or not all(isinstance(t, dict) for t in tickets):
+                raise ValueError("'tickets' must be a list of objects")
+            # Checked here so that a ValueError raised by the rules themselves is a 500, not a 400
+            selected_rules, thresholds, weights = self.service.resolve_options(
+                request.get('selected_rules'), request.get('thresholds'), request.get('weights'))
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': f"Invalid request: {e}"})
+            return
+        if not tickets:
+            self._send_json(200, {'results': [], 'summary': {'rows': 0}, 'timings': {}, 'rule_stats': {}})
+            return
+
+        if not self.service.try_admit():
+            self._send_json(503, {'error': 'Audit queue is full, retry later', **self.service.status()})
+            return
+        start_time = time.perf_counter()
+        try:
+            output_df = self.service.audit(
+                tickets,
+                selected_rules=selected_rules,
+                thresholds=thresholds,
+                weights=weights,
+                include_observations=bool(request.get('include_observations', False)),
+            )
+        except Exception as e:
+            self.service.release(succeeded=False)
+            self._send_json(500, {'error': f"Audit failed: {e}"})
+            return
+        self.service.release()
+
+        results = json.loads(output_df.to_json(orient='records', date_format='iso'))
+        self._send_json(200, {
+            'results': results,
+            'summary': {
+                'rows': len(output_df),
+                'average_score': round(float(output_df['Score'].mean()), 2),
+                'seconds': round(time.perf_counter() - start_time, 3),
+            },
+            'timings': output_df.attrs.get('timings', {}),
+            'rule_stats': output_df.attrs.get('rule_stats', {}),
+        })
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def serve(service, host='127.0.0.1', port=8765):
+    AuditRequestHandler.service = service
+    server = ThreadingHTTPServer((host, port), AuditRequestHandler)
+    server.daemon_threads = True
+    print(f"✅ TQA audit service on http://{host}:{port} ({service.max_workers} workers, "
+          f"queue {service.queue_size})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Stopping audit service")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON TQA audit service.")
+    parser.add_argument("--config", help="JSON config with the default selected_rules, thresholds and weights")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default localhost only)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default all CPUs)")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="Requests allowed to wait for a worker before answering 503 (default 4 x workers)")
+    parser.add_argument("--chunk-size", type=int, default=500,
+                        help="Tickets per worker task when a request is split over the pool")
+    args = parser.parse_args(argv)
+
+    if args.config:
+        selected_rules, thresholds, weights = load_audit_config(args.config)
+    else:
+        selected_rules, thresholds, weights = [], dict(DEFAULT_THRESHOLDS), {}
+
+    service = AuditService(selected_rules, thresholds, weights, max_workers=args.workers,
+                           queue_size=args.queue_size, chunk_size=args.chunk_size)
+    service.warm_up()
+    serve(service, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()